@@ -0,0 +1,219 @@
+"""
+Backends de extração de texto de PDF
+
+Cada backend sabe contar as páginas de um PDF e devolver o texto de um
+intervalo de páginas, na ordem. As bibliotecas são importadas só quando o
+backend é usado, então ter apenas o pdfplumber instalado continua funcionando.
+
+Backends disponíveis:
+- pdfplumber: o original (análise de layout completa, mais lento)
+- pdfminer:   pdfminer.six direto, sem a análise avançada de layout (boxes_flow=None)
+- pypdfium2:  PDFium (C++), geralmente o mais rápido
+"""
+
+from typing import Dict, Iterator, Optional, Tuple
+
+
+class BackendTexto:
+    """Interface comum dos backends de texto"""
+
+    nome = ""
+
+    def contar_paginas(self, caminho_pdf: str) -> int:
+        raise NotImplementedError
+
+    def iterar_paginas(self, caminho_pdf: str, inicio: int = 0,
+                       fim: Optional[int] = None) -> Iterator[Tuple[int, Optional[str], Optional[str]]]:
+        """
+        Percorre as páginas [inicio, fim) em ordem
+
+        Returns:
+            Tuplas (índice da página, texto, erro); em caso de falha o texto é None
+        """
+        raise NotImplementedError
+
+    def extrair_paginas(self, caminho_pdf: str, inicio: int, fim: int):
+        """Textos do intervalo (None nas páginas com erro) e lista de erros (índice, mensagem)"""
+        textos = []
+        erros = []
+        for indice, texto, erro in self.iterar_paginas(caminho_pdf, inicio, fim):
+            textos.append(texto)
+            if erro is not None:
+                erros.append((indice, erro))
+        return textos, erros
+
+
+class BackendPdfplumber(BackendTexto):
+    nome = "pdfplumber"
+
+    def contar_paginas(self, caminho_pdf):
+        import pdfplumber
+        with pdfplumber.open(caminho_pdf) as pdf:
+            return len(pdf.pages)
+
+    def iterar_paginas(self, caminho_pdf, inicio=0, fim=None):
+        import pdfplumber
+        # pdfplumber numera páginas a partir de 1 e só monta as páginas pedidas
+        paginas = range(inicio + 1, fim + 1) if fim is not None else None
+        with pdfplumber.open(caminho_pdf, pages=paginas) as pdf:
+            for indice, pagina in enumerate(pdf.pages, start=inicio):
+                try:
+                    yield indice, pagina.extract_text() or "", None
+                except Exception as e:
+                    yield indice, None, str(e)
+
+
+class BackendPdfminer(BackendTexto):
+    nome = "pdfminer"
+
+    def contar_paginas(self, caminho_pdf):
+        from pdfminer.pdfpage import PDFPage
+        with open(caminho_pdf, 'rb') as f:
+            return sum(1 for _ in PDFPage.get_pages(f))
+
+    def iterar_paginas(self, caminho_pdf, inicio=0, fim=None):
+        from io import StringIO
+        from pdfminer.layout import LAParams
+        from pdfminer.converter import TextConverter
+        from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+
+        # boxes_flow=None desliga a ordenação hierárquica dos blocos (a parte cara
+        # da análise de layout); as linhas continuam sendo agrupadas
+        laparams = LAParams(boxes_flow=None, detect_vertical=False)
+        recursos = PDFResourceManager(caching=True)
+        with open(caminho_pdf, 'rb') as f:
+            for indice, pagina in enumerate(self._paginas(f, inicio, fim), start=inicio):
+                saida = StringIO()
+                dispositivo = TextConverter(recursos, saida, laparams=laparams)
+                try:
+                    PDFPageInterpreter(recursos, dispositivo).process_page(pagina)
+                    yield indice, saida.getvalue().rstrip("\f"), None
+                except Exception as e:
+                    yield indice, None, str(e)
+                finally:
+                    dispositivo.close()
+
+    @staticmethod
+    def _paginas(arquivo, inicio, fim):
+        """
+        Páginas [inicio, fim) sem montar as anteriores
+
+        PDFPage.get_pages (mesmo com pagenos) monta todas as páginas desde a primeira,
+        resolvendo os recursos e o conteúdo de cada uma; com a leitura dividida em
+        blocos, cada worker pagaria pelo PDF até o seu bloco. Aqui a árvore /Pages é
+        percorrida pelo /Count dos nós, pulando inteiros os ramos antes de inicio.
+        Árvores fora do padrão (sem /Count, tipos desconhecidos) voltam ao get_pages.
+        """
+        from pdfminer.pdfparser import PDFParser
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdftypes import dict_value, list_value, resolve1
+        from pdfminer.psparser import LIT
+
+        documento = PDFDocument(PDFParser(arquivo))
+        quantidade = None if fim is None else max(0, fim - inicio)
+        alvos = []      # (objid, atributos com os herdados) das páginas do intervalo
+        pular = inicio
+
+        def descer(no, visitados):
+            nonlocal pular
+            filhos = list_value(no["Kids"])
+            if pular and resolve1(no.get("Count")) == len(filhos):
+                # Nó só com páginas (o caso comum, árvore plana): vai direto ao filho, sem
+                # ler os anteriores; se o filho não for uma página, percorre o nó todo
+                alvo = dict_value(filhos[pular]) if pular < len(filhos) else {}
+                if alvo.get("Type") is LIT("Page"):
+                    filhos = filhos[pular:]
+                    pular = 0
+            for filho in filhos:
+                if quantidade is not None and len(alvos) >= quantidade:
+                    return
+                objid = getattr(filho, "objid", None)
+                if objid is not None:
+                    if objid in visitados:
+                        continue
+                    visitados.add(objid)
+                atributos = dict_value(filho).copy()
+                for chave, valor in no.items():
+                    if chave in PDFPage.INHERITABLE_ATTRS and chave not in atributos:
+                        atributos[chave] = valor
+                if atributos.get("Type") is LIT("Pages"):
+                    total = resolve1(atributos.get("Count"))
+                    if not isinstance(total, int) or total < 0:
+                        raise ValueError("nó /Pages sem /Count")
+                    if pular >= total:
+                        pular -= total
+                    else:
+                        descer(atributos, visitados)
+                elif atributos.get("Type") is LIT("Page"):
+                    if pular:
+                        pular -= 1
+                    else:
+                        alvos.append((objid, atributos))
+                else:
+                    raise ValueError("nó desconhecido na árvore /Pages")
+
+        try:
+            raiz = dict_value(documento.catalog["Pages"]).copy()
+            for chave, valor in documento.catalog.items():
+                if chave in PDFPage.INHERITABLE_ATTRS:
+                    raiz.setdefault(chave, valor)
+            descer(raiz, set())
+        except (KeyError, TypeError, ValueError, RecursionError):
+            # Árvore fora do padrão: o caminho do pdfminer, página a página
+            arquivo.seek(0)
+            for indice, pagina in enumerate(PDFPage.get_pages(arquivo)):
+                if indice < inicio:
+                    continue
+                if fim is not None and indice >= fim:
+                    break
+                yield pagina
+            return
+
+        for objid, atributos in alvos:
+            yield PDFPage(documento, objid, atributos, None)
+
+
+class BackendPypdfium2(BackendTexto):
+    nome = "pypdfium2"
+
+    def contar_paginas(self, caminho_pdf):
+        import pypdfium2 as pdfium
+        pdf = pdfium.PdfDocument(caminho_pdf)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def iterar_paginas(self, caminho_pdf, inicio=0, fim=None):
+        import pypdfium2 as pdfium
+        pdf = pdfium.PdfDocument(caminho_pdf)
+        try:
+            for indice in range(inicio, len(pdf) if fim is None else fim):
+                try:
+                    pagina = pdf[indice]
+                    pagina_texto = pagina.get_textpage()
+                    texto = pagina_texto.get_text_range()
+                    pagina_texto.close()
+                    pagina.close()
+                    # PDFium separa linhas com \r\n; o parser trabalha com \n
+                    yield indice, texto.replace("\r\n", "\n").replace("\r", "\n"), None
+                except Exception as e:
+                    yield indice, None, str(e)
+        finally:
+            pdf.close()
+
+
+BACKENDS: Dict[str, BackendTexto] = {
+    backend.nome: backend for backend in (BackendPdfplumber(), BackendPdfminer(), BackendPypdfium2())
+}
+
+BACKEND_PADRAO = "pdfplumber"
+
+
+def obter_backend(nome: str) -> BackendTexto:
+    """Backend pelo nome (ValueError se não existir)"""
+    try:
+        return BACKENDS[nome]
+    except KeyError:
+        raise ValueError(f"Backend de PDF desconhecido: {nome} (disponíveis: {', '.join(BACKENDS)})")
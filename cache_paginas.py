@@ -0,0 +1,136 @@
+"""
+Cache em disco do texto extraído das páginas dos PDFs
+
+Guarda o texto de cada página indexado pelo hash do conteúdo do arquivo
+(mais o backend de leitura usado) e pelo número da página. Reprocessar o mesmo PDF (ajuste de formato de saída,
+correção de regra de campo) passa a ler o texto do cache em vez de rodar o
+leitor de PDF de novo. O tamanho total é limitado com descarte LRU por documento.
+"""
+
+import os
+import time
+import hashlib
+import sqlite3
+from typing import Iterable, Iterator, Optional
+
+
+# Limite padrão do cache (soma do texto de todos os documentos guardados)
+LIMITE_PADRAO_BYTES = 512 * 1024 * 1024
+
+
+def diretorio_padrao() -> str:
+    """Diretório do cache (pode ser trocado pela variável EXTRATOR_CACHE_DIR)"""
+    if os.environ.get('EXTRATOR_CACHE_DIR'):
+        return os.environ['EXTRATOR_CACHE_DIR']
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'extrator_fichas')
+
+
+def calcular_hash(caminho_arquivo: str) -> str:
+    """SHA-256 do conteúdo do arquivo, lido em blocos para não carregar tudo na memória"""
+    sha = hashlib.sha256()
+    with open(caminho_arquivo, 'rb') as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+class CachePaginas:
+    """Cache SQLite de texto por página, com descarte LRU limitado por tamanho"""
+
+    def __init__(self, diretorio: Optional[str] = None, limite_bytes: int = LIMITE_PADRAO_BYTES):
+        self.diretorio = diretorio or diretorio_padrao()
+        self.limite_bytes = limite_bytes
+        os.makedirs(self.diretorio, exist_ok=True)
+        # Conexão criada na thread que usa o cache (a thread de processamento da GUI)
+        self.conexao = sqlite3.connect(os.path.join(self.diretorio, 'paginas.sqlite3'))
+        self.conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS documentos (
+                chave TEXT PRIMARY KEY,
+                total_paginas INTEGER NOT NULL,
+                tamanho INTEGER NOT NULL,
+                acessado_em REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS paginas (
+                chave TEXT NOT NULL,
+                pagina INTEGER NOT NULL,
+                texto TEXT NOT NULL,
+                PRIMARY KEY (chave, pagina)
+            );
+        """)
+
+    def fechar(self):
+        self.conexao.close()
+
+    def total_paginas(self, chave: str) -> Optional[int]:
+        """
+        Número de páginas de um documento completo no cache
+
+        Returns:
+            Total de páginas, ou None se o documento não está (completo) no cache
+        """
+        linha = self.conexao.execute(
+            "SELECT total_paginas FROM documentos WHERE chave = ?", (chave,)
+        ).fetchone()
+        if linha is None:
+            return None
+        with self.conexao:
+            self.conexao.execute(
+                "UPDATE documentos SET acessado_em = ? WHERE chave = ?", (time.time(), chave)
+            )
+        return linha[0]
+
+    def ler_paginas(self, chave: str) -> Iterator[str]:
+        """Devolve o texto das páginas em ordem, sem carregar o documento inteiro"""
+        cursor = self.conexao.execute(
+            "SELECT texto FROM paginas WHERE chave = ? ORDER BY pagina", (chave,)
+        )
+        for (texto,) in cursor:
+            yield texto
+
+    def armazenar_em_fluxo(self, chave: str, paginas: Iterable[Optional[str]]) -> Iterator[Optional[str]]:
+        """
+        Repassa as páginas lidas do PDF gravando cada uma no cache
+
+        Páginas com erro de leitura chegam como None; nesse caso o documento não é
+        marcado como completo, para que a próxima execução tente ler de novo.
+        """
+        with self.conexao:
+            self.conexao.execute("DELETE FROM documentos WHERE chave = ?", (chave,))
+            self.conexao.execute("DELETE FROM paginas WHERE chave = ?", (chave,))
+
+        total = 0
+        tamanho = 0
+        completo = True
+        for indice, texto in enumerate(paginas):
+            if texto is None:
+                completo = False
+            else:
+                self.conexao.execute(
+                    "INSERT INTO paginas (chave, pagina, texto) VALUES (?, ?, ?)", (chave, indice, texto)
+                )
+                tamanho += len(texto)
+            total += 1
+            yield texto
+
+        if completo:
+            self.conexao.execute(
+                "INSERT INTO documentos (chave, total_paginas, tamanho, acessado_em) VALUES (?, ?, ?, ?)",
+                (chave, total, tamanho, time.time())
+            )
+            self.conexao.commit()
+            self.aplicar_limite()
+        else:
+            self.conexao.rollback()
+
+    def aplicar_limite(self):
+        """Descarta os documentos menos usados até o cache caber no limite"""
+        with self.conexao:
+            ocupado = self.conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM documentos").fetchone()[0]
+            cursor = self.conexao.execute("SELECT chave, tamanho FROM documentos ORDER BY acessado_em")
+            for chave, tamanho in cursor.fetchall():
+                if ocupado <= self.limite_bytes:
+                    break
+                self.conexao.execute("DELETE FROM documentos WHERE chave = ?", (chave,))
+                self.conexao.execute("DELETE FROM paginas WHERE chave = ?", (chave,))
+                ocupado -= tamanho
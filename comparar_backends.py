@@ -0,0 +1,119 @@
+"""
+Comparação dos backends de leitura de PDF
+
+Roda todos os backends disponíveis sobre um PDF de amostra e mostra, para cada um:
+- páginas por segundo na leitura do texto
+- registros separados
+- concordância, campo a campo, com o resultado de extrair_campos sobre o texto
+  do backend de referência (pdfplumber, o leitor original)
+
+Uso:
+    python comparar_backends.py amostra.pdf [--paginas 200] [--referencia pdfplumber]
+"""
+
+import argparse
+import sys
+import time
+from typing import Dict, List, Optional
+
+from backends_pdf import BACKENDS, BACKEND_PADRAO, obter_backend
+from extracao_pdf import SeparadorFuncionarios, extrair_campos
+
+
+def ler_backend(nome: str, caminho_pdf: str, limite_paginas: Optional[int]):
+    """
+    Lê o PDF com um backend e extrai os campos de todos os registros
+
+    Returns:
+        (páginas lidas, segundos de leitura, lista de dicionários de campos)
+    """
+    backend = obter_backend(nome)
+    total = backend.contar_paginas(caminho_pdf)
+    fim = min(total, limite_paginas) if limite_paginas else total
+
+    t0 = time.perf_counter()
+    textos, erros = backend.extrair_paginas(caminho_pdf, 0, fim)
+    segundos = time.perf_counter() - t0
+    for indice, erro in erros:
+        print(f"   ⚠️  {nome}: erro na página {indice + 1}: {erro}")
+
+    separador = SeparadorFuncionarios()
+    registros: List[str] = []
+    for texto in textos:
+        if texto:
+            registros.extend(separador.alimentar(texto))
+    registros.extend(separador.finalizar())
+    return fim, segundos, [extrair_campos(registro) for registro in registros]
+
+
+def comparar_campos(referencia: List[Dict], candidato: List[Dict]) -> Dict[str, float]:
+    """
+    Concordância por campo entre dois resultados
+
+    Os registros são pareados pela ordem. Para cada campo, conta os registros em que
+    o candidato tem exatamente o mesmo valor da referência (registros que faltam no
+    candidato contam como divergência).
+
+    Returns:
+        Dicionário campo -> fração de registros iguais (0 a 1)
+    """
+    campos = []
+    for dados in referencia:
+        for campo in dados:
+            if campo not in campos:
+                campos.append(campo)
+
+    concordancia = {}
+    for campo in campos:
+        iguais = 0
+        for i, dados_ref in enumerate(referencia):
+            if i < len(candidato) and candidato[i].get(campo) == dados_ref.get(campo):
+                iguais += 1
+        concordancia[campo] = iguais / len(referencia) if referencia else 1.0
+    return concordancia
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara velocidade e fidelidade dos backends de leitura de PDF")
+    parser.add_argument("pdf", help="PDF de amostra")
+    parser.add_argument("--paginas", type=int, default=None, help="Lê só as N primeiras páginas")
+    parser.add_argument("--referencia", default=BACKEND_PADRAO, choices=list(BACKENDS),
+                        help="Backend cujos campos são tomados como corretos")
+    parser.add_argument("--detalhar", action="store_true", help="Mostra a concordância de cada campo")
+    args = parser.parse_args()
+
+    resultados = {}
+    for nome in BACKENDS:
+        print(f"📄 Lendo com {nome}...")
+        try:
+            resultados[nome] = ler_backend(nome, args.pdf, args.paginas)
+        except ImportError as e:
+            print(f"   ⏭️  {nome} não instalado ({e})")
+        except Exception as e:
+            print(f"   ❌ {nome} falhou: {e}")
+
+    if args.referencia not in resultados:
+        print(f"\n❌ Backend de referência ({args.referencia}) indisponível; nada a comparar.")
+        return 1
+
+    dados_referencia = resultados[args.referencia][2]
+
+    print(f"\n{'Backend':<12} {'Páginas/s':>10} {'Registros':>10} {'Concordância':>13} {'Campos 100%':>12}")
+    print("-" * 61)
+    for nome, (paginas, segundos, dados) in resultados.items():
+        concordancia = comparar_campos(dados_referencia, dados)
+        media = sum(concordancia.values()) / len(concordancia) if concordancia else 1.0
+        completos = sum(1 for valor in concordancia.values() if valor == 1.0)
+        velocidade = paginas / segundos if segundos > 0 else float("inf")
+        print(f"{nome:<12} {velocidade:>10.1f} {len(dados):>10} {media:>12.1%} {completos:>6}/{len(concordancia):<5}")
+
+        if args.detalhar and nome != args.referencia:
+            for campo, valor in sorted(concordancia.items(), key=lambda item: item[1]):
+                if valor < 1.0:
+                    print(f"    {campo:<30} {valor:.1%}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
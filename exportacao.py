@@ -0,0 +1,359 @@
+"""
+Exportação em fluxo dos registros extraídos
+
+Os escritores recebem os registros em lotes, à medida que os workers terminam,
+e gravam direto no arquivo de saída. As colunas são fixadas na criação, então
+nada precisa ficar acumulado em memória e o arquivo já é utilizável mesmo que
+a execução seja interrompida no meio.
+
+O Excel usa o modo write-only do openpyxl: as linhas vão para um XML temporário
+em disco em vez de uma planilha inteira em memória (como no df.to_excel).
+
+O Parquet (pyarrow) grava colunas tipadas: datas como date32, valores em R$
+como decimal e campos de poucos valores distintos com codificação de dicionário.
+"""
+
+import csv
+import os
+import re
+import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, List, Optional
+
+# Separador e codificação de cada formato texto (os mesmos do to_csv original)
+FORMATOS_TEXTO = {
+    "CSV": (";", "utf-8-sig"),
+    "TXT": ("|", "utf-8"),
+}
+
+
+# Troca os separadores do formato en-US ("1,234.56") para o pt-BR ("1.234,56")
+SEPARADORES_PT_BR = str.maketrans(",.", ".,")
+
+
+def formatar_valor(valor: float) -> str:
+    """1234.56 -> '1.234,56': valor normalizado (normalizacao.py) no texto do documento"""
+    return f"{valor:,.2f}".translate(SEPARADORES_PT_BR)
+
+
+class EscritorCSV:
+    """Grava registros (dicionários) em CSV/TXT, um lote por vez"""
+
+    def __init__(self, caminho: str, formato: str, colunas: List[str],
+                 valores_fixos: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            caminho: Arquivo de saída (sobrescrito)
+            formato: "CSV" (;) ou "TXT" (|)
+            colunas: Colunas na ordem de saída; campos fora delas são ignorados
+            valores_fixos: Colunas com o mesmo valor em todas as linhas (ex.: arquivo de origem)
+        """
+        separador, codificacao = FORMATOS_TEXTO[formato]
+        self.caminho = caminho
+        self.valores_fixos = dict(valores_fixos or {})
+        self.total = 0
+        # newline='' e lineterminator=os.linesep: mesmas quebras de linha do pandas
+        self.arquivo = open(caminho, 'w', newline='', encoding=codificacao)
+        self.escritor = csv.DictWriter(
+            self.arquivo, fieldnames=list(colunas), delimiter=separador,
+            lineterminator=os.linesep, restval='', extrasaction='ignore'
+        )
+        self.escritor.writeheader()
+
+    def escrever(self, registros: Iterable[Dict[str, str]]):
+        """Grava um lote e descarrega no disco"""
+        for registro in registros:
+            if self.valores_fixos:
+                registro = {**registro, **self.valores_fixos}
+            if any(isinstance(valor, float) for valor in registro.values()):
+                # Valores normalizados voltam ao formato pt-BR: o CSV usa ; e vírgula decimal
+                registro = {chave: formatar_valor(valor) if isinstance(valor, float) else valor
+                            for chave, valor in registro.items()}
+            self.escritor.writerow(registro)
+            self.total += 1
+        self.arquivo.flush()
+
+    def fechar(self):
+        if not self.arquivo.closed:
+            self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+        return False
+
+
+class EscritorExcel:
+    """Grava registros (dicionários) em XLSX linha a linha, com memória constante"""
+
+    def __init__(self, caminho: str, colunas: List[str],
+                 valores_fixos: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            caminho: Arquivo de saída (sobrescrito ao fechar)
+            colunas: Colunas na ordem de saída; campos fora delas são ignorados
+            valores_fixos: Colunas com o mesmo valor em todas as linhas (ex.: arquivo de origem)
+        """
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+
+        self.caminho = caminho
+        self.colunas = list(colunas)
+        self.valores_fixos = dict(valores_fixos or {})
+        self.total = 0
+        self.livro = Workbook(write_only=True)
+        # Mesmo nome de aba e cabeçalho em negrito do to_excel
+        self.planilha = self.livro.create_sheet("Sheet1")
+        negrito = Font(bold=True)
+        cabecalho = []
+        for coluna in self.colunas:
+            celula = WriteOnlyCell(self.planilha, value=coluna)
+            celula.font = negrito
+            cabecalho.append(celula)
+        self.planilha.append(cabecalho)
+
+    def escrever(self, registros: Iterable[Dict[str, str]]):
+        colunas = self.colunas
+        for registro in registros:
+            if self.valores_fixos:
+                registro = {**registro, **self.valores_fixos}
+            self.planilha.append([registro.get(coluna) for coluna in colunas])
+            self.total += 1
+
+    def fechar(self):
+        # O XLSX só é montado no save; sem ele nem as linhas já gravadas ficam no arquivo.
+        # Por isso salva também quando a execução é interrompida.
+        if self.livro is not None:
+            livro, self.livro = self.livro, None
+            livro.save(self.caminho)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+        return False
+
+
+# Tipos das colunas no Parquet: "data" (dd/mm/aaaa -> date32), "decimal" (R$ -> decimal
+# com 2 casas), "categoria" (texto com dicionário). Colunas não listadas ficam como texto.
+TIPOS_PARQUET_PDF = {
+    **dict.fromkeys([
+        'Data_Nascimento', 'Data_Emissao_RG', 'Data_Admissao', 'Data_Rescisao',
+        'Data_Opcao_FGTS', 'Data_Registro'
+    ], "data"),
+    'Salario': "decimal",
+    **dict.fromkeys([
+        'Raca_Cor', 'Sexo', 'Estado_Civil', 'Estado', 'Orgao_Expedidor', 'Cidade', 'Funcao', 'CBO',
+        'Deficiente', 'Tipo_Deficiencia', 'Tipo_Sanguineo', 'Nacionalidade', 'Naturalidade',
+        'Grau_Instrucao', 'Sindicato', 'Centro_Custo', 'Localizacao', 'Banco_FGTS',
+        'CNPJ_Empregador', 'Arquivo'
+    ], "categoria"),
+}
+
+TIPOS_PARQUET_DOCX = {
+    **dict.fromkeys([
+        'data_nascimento', 'data_emissao_rg', 'data_cadastramento_pis', 'data_admissao',
+        'data_registro', 'data_opcao_fgts', 'data_rescisao'
+    ], "data"),
+    **dict.fromkeys(['salario_inicial', 'saldo_fgts', 'maior_remuneracao'], "decimal"),
+    **dict.fromkeys([
+        'raca_cor', 'sexo', 'estado_civil', 'estado', 'cidade', 'naturalidade', 'nacionalidade',
+        'deficiente', 'tipo_deficiencia', 'tipo_sanguineo', 'orgao_uf_rg', 'grau_instrucao',
+        'funcao', 'cbo', 'forma_pagamento', 'tipo_pagamento', 'insalubridade', 'periculosidade',
+        'sindicato', 'centro_custo', 'localizacao', 'banco_fgts', 'aviso_previo',
+        'causa_rescisao', 'empregador', 'cnpj_empregador', 'arquivo_origem'
+    ], "categoria"),
+}
+
+RE_DATA = re.compile(r'(\d{2})/(\d{2})/(\d{4})')
+RE_VALOR = re.compile(r'\d[\d.]*(?:,\d+)?')
+CENTAVOS = Decimal("0.01")
+
+
+def converter_data(valor) -> Optional[datetime.date]:
+    """dd/mm/aaaa -> date; vazio ou inválido -> None"""
+    if not valor:
+        return None
+    match = RE_DATA.search(str(valor))
+    if not match:
+        return None
+    dia, mes, ano = (int(parte) for parte in match.groups())
+    try:
+        return datetime.date(ano, mes, dia)
+    except ValueError:
+        return None
+
+
+def converter_decimal(valor) -> Optional[Decimal]:
+    """'R$ 1.234,56' -> Decimal('1234.56'); vazio ou inválido -> None"""
+    if isinstance(valor, (int, float)):
+        # Já normalizado (normalizacao.py) para número em reais
+        return Decimal(str(valor)).quantize(CENTAVOS)
+    if not valor:
+        return None
+    match = RE_VALOR.search(str(valor))
+    if not match:
+        return None
+    try:
+        return Decimal(match.group().replace('.', '').replace(',', '.')).quantize(CENTAVOS)
+    except InvalidOperation:
+        return None
+
+
+class EscritorParquet:
+    """Grava registros (dicionários) em Parquet tipado, um grupo de linhas por vez"""
+
+    # Linhas acumuladas antes de gravar um row group (limita a memória do buffer)
+    LINHAS_POR_GRUPO = 50000
+
+    def __init__(self, caminho: str, colunas: List[str], tipos: Optional[Dict[str, str]] = None,
+                 valores_fixos: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            caminho: Arquivo de saída (sobrescrito)
+            colunas: Colunas na ordem de saída; campos fora delas são ignorados
+            tipos: Tipo de cada coluna ("data", "decimal", "categoria"); as demais são texto
+            valores_fixos: Colunas com o mesmo valor em todas as linhas (ex.: arquivo de origem)
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.caminho = caminho
+        self.colunas = list(colunas)
+        self.valores_fixos = dict(valores_fixos or {})
+        self.total = 0
+        tipos = tipos or {}
+        self.tipos = [tipos.get(coluna) for coluna in self.colunas]
+
+        tipos_arrow = {
+            "data": pa.date32(),
+            "decimal": pa.decimal128(14, 2),
+            "categoria": pa.dictionary(pa.int32(), pa.string()),
+        }
+        self.esquema = pa.schema([
+            pa.field(coluna, tipos_arrow.get(tipo, pa.string()))
+            for coluna, tipo in zip(self.colunas, self.tipos)
+        ])
+        self.escritor = pq.ParquetWriter(caminho, self.esquema, compression="zstd")
+        self.buffer = [[] for _ in self.colunas]
+
+    def escrever(self, registros: Iterable[Dict[str, str]]):
+        buffer = self.buffer
+        for registro in registros:
+            if self.valores_fixos:
+                registro = {**registro, **self.valores_fixos}
+            for valores, coluna in zip(buffer, self.colunas):
+                valor = registro.get(coluna)
+                # Só ausente e vazio viram nulo: um salário 0.0 normalizado é um valor
+                valores.append(None if valor is None or valor == '' else valor)
+            self.total += 1
+        if buffer and len(buffer[0]) >= self.LINHAS_POR_GRUPO:
+            self._gravar_grupo()
+
+    def _gravar_grupo(self):
+        pa = self.pa
+        if not self.colunas or not self.buffer[0]:
+            return
+        arrays = []
+        for valores, tipo in zip(self.buffer, self.tipos):
+            if tipo == "data":
+                arrays.append(pa.array([converter_data(v) for v in valores], pa.date32()))
+            elif tipo == "decimal":
+                arrays.append(pa.array([converter_decimal(v) for v in valores], pa.decimal128(14, 2)))
+            elif tipo == "categoria":
+                arrays.append(pa.array(valores, pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(valores, pa.string()))
+        self.escritor.write_table(pa.Table.from_arrays(arrays, schema=self.esquema))
+        self.buffer = [[] for _ in self.colunas]
+
+    def fechar(self):
+        if self.escritor is not None:
+            try:
+                self._gravar_grupo()
+            finally:
+                self.escritor.close()
+                self.escritor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+        return False
+
+
+def ordenar_colunas(registros: Iterable[Dict[str, str]], colunas_prioritarias: Iterable[str] = ()) -> List[str]:
+    """
+    Colunas de uma lista de registros: as prioritárias que existem primeiro, depois
+    as demais na ordem em que aparecem (a mesma ordem das colunas de um DataFrame)
+    """
+    todas = {}
+    for registro in registros:
+        for coluna in registro:
+            todas.setdefault(coluna)
+    ordenadas = [coluna for coluna in colunas_prioritarias if coluna in todas]
+    ordenadas.extend(coluna for coluna in todas if coluna not in ordenadas)
+    return ordenadas
+
+
+def exportar_excel(registros: List[Dict[str, str]], caminho: str,
+                   colunas_prioritarias: Iterable[str] = ()) -> List[str]:
+    """
+    Exporta registros já extraídos para XLSX sem montar DataFrame nem planilha em memória
+
+    Args:
+        registros: Lista de dicionários com os dados
+        caminho: Arquivo Excel de saída
+        colunas_prioritarias: Colunas que devem vir primeiro, se existirem
+
+    Returns:
+        Colunas gravadas, na ordem
+    """
+    colunas = ordenar_colunas(registros, colunas_prioritarias)
+    with EscritorExcel(caminho, colunas) as escritor:
+        escritor.escrever(registros)
+    return colunas
+
+
+def exportar_parquet(registros: List[Dict[str, str]], caminho: str, tipos: Dict[str, str],
+                     colunas_prioritarias: Iterable[str] = ()) -> List[str]:
+    """
+    Exporta registros já extraídos para Parquet tipado
+
+    Args:
+        registros: Lista de dicionários com os dados
+        caminho: Arquivo Parquet de saída
+        tipos: Tipo de cada coluna (TIPOS_PARQUET_PDF ou TIPOS_PARQUET_DOCX)
+        colunas_prioritarias: Colunas que devem vir primeiro, se existirem
+
+    Returns:
+        Colunas gravadas, na ordem
+    """
+    colunas = ordenar_colunas(registros, colunas_prioritarias)
+    with EscritorParquet(caminho, colunas, tipos) as escritor:
+        escritor.escrever(registros)
+    return colunas
+
+
+def criar_escritor(caminho: str, formato: str, colunas: List[str],
+                   valores_fixos: Optional[Dict[str, str]] = None,
+                   tipos: Optional[Dict[str, str]] = None):
+    """
+    Escritor em fluxo para o formato pedido (tipos só valem para o Parquet)
+
+    Returns:
+        Escritor com escrever(registros), fechar() e total
+    """
+    if formato in FORMATOS_TEXTO:
+        return EscritorCSV(caminho, formato, colunas, valores_fixos)
+    if formato == "Excel":
+        return EscritorExcel(caminho, colunas, valores_fixos)
+    if formato == "Parquet":
+        return EscritorParquet(caminho, colunas, tipos, valores_fixos)
+    raise ValueError(f"Formato de saída desconhecido: {formato}")
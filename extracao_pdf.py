@@ -0,0 +1,624 @@
+"""
+Funções de extração das fichas de registro em PDF (lado dos workers)
+
+Este módulo concentra tudo que roda nos processos do pool de extração:
+leitura das páginas, separação das fichas e parser dos campos. Ele não
+importa a interface gráfica, então os workers carregam apenas o necessário.
+"""
+
+import os
+import re
+import time
+import bisect
+import signal
+import threading
+from backends_pdf import obter_backend, BACKEND_PADRAO
+from perfil_regras import PerfilRegras
+
+# ==============================
+# FUNÇÕES DE EXTRAÇÃO (Top-level)
+# ==============================
+# =========================================================================
+# LISTA DE TODOS OS LABELS CONHECIDOS (Para evitar "merging" de campos)
+# =========================================================================
+# Se o robô encontrar um desses termos na linha de valor, ele para.
+LABELS_CONHECIDOS = [
+    "Nome do", "Data de", "Raça", "Cor", "Sexo", "Deficiente", "Tipo de", "Sanguíneo",
+    "Estado", "Nacionalidade", "Chegada", "CPF", "Cédula", "Emissão", "Órgão", "Habilitação",
+    "CTPS", "Série", "Dígito", "Carteira", "Conta", "Zona", "PIS", "Civil", "Endereço",
+    "Bairro", "Cidade", "CEP", "Telefone", "Celular", "Admissão", "Função", "CBO",
+    "Salário", "Forma", "Pagamento", "Categoria", "Matrícula", "Sindicato", "Centro",
+    "Localização", "Filiação", "Nascimento", "Fotografia", "Naturalidade", "Plano",
+    "Empresa", "Horário", "Rescisão", "Aviso", "Saldo", "Maior", "Recolheu", "Causa",
+    "Assinatura", "CNPJ", "FGTS", "Eleitor", "Seção", "Grau", "Instrução", "Cadastramento",
+    "Optante", "Banco", "Eletrônico", "Registro", "Insalubridade", "Periculosidade", "Comissão"
+]
+
+# Campos de valor simples: "Label" seguido do valor na mesma linha ou nas seguintes
+CAMPOS_SIMPLES = {
+    r"Nome do pai": "Nome_Pai",
+    r"Nome da mãe": "Nome_Mae",
+    r"Data de nascimento": "Data_Nascimento",  # Backup caso regex trinca falhe
+    r"Raça/cor": "Raca_Cor",                   # Backup
+    r"Sexo": "Sexo",                           # Backup
+    r"Deficiente": "Deficiente",
+    r"Tipo de deficiência": "Tipo_Deficiencia",
+    r"Tipo sanguíneo": "Tipo_Sanguineo",
+    r"Estado Civil": "Estado_Civil",           # Ajustado label
+    r"Nacionalidade": "Nacionalidade",
+    r"Naturalidade": "Naturalidade",           # NOVO
+    r"Data rescisão": "Data_Rescisao",         # NOVO
+    r"Data de rescisão": "Data_Rescisao",      # Variação
+    r"Chegada ao Brasil": "Chegada_Brasil",
+    r"CTPS": "CTPS",
+    r"Série": "Serie_CTPS",
+    r"Dígito": "Digito_CTPS",
+    r"Carteira reservista": "Reservista",
+    r"Zona": "Zona_Eleitoral",
+    r"Seção": "Secao_Eleitoral",
+    r"Nº título de eleitor": "Titulo_Eleitor",
+    r"Nº do PIS": "PIS",
+    r"Endereço": "Endereco",                   # Backup
+    r"Bairro": "Bairro",                       # Backup
+    r"Celular": "Celular",
+    r"Matricula eSocial": "Matricula_eSocial",
+    r"Sindicato": "Sindicato",
+    r"Horário": "Horario",
+    r"Data de opção": "Data_Opcao_FGTS",
+    r"Centro de custo": "Centro_Custo",
+    r"Localização": "Localizacao",
+    r"Endereço eletrônico": "Email",
+    r"Data do registro": "Data_Registro",
+    r"Grau de instrução": "Grau_Instrucao",
+    r"Nº da conta FGTS": "Conta_FGTS",
+    r"Banco depositário": "Banco_FGTS",
+    r"CNPJ": "CNPJ_Empregador"
+}
+
+# As buscas abaixo rodam sobre o texto em minúsculas com padrões em minúsculas: uma
+# alternação sensível a maiúsculas deixa o re filtrar pelo primeiro caractere, o que
+# não acontece com IGNORECASE (que seria tão lento quanto as buscas individuais).
+
+# Um termo conhecido nos primeiros 20 caracteres da linha indica que ela é um label
+RE_LABEL_CONHECIDO = re.compile('|'.join(re.escape(termo.lower()) for termo in LABELS_CONHECIDOS))
+
+# Alternação com todos os labels de CAMPOS_SIMPLES, do mais longo para o mais curto:
+# em cada posição vence o label mais longo e os que são prefixo dele ("Endereço" em
+# "Endereço eletrônico") são resolvidos pela tabela de prefixos.
+_LABELS_POR_TAMANHO = sorted(CAMPOS_SIMPLES, key=len, reverse=True)
+RE_CAMPOS_SIMPLES = re.compile('|'.join(re.escape(label.lower()) for label in _LABELS_POR_TAMANHO))
+_PREFIXOS_LABEL = {
+    label.lower(): [outro for outro in _LABELS_POR_TAMANHO if label.lower().startswith(outro.lower())]
+    for label in _LABELS_POR_TAMANHO
+}
+
+def localizar_labels(texto):
+    # Retorna {label: posição logo após a primeira ocorrência} para os labels de CAMPOS_SIMPLES.
+    # A busca recomeça um caractere após cada início para não perder labels sobrepostos.
+    ocorrencias = {}
+    minusculo = texto.lower()
+    if len(minusculo) != len(texto):
+        # Caracteres cuja minúscula muda de tamanho (ex.: "İ") desalinhariam as posições
+        for label in CAMPOS_SIMPLES:
+            match = re.search(re.escape(label), texto, re.IGNORECASE)
+            if match:
+                ocorrencias[label] = match.end()
+        return ocorrencias
+
+    match = RE_CAMPOS_SIMPLES.search(minusculo)
+    while match:
+        inicio = match.start()
+        for label in _PREFIXOS_LABEL[match.group()]:
+            if label not in ocorrencias:
+                ocorrencias[label] = inicio + len(label)
+        if len(ocorrencias) == len(CAMPOS_SIMPLES):
+            break
+        match = RE_CAMPOS_SIMPLES.search(minusculo, inicio + 1)
+    return ocorrencias
+
+def eh_linha_de_label(linha):
+    return RE_LABEL_CONHECIDO.search(linha[:20].lower()) is not None
+
+class IndiceLinhas:
+    # Índice de linhas de um registro, construído uma vez e compartilhado entre os labels
+    def __init__(self, texto):
+        self.linhas = texto.split('\n')
+        self.inicios = []
+        pos = 0
+        for linha in self.linhas:
+            self.inicios.append(pos)
+            pos += len(linha) + 1
+        self.eh_label = {}  # Cache da verificação anti-merging por linha inteira
+
+    def valor_apos(self, posicao):
+        # Primeira linha válida após a posição (o resto da própria linha conta como a primeira).
+        # Retorna None se o campo estiver vazio (a próxima linha já é outro label).
+        n = bisect.bisect_right(self.inicios, posicao) - 1
+        linha = self.linhas[n][posicao - self.inicios[n]:].strip()
+        parcial = True
+        while True:
+            if linha and len(linha) >= 2 and linha != ":":
+                # VERIFICAÇÃO DE COERÊNCIA (ANTI-MERGING)
+                # Se a linha começa com QUALQUER label conhecido o campo atual está VAZIO
+                if parcial:
+                    eh_label = eh_linha_de_label(linha)
+                else:
+                    eh_label = self.eh_label.get(n)
+                    if eh_label is None:
+                        eh_label = self.eh_label[n] = eh_linha_de_label(linha)
+                return None if eh_label else linha
+            n += 1
+            if n >= len(self.linhas):
+                return None
+            linha = self.linhas[n].strip()
+            parcial = False
+
+# Regras de extrair_campos, compiladas uma vez e com nome para o perfil (perfil_regras.py)
+REGRAS = {
+    # Dados principais na primeira linha: "1 1 ELZA MATOS LIMA"
+    "primeira_linha": re.compile(r'^\s*(\d+)\s+(\d+)\s+(.+?)(\n|$)'),
+    "nascimento_cor_sexo": re.compile(r'(?P<Nasc>\d{2}/\d{2}/\d{4})\s+(?P<Cor>[A-Za-zÀ-ÿ]+)\s+(?P<Sexo>Masculino|Feminino)'),
+    "data_estado_civil": re.compile(r'(?P<Data>\d{2}/\d{2}/\d{4})\s+(?P<Civil>Solteiro|Casado|Divorciado|Viúvo|Separado|União Estável)'),
+    "documentos_cabecalho": re.compile(r'CPF.*Cédula de identidade'),
+    "documentos_linha": re.compile(r'(?P<CPF>\d{3}\.\d{3}\.\d{3}-\d{2})\s+(?P<RG>[^\s]+)\s+(?:(?P<Orgao>[A-Za-z]+/[A-Z]{2})\s+)?(?P<Data>\d{2}/\d{2}/\d{4})'),
+    "admissao_cabecalho": re.compile(r'Data de admissão.*Função.*CBO'),
+    "admissao_funcao_cbo": re.compile(r'(?P<Data>\d{2}/\d{2}/\d{4})\s+(?P<Func>.+?)\s+(?P<CBO>\d{4}-\d{2})'),
+    "admissao_funcao": re.compile(r'(?P<Data>\d{2}/\d{2}/\d{4})\s+(?P<Func>.+)'),
+    "rescisao_label": re.compile(r'(?i)(?:Data\s+(?:de\s+)?rescis[sç]ão)[:\s]*(\d{2}/\d{2}/\d{4})'),
+    "rescisao_contexto": re.compile(r'(?i)rescis[sç]ão.*?\n\s*(\d{2}/\d{2}/\d{4})', re.DOTALL),
+    "cidade_cep_telefone_cabecalho": re.compile(r'Cidade.*CEP.*Telefone'),
+    "cidade_estado_cep_cabecalho": re.compile(r'Cidade.*Estado.*CEP'),
+    "cidade_cep_telefone": re.compile(r'(?P<Cidade>[A-Za-zÀ-ÿ\s]+?)\s+(?P<CEP>\d{5}-?\d{3})\s+(?P<Tel>.+)'),
+    "cidade_estado_cep_telefone_cabecalho": re.compile(r'Cidade.*Estado.*CEP.*Telefone'),
+    "cidade_estado_cep_telefone": re.compile(r'(?P<Cidade>.+?)\s+(?P<UF>[A-Z]{2})\s+(?P<CEP>\d{5}-?\d{3})\s+(?P<Tel>.+)'),
+    "endereco_bairro_cabecalho": re.compile(r'Endereço\s+Bairro'),
+    "salario": re.compile(r'R\$\s*([\d\.,]+)'),
+    "id_inicio": re.compile(r'^\s*(\d+)'),
+    "id_codigo": re.compile(r'(?i)C[óoÕó]digo\s*\n?\s*(\d+)'),
+}
+
+# Perfil das regras do lote em andamento (None fora do modo de perfil)
+_perfil = None
+
+def buscar(nome, texto):
+    # re.search com a regra nomeada; no modo de perfil, mede o tempo e se achou
+    if _perfil is None:
+        return REGRAS[nome].search(texto)
+    t = time.perf_counter()
+    match = REGRAS[nome].search(texto)
+    _perfil.registrar(nome, time.perf_counter() - t, match is not None)
+    return match
+
+def valor_medido(indice, label, ocorrencias):
+    # Modo de perfil: leitura do valor de um label de CAMPOS_SIMPLES (ausente conta como falha)
+    t = time.perf_counter()
+    valor = indice.valor_apos(ocorrencias[label]) if label in ocorrencias else None
+    _perfil.registrar(f"campo: {label}", time.perf_counter() - t, valor is not None)
+    return valor
+
+# Todas as colunas que extrair_campos pode produzir, na ordem em que aparecem no
+# registro. Fixa o esquema da exportação em fluxo antes do primeiro resultado:
+# um campo novo em extrair_campos precisa ser incluído aqui.
+COLUNAS_PDF = list(dict.fromkeys([
+    'ID', 'Nome', 'Data_Nascimento', 'Raca_Cor', 'Sexo', 'Estado_Civil', 'CPF', 'RG',
+    'Orgao_Expedidor', 'Data_Emissao_RG', 'Data_Admissao', 'Funcao', 'CBO', 'Data_Rescisao',
+    'Cidade', 'Estado', 'CEP', 'Telefone', 'Endereco', 'Bairro', 'Salario',
+    *CAMPOS_SIMPLES.values()
+]))
+
+def extrair_campos(texto_funcionario):
+    dados = {}
+    
+    # 0. Parser da Primeira Linha (Dados Principais: ID, Contrato, Nome)
+    # O split consome o cabeçalho "Código Contrato Nome...", restando apenas os valores na primeira linha.
+    # Ex: "1 1 ELZA MATOS LIMA"
+    primeira_linha_match = buscar("primeira_linha", texto_funcionario.strip())
+    if primeira_linha_match:
+        dados['ID'] = primeira_linha_match.group(1)
+        # O segundo grupo é o Contrato, se precisar: dados['Contrato'] = primeira_linha_match.group(2)
+        dados['Nome'] = primeira_linha_match.group(3).strip()
+    
+    # =========================================================================
+    # ESTRATÉGIA HÍBRIDA: Parsers de Linha Específicos + Busca Genérica
+    # =========================================================================
+
+    # 1. Identificar linhas complexas (vários campos na mesma linha)
+    # Procuramos o TEXTO DA LINHA DE VALORES baseado no cabeçalho imediatamente anterior.
+    
+    # ... (Parsers específicos anteriores mantidos: CPF/RG line, Admissão line, City/State line) ...
+    # (Mantemos os blocos if re.search(...) anteriores)
+
+    # =========================================================================
+    # ESTRATÉGIA HÍBRIDA: Parsers de Linha Específicos + Busca Genérica
+    # =========================================================================
+    
+    # 1. TRINCAS E DUPLAS DE DADOS (Layouts em Colunas Mistas)
+    
+    # 1.1 Nascimento + Cor + Sexo (Ex: "18/12/1958 Branco Feminino")
+    # Tenta encontrar esse padrão específico de data, texto e gênero
+    match_trinca = buscar("nascimento_cor_sexo", texto_funcionario)
+    if match_trinca:
+        dados['Data_Nascimento'] = match_trinca.group('Nasc')
+        dados['Raca_Cor'] = match_trinca.group('Cor')
+        dados['Sexo'] = match_trinca.group('Sexo')
+
+    # 1.2 Data Pis/Cadastro + Estado Civil (Ex: "08/10/1999 Casado")
+    match_dupla_civil = buscar("data_estado_civil", texto_funcionario)
+    if match_dupla_civil:
+        # Verifica se está perto de "Data de cadastramento" ou "PIS" se possível, mas o padrão é forte.
+        # Assumindo que essa data é o Cadastro do PIS
+        # dados['Data_Cadastramento'] = match_dupla_civil.group('Data') 
+        dados['Estado_Civil'] = match_dupla_civil.group('Civil')
+
+    # 1.3 CPF + RG + Órgão/UF + Data Emissão (Colunas)
+    # Tenta capturar linha completa: 123.456.789-00  MG-12.345.678  SSP/MG  01/01/2000
+    if buscar("documentos_cabecalho", texto_funcionario):
+        # Regex mais permissivo para pegar CPF, RG (qualquer formato), Opcional Orgao, Data
+        match_docs = buscar("documentos_linha", texto_funcionario)
+        if match_docs:
+            dados['CPF'] = match_docs.group('CPF')
+            dados['RG'] = match_docs.group('RG')
+            if match_docs.group('Orgao'):
+                dados['Orgao_Expedidor'] = match_docs.group('Orgao')
+            dados['Data_Emissao_RG'] = match_docs.group('Data')
+
+    # 1.4 Admissão + Função + CBO
+    if buscar("admissao_cabecalho", texto_funcionario):
+         match_adm = buscar("admissao_funcao_cbo", texto_funcionario)
+         if match_adm:
+             dados['Data_Admissao'] = match_adm.group('Data')
+             dados['Funcao'] = match_adm.group('Func').strip()
+             dados['CBO'] = match_adm.group('CBO')
+         else:
+             # Fallback: Só Data e Função
+             match_adm_b = buscar("admissao_funcao", texto_funcionario)
+             if match_adm_b:
+                 dados['Data_Admissao'] = match_adm_b.group('Data')
+                 dados['Funcao'] = match_adm_b.group('Func').strip()
+
+    # 1.5 Data Rescisão (Simplificado e Robusto)
+    # Procura por qualquer variante de "rescisão" seguida de uma data
+    # Isso cobre: "Data rescisão", "Data de rescisão", etc.
+    if 'Data_Rescisao' not in dados:
+        # Primeiro tenta encontrar o padrão com o label explícito
+        match_resc = buscar("rescisao_label", texto_funcionario)
+        if match_resc:
+            dados['Data_Rescisao'] = match_resc.group(1)
+        else:
+            # Se não encontrou, tenta buscar em contexto de linha com "rescisão" e data na linha seguinte
+            match_resc_ctx = buscar("rescisao_contexto", texto_funcionario)
+            if match_resc_ctx:
+                dados['Data_Rescisao'] = match_resc_ctx.group(1)
+
+    # 2. ENDEREÇOS E CONTATOS (Complexidade de Colunas)
+    
+    # 2.1 Cidade + CEP + Telefone (SEM ESTADO - Caso observado na imagem 7)
+    # Ex: "Campinas 13060-518 (19) -"
+    # Regex que pega texto, cep e resto
+    if buscar("cidade_cep_telefone_cabecalho", texto_funcionario) and not buscar("cidade_estado_cep_cabecalho", texto_funcionario):
+        match_end_short = buscar("cidade_cep_telefone", texto_funcionario)
+        if match_end_short:
+             dados['Cidade'] = match_end_short.group('Cidade').strip()
+             dados['CEP'] = match_end_short.group('CEP')
+             dados['Telefone'] = match_end_short.group('Tel').strip()
+
+    # 2.2 Cidade + Estado + CEP + Telefone (Com Estado de 2 letras)
+    elif buscar("cidade_estado_cep_telefone_cabecalho", texto_funcionario):
+        match_end_full = buscar("cidade_estado_cep_telefone", texto_funcionario)
+        if match_end_full:
+            dados['Cidade'] = match_end_full.group('Cidade').strip()
+            dados['Estado'] = match_end_full.group('UF')
+            dados['CEP'] = match_end_full.group('CEP')
+            dados['Telefone'] = match_end_full.group('Tel').strip()
+
+    # 2.3 Endereço + Bairro (Tentativa de Split por Espaço Duplo)
+    # Se detectar cabeçalho "Endereço   Bairro", tenta pegar a linha seguinte e dividir
+    match_header_end = buscar("endereco_bairro_cabecalho", texto_funcionario)
+    if match_header_end and "Endereco" not in dados:
+        # Pega a parte do texto APÓS esse cabeçalho
+        resto_end = texto_funcionario[match_header_end.end():].strip()
+        primeira_linha = resto_end.split('\n')[0].strip()
+        # Tenta dividir por 2 ou mais espaços (coluna visual)
+        partes = re.split(r'\s{2,}', primeira_linha)
+        if len(partes) >= 2:
+            dados['Endereco'] = partes[0].strip()
+            dados['Bairro'] = partes[1].strip()
+        else:
+            # Se não conseguiu dividir, joga tudo em Endereço (melhor que duplicar)
+            dados['Endereco'] = primeira_linha
+
+    # Salário
+    match_salario = buscar("salario", texto_funcionario)
+    if match_salario:
+        dados['Salario'] = match_salario.group(1)
+
+    # 3. Busca Genérica Inteligente
+    # Um único scan localiza a primeira ocorrência de todos os labels; os valores são
+    # lidos pelo índice de linhas do registro, sem copiar o texto restante a cada label.
+    if _perfil is None:
+        ocorrencias = localizar_labels(texto_funcionario)
+    else:
+        t = time.perf_counter()
+        ocorrencias = localizar_labels(texto_funcionario)
+        _perfil.registrar("campos_simples (busca dos labels)", time.perf_counter() - t, bool(ocorrencias))
+    if ocorrencias:
+        indice = IndiceLinhas(texto_funcionario)
+        for label, chave in CAMPOS_SIMPLES.items():
+            if chave in dados:
+                continue
+            if _perfil is not None:
+                valor = valor_medido(indice, label, ocorrencias)
+            elif label in ocorrencias:
+                valor = indice.valor_apos(ocorrencias[label])
+            else:
+                continue
+            if valor is not None:
+                dados[chave] = valor
+
+    # 4. Resgate do ID (Código) - Prioridade Máxima
+    if "ID" not in dados:
+        # Tenta pegar logo no início do texto (padrão mais comum se o split funcionou)
+        match_id = buscar("id_inicio", texto_funcionario.strip())
+        if match_id:
+            dados['ID'] = match_id.group(1)
+        else:
+             # Fallback
+             match_cod = buscar("id_codigo", texto_funcionario)
+             if match_cod:
+                 dados['ID'] = match_cod.group(1)
+
+    return dados
+
+def remover_cabecalho(texto):
+    # Solução profissional (Adaptada para Tabela):
+    # Aceita acentos em Código/Codigo e ignora o texto do meio (Contrato Nome...) até achar o número
+    match = re.search(r'(?i)C[óoÕó]digo.*?\n?\s*\d+', texto)
+    if match:
+        return texto[match.start():]
+    return texto
+
+def separar_funcionarios(texto):
+    # Baseado no dump: "Código Contrato Nome do(a) trabalhador(a)"
+    # O separador É o cabeçalho da tabela.
+    # Ex: "Código Contrato Nome do(a) trabalhador(a)"
+    # Isso garante que pegamos o início de cada ficha.
+    padrao = r'(?i)C[óoÕó]digo\s+Contrato\s+Nome.*?(?:\n|$)'
+    
+    blocos = re.split(padrao, texto)
+
+    funcionarios = []
+    # O primeiro bloco serÃ¡ o texto anterior ao primeiro cabeçalho (ou vazio), ignoramos
+    if len(blocos) > 1:
+        for bloco in blocos[1:]:
+            if bloco.strip():
+                 funcionarios.append(bloco)
+    
+    # Fallback: Se não funcionou o split novo, tenta o antigo (para outros layouts)
+    if not funcionarios:
+       # Tenta procurar apenas por Código seguido de número (caso vertical antigo)
+       # Mas agora permitindo quebra de linha agressiva
+       padrao_fallback = r'(?i)Código\s*\n?\s*\d+'
+       ids = re.findall(padrao_fallback, texto)
+       blocos_fb = re.split(padrao_fallback, texto)
+       if len(blocos_fb) > len(ids):
+           for i in range(len(ids)):
+               if i < len(blocos_fb[1:]):
+                   funcionarios.append(ids[i] + "\n" + blocos_fb[i+1])
+                   
+    return funcionarios 
+
+    for i in range(len(ids)):
+        if i < len(blocos):
+            bloco = ids[i] + "\n" + blocos[i]
+            funcionarios.append(bloco)
+
+    return funcionarios
+
+class SeparadorFuncionarios:
+    # Versão incremental de remover_cabecalho + separar_funcionarios.
+    # Recebe o texto página a página e devolve cada ficha assim que o cabeçalho
+    # seguinte aparece, guardando em memória apenas a ficha em andamento.
+    PADRAO_CABECALHO = re.compile(r'(?i)C[óoÕó]digo.*?\n?\s*\d+')         # O mesmo de remover_cabecalho
+    PADRAO = re.compile(r'(?i)C[óoÕó]digo\s+Contrato\s+Nome.*?(?:\n|$)')  # O mesmo de separar_funcionarios
+
+    def __init__(self):
+        self.pendente = ""          # Texto ainda não entregue (ficha em andamento)
+        self.cabecalho_removido = False
+        self.dentro_de_ficha = False
+        self.total_blocos = 0
+        self.tempo_cabecalho = 0.0  # Segundos gastos procurando/removendo o cabeçalho
+        # Enquanto nenhuma ficha foi emitida guardamos as páginas para o fallback
+        # (layouts antigos sem o cabeçalho "Código Contrato Nome")
+        self.paginas_fallback = []
+
+    @staticmethod
+    def _inicio_ultima_linha(texto):
+        # Um cabeçalho quebrado na virada de página começa na última linha com texto
+        # (o resto até o fim são espaços), qualquer que seja o tamanho dela: essa linha
+        # é re-examinada junto com a página seguinte
+        def fim_do_texto(fim):
+            # Sem copiar o texto (antes do primeiro cabeçalho ele pode ser o PDF inteiro)
+            while fim and texto[fim - 1].isspace():
+                fim -= 1
+            return fim
+
+        fim = fim_do_texto(len(texto))
+        inicio = texto.rfind("\n", 0, fim) + 1
+        if texto[inicio:fim].strip().lower() == "contrato":
+            # "Código" numa linha e "Contrato" na seguinte: o separador começa na anterior
+            fim = fim_do_texto(inicio)
+            inicio = texto.rfind("\n", 0, fim) + 1
+        return inicio
+
+    def alimentar(self, texto):
+        if self.paginas_fallback is not None:
+            self.paginas_fallback.append(texto)
+
+        inicio_busca = self._inicio_ultima_linha(self.pendente)
+        self.pendente += texto + "\n"
+
+        if not self.cabecalho_removido:
+            # Equivalente a remover_cabecalho: tudo antes do primeiro "Código ... <número>" é descartado
+            t = time.perf_counter()
+            match = self.PADRAO_CABECALHO.search(self.pendente, inicio_busca)
+            if match:
+                self.pendente = self.pendente[match.start():]
+                self.cabecalho_removido = True
+                inicio_busca = 0
+            self.tempo_cabecalho += time.perf_counter() - t
+            if not match:
+                return []
+
+        return self._separar(inicio_busca)
+
+    def _separar(self, inicio_busca):
+        blocos = []
+        pos = 0
+        for match in self.PADRAO.finditer(self.pendente, inicio_busca):
+            if self.dentro_de_ficha:
+                bloco = self.pendente[pos:match.start()]
+                if bloco.strip():
+                    blocos.append(bloco)
+            self.dentro_de_ficha = True
+            pos = match.end()
+
+        if self.dentro_de_ficha:
+            self.pendente = self.pendente[pos:]
+        else:
+            # Texto anterior ao primeiro separador é descartado (como no split original)
+            self.pendente = self.pendente[self._inicio_ultima_linha(self.pendente):]
+
+        if blocos:
+            self.paginas_fallback = None
+            self.total_blocos += len(blocos)
+        return blocos
+
+    def finalizar(self):
+        # Sem "Código <número>" no documento inteiro o remover_cabecalho não corta nada
+        blocos = self._separar(0) if not self.cabecalho_removido else []
+
+        if self.dentro_de_ficha and self.pendente.strip():
+            blocos.append(self.pendente)
+            self.total_blocos += 1
+        self.pendente = ""
+
+        if not blocos and self.paginas_fallback is not None:
+            # Nenhuma ficha no layout novo: aplica a separação completa (com fallback)
+            texto = "".join(pagina + "\n" for pagina in self.paginas_fallback)
+            t = time.perf_counter()
+            texto = remover_cabecalho(texto)
+            self.tempo_cabecalho += time.perf_counter() - t
+            blocos = separar_funcionarios(texto)
+            self.total_blocos += len(blocos)
+        self.paginas_fallback = None
+
+        return blocos
+
+# Abaixo disso o custo de subir os processos supera o ganho da leitura paralela
+PAGINAS_MINIMAS_PARALELO = 40
+
+def extrair_texto_paginas(pdf_path, inicio, fim, backend=BACKEND_PADRAO):
+    # Executado nos processos filhos: objetos dos leitores de PDF não são serializáveis,
+    # então cada worker abre o PDF por conta própria e lê apenas o intervalo [inicio, fim).
+    # Retorna os textos na ordem das páginas (None nas que falharam), a lista de erros
+    # (índice, mensagem) e a duração da leitura de cada página em segundos.
+    textos = []
+    erros = []
+    duracoes = []
+    t = time.perf_counter()
+    for indice, texto, erro in obter_backend(backend).iterar_paginas(pdf_path, inicio, fim):
+        agora = time.perf_counter()
+        duracoes.append(agora - t)
+        t = agora
+        textos.append(texto)
+        if erro is not None:
+            erros.append((indice, erro))
+    return textos, erros, duracoes
+
+def dividir_paginas(total_paginas, num_workers):
+    # Blocos contíguos de páginas: ~4 blocos por worker para equilibrar a carga
+    # sem multiplicar a abertura do PDF em cada processo.
+    tamanho = max(1, min(50, -(-total_paginas // (num_workers * 4))))
+    return [(inicio, min(inicio + tamanho, total_paginas)) for inicio in range(0, total_paginas, tamanho)]
+
+# Registros por lote enviado ao pool de extração (None = automático)
+TAMANHO_LOTE = None
+
+def calcular_tamanho_lote(total_estimado, num_workers):
+    # ~8 lotes por worker: lotes grandes diluem o custo de IPC (pickle de cada string/dict),
+    # mas lotes demais por worker atrasariam o progresso e o balanceamento de carga.
+    return max(1, min(500, total_estimado // (num_workers * 8)))
+
+# Tempo máximo de extração de um registro, em segundos (None = sem limite). Um bloco
+# malformado pode fazer uma regra retroceder por muito tempo; passado o limite, o
+# registro vai para a quarentena e o restante do lote segue normalmente.
+TEMPO_LIMITE_REGISTRO = 10.0
+
+# O limite é imposto no próprio worker com SIGALRM, que interrompe até uma busca do re
+# em andamento. Sem SIGALRM (Windows), quem impõe é o processo principal: ver
+# ProcessadorPDF.verificar_prazos.
+LIMITE_NO_WORKER = hasattr(signal, "setitimer")
+
+class TempoEsgotado(Exception):
+    """Extração de um registro passou de TEMPO_LIMITE_REGISTRO"""
+
+def _tempo_esgotado(signum, frame):
+    raise TempoEsgotado()
+
+# Fila do processo principal onde os workers avisam o início de cada lote vigiado
+# (ver inicializar_worker e ProcessadorPDF.verificar_prazos)
+_fila_inicio = None
+
+def extrair_campos_lote(registros, perfilar=False, tempo_limite=None, lote=None):
+    # Executado nos processos filhos: extrai um lote inteiro por chamada ao pool.
+    # Um registro com erro não derruba o lote; retorna (dados em ordem, [(posição, erro)],
+    # duração da extração de cada registro em segundos, contadores do perfil das
+    # regras deste lote ou None sem perfilar, [(posição, texto)] dos registros que
+    # passaram de tempo_limite segundos).
+    # Com lote, avisa (lote, pid) na fila de início antes de começar.
+    global _perfil
+    if lote is not None and _fila_inicio is not None:
+        _fila_inicio.put((lote, os.getpid()))
+    _perfil = PerfilRegras() if perfilar else None
+    # signal só pode ser usado na thread principal (a dos workers do pool)
+    limitar = bool(tempo_limite) and LIMITE_NO_WORKER and threading.current_thread() is threading.main_thread()
+    if limitar:
+        tratador_anterior = signal.signal(signal.SIGALRM, _tempo_esgotado)
+    dados_lote = []
+    erros = []
+    duracoes = []
+    quarentena = []
+    try:
+        for posicao, texto_funcionario in enumerate(registros):
+            t = time.perf_counter()
+            try:
+                if limitar:
+                    signal.setitimer(signal.ITIMER_REAL, tempo_limite)
+                try:
+                    dados = extrair_campos(texto_funcionario)
+                finally:
+                    if limitar:
+                        signal.setitimer(signal.ITIMER_REAL, 0)
+                dados_lote.append(dados)
+            except TempoEsgotado:
+                quarentena.append((posicao, texto_funcionario))
+            except Exception as e:
+                erros.append((posicao, str(e)))
+            duracoes.append(time.perf_counter() - t)
+    finally:
+        perfil, _perfil = _perfil, None
+        if limitar:
+            signal.signal(signal.SIGALRM, tratador_anterior)
+    return dados_lote, erros, duracoes, (perfil.regras if perfil is not None else None), quarentena
+
+def inicializar_worker(fila_inicio=None):
+    # Initializer do pool: guarda a fila de início dos lotes e roda o parser uma vez para
+    # que o primeiro lote real não pague a compilação das expressões que não estão em
+    # REGRAS (re.split, localizar_labels).
+    global _fila_inicio
+    _fila_inicio = fila_inicio
+    extrair_campos("1 1 AQUECIMENTO\nData de admissão Função CBO\nCidade Estado CEP Telefone\n")
+
+def aquecer_worker():
+    # Tarefa vazia usada para subir os processos do pool antes do primeiro uso
+    return os.getpid()
@@ -0,0 +1,162 @@
+"""
+Regras de extração das fichas Word de diretório (lado dos workers)
+
+Usadas pela interface (extrator_word_gui.py) no processo principal e nos
+workers do pool (pool_documentos.py). Este módulo não importa tkinter nem a
+fila da interface, então os workers carregam apenas o necessário.
+"""
+
+import os
+import time
+import itertools
+from datetime import datetime
+from typing import Dict, List, Optional
+from instrumentacao import Instrumentacao
+from tabelas_docx import iterar_celulas, busca_labels, LEITOR_PADRAO
+from layout_docx import extrair_por_layout
+
+
+# Labels das células e os campos correspondentes
+CAMPOS_MAPEAMENTO = {
+    'Código': 'codigo', 'Contrato': 'contrato', 'Nome do(a) trabalhador(a)': 'nome',
+    'Matricula eSocial': 'matricula_esocial', 'Nome do pai': 'nome_pai',
+    'Nome da mãe': 'nome_mae', 'Data de nascimento': 'data_nascimento',
+    'Raça/cor': 'raca_cor', 'Sexo': 'sexo', 'Naturalidade': 'naturalidade',
+    'Nacionalidade': 'nacionalidade', 'Estado Civil': 'estado_civil',
+    'Deficiente': 'deficiente', 'Tipo de deficiência': 'tipo_deficiencia',
+    'Tipo sanguíneo': 'tipo_sanguineo', 'CPF': 'cpf',
+    'Cédula de identidade': 'rg', 'Data de emissão': 'data_emissao_rg',
+    'Órgão/UF': 'orgao_uf_rg', 'CTPS': 'ctps', 'Série': 'serie_ctps',
+    'Dígito': 'digito_ctps', 'Nº título de eleitor': 'titulo_eleitor',
+    'Zona': 'zona_eleitoral', 'Seção': 'secao_eleitoral', 'Nº do PIS': 'pis',
+    'Data de cadastramento': 'data_cadastramento_pis', 'Grau de instrução': 'grau_instrucao',
+    'Endereço': 'endereco', 'Número': 'numero', 'Complemento': 'complemento',
+    'Bairro': 'bairro', 'Cidade': 'cidade', 'Estado': 'estado', 'CEP': 'cep',
+    'Telefone': 'telefone', 'Celular': 'celular', 'Endereço eletrônico': 'email',
+    'Data de admissão': 'data_admissao', 'Data do registro': 'data_registro',
+    'Função': 'funcao', 'CBO': 'cbo', 'Salário Inicial': 'salario_inicial',
+    'Forma de pagamento': 'forma_pagamento', 'Tipo de pagamento': 'tipo_pagamento',
+    'Insalubridade': 'insalubridade', 'Periculosidade': 'periculosidade',
+    'Sindicato': 'sindicato', 'Centro de custo': 'centro_custo',
+    'Localização': 'localizacao', 'Horário': 'horario',
+    'Nº da conta FGTS': 'conta_fgts', 'Data de opção': 'data_opcao_fgts',
+    'Banco depositário - FGTS': 'banco_fgts', 'Data rescisão': 'data_rescisao',
+    'Aviso prévio': 'aviso_previo', 'Saldo FGTS': 'saldo_fgts',
+    'Maior remuneração': 'maior_remuneracao', 'Causa da rescisão': 'causa_rescisao',
+    'Empregador': 'empregador', 'CNPJ': 'cnpj_empregador'
+}
+
+# Campos de endereço que aparecem duas vezes (empresa e residencial)
+CAMPOS_ENDERECO = ['endereco', 'numero', 'complemento', 'bairro', 'cidade', 'estado', 'cep', 'telefone', 'celular']
+
+
+def extrair_documento(caminho_arquivo: str, instrumentacao: Instrumentacao, leitor: str = LEITOR_PADRAO,
+                      layout: Optional[Dict] = None, origens: Optional[Dict] = None) -> Dict[str, str]:
+    """
+    Extrai dados de um documento Word (função de módulo para rodar também nos workers)
+    
+    Args:
+        layout: Posições aprendidas dos campos; sem casar com elas, vale a varredura completa
+        origens: Se informado, recebe a célula de onde saiu cada campo (aprendizado do layout)
+    """
+    with instrumentacao.medir("abertura"):
+        celulas = iterar_celulas(caminho_arquivo, leitor)
+    with instrumentacao.medir("extracao"):
+        dados = None
+        if layout is not None and origens is None:
+            dados, lidas = extrair_por_layout(celulas, layout)
+            if dados is None:
+                # Célula fora do layout: varredura completa, a partir das células já lidas
+                instrumentacao.contar("layout_varredura")
+                celulas = itertools.chain(lidas, celulas)
+            else:
+                instrumentacao.contar("layout_direto")
+        if dados is None:
+            dados = extrair_tabelas(celulas, CAMPOS_MAPEAMENTO, CAMPOS_ENDERECO, origens)
+    
+    dados['arquivo_origem'] = os.path.basename(caminho_arquivo)
+    dados['data_extracao'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    return dados
+
+
+def extrair_tabelas(celulas, campos_mapeamento: Dict[str, str], campos_endereco: List[str],
+                    origens: Optional[Dict] = None) -> Dict[str, str]:
+    """
+    Mapeia os labels das células (tuplas de tabelas_docx.iterar_celulas) para os campos
+    
+    Args:
+        origens: Se informado, recebe as células em que o label de cada campo apareceu,
+                 até a que deu o valor (ver layout_docx.aprender)
+    """
+    dados = {}
+    # Labels do Método 2 (campos de endereço ficam de fora), compilados uma vez
+    busca = busca_labels(tuple(label for label, campo_chave in campos_mapeamento.items()
+                               if campo_chave not in campos_endereco))
+    
+    # Processar todas as tabelas
+    for tabela, row_idx, coluna, texto_celula in celulas:
+        texto_celula = texto_celula.strip()
+        
+        # Label sozinho na célula: campo vazio nesta ficha (o valor, quando houver, vem pelo Método 1)
+        if origens is not None and texto_celula in campos_mapeamento:
+            campo_chave = campos_mapeamento[texto_celula]
+            if campo_chave not in dados and (campo_chave not in campos_endereco or row_idx >= 15):
+                origens.setdefault(campo_chave, []).append((texto_celula, tabela, row_idx, coluna, 1, True))
+        
+        # Método 1: Label\nValor (formato padrão)
+        if '\n' in texto_celula:
+            linhas = texto_celula.split('\n')
+            if len(linhas) >= 2:
+                label = linhas[0].strip()
+                valor = '\n'.join(linhas[1:]).strip()
+        
+                if label in campos_mapeamento:
+                    campo_chave = campos_mapeamento[label]
+        
+                    # Se for campo de endereço
+                    if campo_chave in campos_endereco:
+                        # Endereço da empresa aparece nas primeiras linhas (< 10)
+                        # Endereço residencial aparece depois (>= 15)
+                        # Só capturar se estiver na região do endereço residencial
+                        if row_idx >= 15:
+                            if campo_chave not in dados or not dados[campo_chave]:
+                                dados[campo_chave] = valor
+                                if origens is not None:
+                                    origens.setdefault(campo_chave, []).append((label, tabela, row_idx, coluna, 1, False))
+                    else:
+                        # Campos não relacionados a endereço: extrair normalmente
+                        if campo_chave not in dados or not dados[campo_chave]:
+                            dados[campo_chave] = valor
+                            if origens is not None:
+                                origens.setdefault(campo_chave, []).append((label, tabela, row_idx, coluna, 1, False))
+        
+        # Método 2: Procurar labels conhecidos no texto (apenas para campos não-endereço),
+        # todos numa passada só, na ordem de campos_mapeamento
+        for label, posicao in busca.encontrar(texto_celula):
+            campo_chave = campos_mapeamento[label]
+            if campo_chave not in dados:
+                # Valor após a primeira ocorrência do label
+                valor = texto_celula[posicao + len(label):].strip().strip('\n').strip()
+                if valor:
+                    dados[campo_chave] = valor
+                    if origens is not None:
+                        origens.setdefault(campo_chave, []).append((label, tabela, row_idx, coluna, 2, False))
+                elif origens is not None:
+                    # Label no fim do texto, sem valor
+                    origens.setdefault(campo_chave, []).append((label, tabela, row_idx, coluna, 2, True))
+    
+    return dados
+
+
+def extrair_documento_worker(caminho_arquivo: str, leitor: str = LEITOR_PADRAO, layout: Optional[Dict] = None):
+    """
+    Extrai um documento dentro de um worker do pool (ver pool_documentos.py)
+    
+    Returns:
+        (dados, etapas, contagens, duração em segundos) para a interface somar nas suas medições
+    """
+    instrumentacao = Instrumentacao("word-gui")
+    t = time.perf_counter()
+    dados = extrair_documento(caminho_arquivo, instrumentacao, leitor, layout)
+    return dados, instrumentacao.etapas, instrumentacao.contagens, time.perf_counter() - t
@@ -10,21 +10,50 @@ Autor: Antigravity AI
 Data: 2026-02-06
 """
 
+import medicao_inicio  # Primeiro import: marca o início para a medição de inicialização
 import os
-import docx
-import pandas as pd
+import argparse
 from pathlib import Path
 import re
-from typing import Dict, List
-import tkinter as tk
-from tkinter import filedialog, messagebox
+import time
+import functools
+import itertools
+from typing import TYPE_CHECKING, Dict, List, Optional
 from datetime import datetime
+from instrumentacao import Instrumentacao
+from pool_documentos import mapear_em_ordem, usar_paralelo, workers_padrao
+from tabelas_docx import iterar_celulas, celulas_documento, LEITORES, LEITOR_PADRAO
+from layout_docx import caminho_layout, extrair_por_layout, obter_layout
+from exportacao import exportar_excel, exportar_parquet, TIPOS_PARQUET_DOCX
+from normalizacao import normalizar_registros, contar_invalidos, REGRAS_DOCX, COLUNA_INVALIDOS_DOCX
+
+# python-docx (só com o leitor python-docx), openpyxl e tkinter são importados só
+# onde são usados: quem importa a classe (ou um worker) não paga pela interface, e
+# o diálogo abre mais cedo
+if TYPE_CHECKING:
+    import docx
 
 
 class ExtratorFichasWord:
     """Classe para extrair dados de fichas de registro em formato Word"""
     
-    def __init__(self):
+    def __init__(self, num_workers: Optional[int] = None, leitor: str = LEITOR_PADRAO,
+                 usar_layout: bool = False):
+        """
+        Args:
+            num_workers: Processos usados por processar_diretorio (None = número de
+                         núcleos, 1 = sem paralelismo)
+            leitor: Leitor das tabelas do .docx, "xml" ou "python-docx" (ver tabelas_docx.py)
+            usar_layout: Lê os campos nas posições aprendidas dos primeiros documentos
+                         (ver layout_docx.py)
+        """
+        self.num_workers = num_workers
+        self.leitor = leitor
+        self.usar_layout = usar_layout
+        # Layout em uso (carregado ou aprendido em processar_diretorio)
+        self.layout = None
+        # Medições da execução atual (recriadas a cada processar_diretorio)
+        self.instrumentacao = Instrumentacao("word-lote")
         self.campos_mapeamento = {
             # Identificação
             'Código': 'codigo',
@@ -109,53 +138,87 @@ class ExtratorFichasWord:
             'CNPJ': 'cnpj_empregador'
         }
     
-    def extrair_texto_tabela(self, doc: docx.Document) -> Dict[str, str]:
+    def extrair_texto_tabela(self, doc: 'docx.Document') -> Dict[str, str]:
         """
         Extrai dados da tabela do documento Word
         
         Args:
             doc: Documento Word carregado
             
+        Returns:
+            Dicionário com os campos extraídos
+        """
+        return self.mapear_celulas(celulas_documento(doc))
+    
+    def mapear_celulas(self, celulas, origens: Optional[Dict] = None) -> Dict[str, str]:
+        """
+        Mapeia os labels das células para os campos
+        
+        Args:
+            celulas: Tuplas (tabela, linha, coluna, texto) de tabelas_docx.iterar_celulas
+            origens: Se informado, recebe as células em que o label de cada campo apareceu,
+                     até a que deu o valor (ver layout_docx.aprender)
+            
         Returns:
             Dicionário com os campos extraídos
         """
         dados = {}
         
         # Processa todas as tabelas do documento
-        for tabela in doc.tables:
-            for row in tabela.rows:
-                for cell in row.cells:
-                    texto_celula = cell.text.strip()
+        for tabela, linha, coluna, texto_celula in celulas:
+            texto_celula = texto_celula.strip()
+            
+            # Label sozinho na célula: campo vazio nesta ficha
+            if origens is not None and texto_celula in self.campos_mapeamento:
+                campo_chave = self.campos_mapeamento[texto_celula]
+                if campo_chave not in dados:
+                    origens.setdefault(campo_chave, []).append((texto_celula, tabela, linha, coluna, 1, True))
+            
+            # Procura por padrões "Label\nValor"
+            if '\n' in texto_celula:
+                partes = texto_celula.split('\n', 1)
+                if len(partes) == 2:
+                    label = partes[0].strip()
+                    valor = partes[1].strip()
                     
-                    # Procura por padrões "Label\nValor"
-                    if '\n' in texto_celula:
-                        partes = texto_celula.split('\n', 1)
-                        if len(partes) == 2:
-                            label = partes[0].strip()
-                            valor = partes[1].strip()
-                            
-                            # Mapeia o label para o campo correspondente
-                            if label in self.campos_mapeamento:
-                                campo_chave = self.campos_mapeamento[label]
-                                # Só adiciona se ainda não existe ou se o valor atual está vazio
-                                if campo_chave not in dados or not dados[campo_chave]:
-                                    dados[campo_chave] = valor
+                    # Mapeia o label para o campo correspondente
+                    if label in self.campos_mapeamento:
+                        campo_chave = self.campos_mapeamento[label]
+                        # Só adiciona se ainda não existe ou se o valor atual está vazio
+                        if campo_chave not in dados or not dados[campo_chave]:
+                            dados[campo_chave] = valor
+                            if origens is not None:
+                                origens.setdefault(campo_chave, []).append((label, tabela, linha, coluna, 1, False))
         
         return dados
     
-    def extrair_documento(self, caminho_arquivo: str) -> Dict[str, str]:
+    def extrair_documento(self, caminho_arquivo: str, origens: Optional[Dict] = None) -> Dict[str, str]:
         """
         Extrai dados de um único documento Word
         
         Args:
             caminho_arquivo: Caminho completo para o arquivo .docx
+            origens: Se informado, recebe a célula de onde saiu cada campo (aprendizado do layout)
             
         Returns:
             Dicionário com os dados extraídos
         """
         try:
-            doc = docx.Document(caminho_arquivo)
-            dados = self.extrair_texto_tabela(doc)
+            # Com o leitor xml a leitura acontece junto com a extração
+            with self.instrumentacao.medir("abertura"):
+                celulas = iterar_celulas(caminho_arquivo, self.leitor)
+            with self.instrumentacao.medir("extracao"):
+                dados = None
+                if self.layout is not None and origens is None:
+                    dados, lidas = extrair_por_layout(celulas, self.layout)
+                    if dados is None:
+                        # Célula fora do layout: varredura completa, a partir das células já lidas
+                        self.instrumentacao.contar("layout_varredura")
+                        celulas = itertools.chain(lidas, celulas)
+                    else:
+                        self.instrumentacao.contar("layout_direto")
+                if dados is None:
+                    dados = self.mapear_celulas(celulas, origens)
             
             # Adiciona metadados
             dados['arquivo_origem'] = os.path.basename(caminho_arquivo)
@@ -165,6 +228,7 @@ class ExtratorFichasWord:
             
         except Exception as e:
             print(f"❌ Erro ao processar {caminho_arquivo}: {str(e)}")
+            self.instrumentacao.contar("erros")
             return {
                 'arquivo_origem': os.path.basename(caminho_arquivo),
                 'erro': str(e)
@@ -181,9 +245,14 @@ class ExtratorFichasWord:
             Lista de dicionários com os dados extraídos
         """
         resultados = []
+        num_workers = self.num_workers or workers_padrao()
+        self.instrumentacao = Instrumentacao("word-lote", caminho_diretorio,
+                                             {"workers": num_workers, "leitor": self.leitor,
+                                              "layout": self.usar_layout})
+        self.layout = None
         
         # Busca todos os arquivos .docx
-        arquivos_docx = list(Path(caminho_diretorio).glob('*.docx'))
+        arquivos_docx = sorted(Path(caminho_diretorio).glob('*.docx'))
         
         # Filtra arquivos temporários do Word (começam com ~$)
         arquivos_docx = [f for f in arquivos_docx if not f.name.startswith('~$')]
@@ -191,54 +260,179 @@ class ExtratorFichasWord:
         print(f"📁 Encontrados {len(arquivos_docx)} arquivos .docx")
         print("=" * 80)
         
-        for i, arquivo in enumerate(arquivos_docx, 1):
-            print(f"[{i}/{len(arquivos_docx)}] Processando: {arquivo.name}")
-            dados = self.extrair_documento(str(arquivo))
-            resultados.append(dados)
+        def extrair_com_progresso(indice, arquivo, origens=None):
+            print(f"[{indice + 1}/{len(arquivos_docx)}] Processando: {arquivo.name}")
+            t = time.perf_counter()
+            dados = self.extrair_documento(str(arquivo), origens)
+            self.instrumentacao.registrar("registro", [time.perf_counter() - t])
+            return dados
+        
+        # Modo layout: os primeiros documentos ensinam as posições (ou o template salvo é usado)
+        if self.usar_layout:
+            self.layout, resultados = obter_layout(caminho_layout(caminho_diretorio, "word-lote"), "word-lote",
+                                                   arquivos_docx, extrair_com_progresso,
+                                                   set(self.campos_mapeamento.values()))
+        restantes = arquivos_docx[len(resultados):]
+        
+        if usar_paralelo(len(restantes), num_workers):
+            resultados += self.processar_em_paralelo(restantes, num_workers, len(resultados))
+        else:
+            for i, arquivo in enumerate(restantes, len(resultados)):
+                resultados.append(extrair_com_progresso(i, arquivo))
+        self.instrumentacao.contar("arquivos", len(arquivos_docx))
+        self.instrumentacao.contar("registros", len(resultados))
         
         print("=" * 80)
         print(f"✅ Processamento concluído! {len(resultados)} arquivos processados.")
+        if self.layout is not None:
+            contagens = self.instrumentacao.contagens
+            print(f"📐 Layout: {contagens.get('layout_direto', 0)} documento(s) lidos nas posições aprendidas, "
+                  f"{contagens.get('layout_varredura', 0)} com a varredura completa")
         
         return resultados
     
-    def exportar_para_excel(self, dados: List[Dict[str, str]], arquivo_saida: str):
+    def processar_em_paralelo(self, arquivos_docx: List[Path], num_workers: int,
+                              ja_processados: int = 0) -> List[Dict[str, str]]:
         """
-        Exporta os dados extraídos para uma planilha Excel
+        Extrai os arquivos em um pool de processos (ver pool_documentos.py)
         
         Args:
-            dados: Lista de dicionários com os dados
-            arquivo_saida: Caminho do arquivo Excel de saída
+            arquivos_docx: Arquivos a processar
+            num_workers: Processos do pool
+            ja_processados: Arquivos do lote extraídos antes (aprendizado do layout), para o progresso
+            
+        Returns:
+            Lista de dicionários na ordem de arquivos_docx
         """
-        # Cria DataFrame
-        df = pd.DataFrame(dados)
+        total = len(arquivos_docx)
+        print(f"⚙️ Processando em paralelo com {min(num_workers, total)} processos")
         
-        # Reordena colunas para ter as mais importantes primeiro
-        colunas_prioritarias = [
-            'arquivo_origem', 'nome', 'cpf', 'rg', 'data_nascimento',
-            'data_admissao', 'funcao', 'salario_inicial', 'data_rescisao'
-        ]
+        def ao_concluir(concluidos, indice, resultado, erro):
+            print(f"[{ja_processados + concluidos}/{ja_processados + total}] Concluído: {arquivos_docx[indice].name}")
         
-        # Adiciona colunas prioritárias que existem
-        colunas_ordenadas = [col for col in colunas_prioritarias if col in df.columns]
+        extrair = functools.partial(extrair_documento_worker, leitor=self.leitor, layout=self.layout)
+        with self.instrumentacao.medir("extracao_paralela"):
+            extraidos = mapear_em_ordem(extrair, [str(arquivo) for arquivo in arquivos_docx], num_workers, ao_concluir)
         
-        # Adiciona as demais colunas
-        colunas_restantes = [col for col in df.columns if col not in colunas_ordenadas]
-        colunas_ordenadas.extend(colunas_restantes)
+        resultados = []
+        for arquivo, (resultado, erro) in zip(arquivos_docx, extraidos):
+            if erro is not None:
+                print(f"❌ Erro ao processar {arquivo}: {erro}")
+                self.instrumentacao.contar("erros")
+                resultados.append({'arquivo_origem': arquivo.name, 'erro': erro})
+                continue
+            dados, etapas, contagens, duracao = resultado
+            # Etapas somadas entre os workers: com vários processos a soma passa do
+            # tempo de relógio, que fica em extracao_paralela
+            for etapa, segundos in etapas.items():
+                self.instrumentacao.adicionar(etapa, segundos)
+            for nome, quantidade in contagens.items():
+                self.instrumentacao.contar(nome, quantidade)
+            self.instrumentacao.registrar("registro", [duracao])
+            resultados.append(dados)
+        return resultados
+    
+    # Colunas mais importantes primeiro nas planilhas geradas
+    COLUNAS_PRIORITARIAS = [
+        'arquivo_origem', 'nome', 'cpf', 'rg', 'data_nascimento',
+        'data_admissao', 'funcao', 'salario_inicial', 'data_rescisao'
+    ]
+    
+    def normalizar_dados(self, dados: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Valida CPF/PIS e padroniza datas, valores e CEP antes da exportação
         
-        df = df[colunas_ordenadas]
+        Args:
+            dados: Lista de dicionários com os dados extraídos
+            
+        Returns:
+            Nova lista com a coluna campos_invalidos
+        """
+        with self.instrumentacao.medir("normalizacao"):
+            dados = normalizar_registros(dados, REGRAS_DOCX, COLUNA_INVALIDOS_DOCX)
+            invalidos = contar_invalidos(dados, COLUNA_INVALIDOS_DOCX)
+        self.instrumentacao.contar("invalidos", invalidos)
+        if invalidos:
+            print(f"⚠️ {invalidos} registro(s) com campos inválidos (coluna {COLUNA_INVALIDOS_DOCX})")
+        return dados
+    
+    def exportar_para_excel(self, dados: List[Dict[str, str]], arquivo_saida: str):
+        """
+        Exporta os dados extraídos para uma planilha Excel
         
-        # Exporta para Excel
-        df.to_excel(arquivo_saida, index=False, engine='openpyxl')
+        Args:
+            dados: Lista de dicionários com os dados
+            arquivo_saida: Caminho do arquivo Excel de saída
+        """
+        # Exporta para Excel linha a linha (openpyxl write-only, memória constante)
+        with self.instrumentacao.medir("exportacao"):
+            colunas = exportar_excel(dados, arquivo_saida, self.COLUNAS_PRIORITARIAS)
         
         print(f"💾 Planilha salva em: {arquivo_saida}")
-        print(f"📊 Total de registros: {len(df)}")
-        print(f"📋 Total de campos: {len(df.columns)}")
+        print(f"📊 Total de registros: {len(dados)}")
+        print(f"📋 Total de campos: {len(colunas)}")
+    
+    def exportar_para_parquet(self, dados: List[Dict[str, str]], arquivo_saida: str):
+        """
+        Exporta os dados extraídos para Parquet com colunas tipadas
+        
+        Datas viram date32, valores em R$ viram decimal e campos de poucos valores
+        (sexo, estado civil, UF...) usam codificação de dicionário.
+        
+        Args:
+            dados: Lista de dicionários com os dados
+            arquivo_saida: Caminho do arquivo Parquet de saída
+        """
+        with self.instrumentacao.medir("exportacao"):
+            exportar_parquet(dados, arquivo_saida, TIPOS_PARQUET_DOCX, self.COLUNAS_PRIORITARIAS)
+        print(f"💾 Parquet salvo em: {arquivo_saida}")
+    
+    def salvar_relatorio(self):
+        """Fecha as medições e grava o relatório de desempenho em JSON (ver instrumentacao.py)"""
+        self.instrumentacao.finalizar()
+        print(f"⏱️ Desempenho: {self.instrumentacao.resumo()}")
+        try:
+            print(f"🗂️ Relatório de desempenho: {self.instrumentacao.salvar()}")
+        except OSError as e:
+            print(f"⚠️ Relatório de desempenho não gravado: {e}")
+
+
+# Extrator de cada processo do pool (criado na primeira chamada)
+_extrator_worker = None
+
+
+def extrair_documento_worker(caminho_arquivo: str, leitor: str = LEITOR_PADRAO, layout: Optional[Dict] = None):
+    """
+    Extrai um documento dentro de um worker do pool
+    
+    Returns:
+        (dados, etapas, contagens, duração em segundos) para o processo principal
+        somar nas suas medições
+    """
+    global _extrator_worker
+    if _extrator_worker is None:
+        _extrator_worker = ExtratorFichasWord(num_workers=1)
+    _extrator_worker.leitor = leitor
+    _extrator_worker.layout = layout
+    _extrator_worker.instrumentacao = Instrumentacao("word-lote")
+    t = time.perf_counter()
+    dados = _extrator_worker.extrair_documento(caminho_arquivo)
+    duracao = time.perf_counter() - t
+    return dados, _extrator_worker.instrumentacao.etapas, _extrator_worker.instrumentacao.contagens, duracao
 
 
 def selecionar_diretorio():
     """Abre diálogo para selecionar diretório"""
+    import tkinter as tk
+    from tkinter import filedialog
+
     root = tk.Tk()
     root.withdraw()
+    if medicao_inicio.medindo():
+        # Modo --medir-inicio: mede até o ponto em que o diálogo abriria
+        medicao_inicio.informar_pronto()
+        root.destroy()
+        return ""
     diretorio = filedialog.askdirectory(
         title="Selecione o diretório com os arquivos .docx"
     )
@@ -246,8 +440,19 @@ def selecionar_diretorio():
     return diretorio
 
 
-def main():
+def main(argv=None):
     """Função principal"""
+    parser = argparse.ArgumentParser(description="Extrai as fichas de registro dos .docx de um diretório (escolhido numa janela) para Excel")
+    parser.add_argument("--workers", type=int, default=None, help="Processos de extração (padrão: número de CPUs; 1 = em sequência)")
+    parser.add_argument("--leitor", choices=LEITORES, default=LEITOR_PADRAO, help="Leitor das tabelas do .docx (ver tabelas_docx.py)")
+    parser.add_argument("--layout", action="store_true", help="Lê os campos nas posições aprendidas, gravadas em layout_word-lote.json no diretório")
+    parser.add_argument("--normalizar", action="store_true", help="Valida e formata CPF/PIS/datas/valores/CEP e acrescenta a coluna campos_invalidos")
+    parser.add_argument("--parquet", action="store_true", help="Gera também a saída Parquet tipada")
+    parser.add_argument(medicao_inicio.FLAG, action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers deve ser pelo menos 1")
+    
     print("=" * 80)
     print("📄 EXTRATOR EM LOTE DE FICHAS DE REGISTRO (WORD → EXCEL)")
     print("=" * 80)
@@ -255,6 +460,7 @@ def main():
     
     # Seleciona diretório
     print("🔍 Selecione o diretório com os arquivos .docx...")
+    medicao_inicio.importar_em_segundo_plano("docx", "openpyxl", "pandas")
     diretorio = selecionar_diretorio()
     
     if not diretorio:
@@ -265,7 +471,7 @@ def main():
     print()
     
     # Cria extrator
-    extrator = ExtratorFichasWord()
+    extrator = ExtratorFichasWord(args.workers, args.leitor, usar_layout=args.layout)
     
     # Processa todos os documentos
     dados = extrator.processar_diretorio(diretorio)
@@ -274,6 +480,10 @@ def main():
         print("⚠️ Nenhum dado foi extraído.")
         return
     
+    # Normalização e validação (só com --normalizar)
+    if args.normalizar:
+        dados = extrator.normalizar_dados(dados)
+    
     # Define nome do arquivo de saída
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     arquivo_saida = os.path.join(diretorio, f'fichas_extraidas_{timestamp}.xlsx')
@@ -283,12 +493,20 @@ def main():
     print("💾 Exportando para Excel...")
     extrator.exportar_para_excel(dados, arquivo_saida)
     
+    # Com --parquet, gera também a saída tipada para análise
+    if args.parquet:
+        extrator.exportar_para_parquet(dados, os.path.splitext(arquivo_saida)[0] + '.parquet')
+    
+    extrator.salvar_relatorio()
     print()
     print("=" * 80)
     print("✅ PROCESSO CONCLUÍDO COM SUCESSO!")
     print("=" * 80)
     
     # Mostra mensagem de sucesso
+    import tkinter as tk
+    from tkinter import messagebox
+
     root = tk.Tk()
     root.withdraw()
     messagebox.showinfo(
@@ -0,0 +1,203 @@
+"""
+Extrator de Fichas de Registro em PDF - linha de comando
+
+Roda o mesmo pipeline da interface (leitura, separação e extração em paralelo,
+exportação) sem importar tkinter/customtkinter, para uso em servidor ou cron.
+
+Exemplos:
+    python extrator_pdf_cli.py fichas.pdf -o fichas.xlsx
+    python extrator_pdf_cli.py "entrada/*.pdf" -o saida.csv -w 8 --lote 200
+    python extrator_pdf_cli.py a.pdf b.pdf -o pasta_saida/ -f txt
+
+A saída é gravada em fluxo, lote a lote, à medida que os registros ficam
+prontos. Com vários PDFs e saída em arquivo, os registros vão para um único
+arquivo com a coluna "Arquivo" indicando a origem. Se a saída for um
+diretório, cada PDF gera o seu próprio arquivo.
+"""
+
+import medicao_inicio  # Primeiro import: marca o início para a medição de inicialização
+import argparse
+import glob
+import os
+import sys
+import time
+
+from backends_pdf import BACKENDS, BACKEND_PADRAO
+from template_pdf import carregar_template
+from pipeline_pdf import ProcessadorPDF, criar_escritor, colunas_saida, EXTENSOES
+from perfil_regras import PerfilRegras
+from extracao_pdf import TEMPO_LIMITE_REGISTRO
+
+FORMATOS = {"excel": "Excel", "csv": "CSV", "txt": "TXT", "parquet": "Parquet"}
+
+
+def expandir_entradas(padroes):
+    """Expande globs (o shell do Windows não expande) mantendo a ordem e sem repetir arquivos"""
+    arquivos = []
+    for padrao in padroes:
+        encontrados = sorted(glob.glob(padrao)) if glob.has_magic(padrao) else [padrao]
+        if not encontrados:
+            print(f"⚠️  Nenhum arquivo corresponde a: {padrao}", file=sys.stderr)
+        for caminho in encontrados:
+            if caminho not in arquivos:
+                arquivos.append(caminho)
+    return arquivos
+
+
+def deduzir_formato(saida, formato):
+    if formato:
+        return FORMATOS[formato]
+    extensao = os.path.splitext(saida)[1].lower()
+    for nome, ext in EXTENSOES.items():
+        if ext == extensao:
+            return nome
+    return "Excel"
+
+
+def formatar_tempos(tempos):
+    return " | ".join(f"{etapa} {segundos:.2f}s" for etapa, segundos in tempos.items())
+
+
+def main(argv=None):
+    if medicao_inicio.medindo():
+        # Só o custo de importação do pipeline (ver medicao_inicio.py)
+        medicao_inicio.informar_pronto()
+        return 0
+
+    parser = argparse.ArgumentParser(description="Extrai as fichas de registro de PDFs sem interface gráfica")
+    parser.add_argument("entradas", nargs="+", help="PDFs ou padrões glob (ex.: 'entrada/*.pdf')")
+    parser.add_argument("-o", "--saida", required=True, help="Arquivo de saída, ou diretório para um arquivo por PDF")
+    parser.add_argument("-f", "--formato", choices=list(FORMATOS), help="Formato de saída (padrão: pela extensão da saída)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Processos de extração (padrão: número de CPUs)")
+    parser.add_argument("--lote", type=int, default=None, help="Registros por lote enviado aos workers (padrão: automático)")
+    parser.add_argument("--backend", choices=list(BACKENDS), default=BACKEND_PADRAO, help="Leitor de PDF")
+    parser.add_argument("--template", help="Template JSON de coordenadas (modo template)")
+    parser.add_argument("--sem-cache", action="store_true", help="Não usa o cache de páginas")
+    parser.add_argument("--serial", action="store_true", help="Lê as páginas no processo principal")
+    parser.add_argument("--ordenado", action="store_true", help="Grava os registros na ordem das fichas no PDF")
+    parser.add_argument("--limite-ordem", type=int, default=None, help="Lotes em voo + aguardando a vez no modo ordenado (padrão: 4 por worker)")
+    parser.add_argument("--normalizar", action="store_true", help="Valida e formata CPF/PIS/datas/valores/CEP e acrescenta a coluna Campos_Invalidos")
+    parser.add_argument("--tempo-limite", type=float, default=TEMPO_LIMITE_REGISTRO,
+                        help=f"Segundos por registro antes de ir para a quarentena (padrão: {TEMPO_LIMITE_REGISTRO:g}; 0 = sem limite)")
+    parser.add_argument("--quarentena", help="Arquivo JSONL dos registros que passaram do limite (padrão: quarentena/ dentro do diretório do cache)")
+    parser.add_argument("--perfil-regras", action="store_true", help="Mede tempo e acertos de cada regra de extração e mostra o ranking no fim")
+    parser.add_argument("--relatorios", help="Diretório dos relatórios de desempenho em JSON (padrão: relatorios/ dentro do diretório do cache)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Mostra o log detalhado do pipeline")
+    args = parser.parse_args(argv)
+
+    arquivos = expandir_entradas(args.entradas)
+    if not arquivos:
+        print("❌ Nenhum PDF para processar.", file=sys.stderr)
+        return 1
+
+    if args.relatorios:
+        os.environ['EXTRATOR_RELATORIOS_DIR'] = args.relatorios
+    template = carregar_template(args.template) if args.template else None
+    formato = deduzir_formato(args.saida, args.formato)
+    por_arquivo = os.path.isdir(args.saida) or args.saida.endswith(("/", os.sep))
+    if por_arquivo:
+        os.makedirs(args.saida, exist_ok=True)
+
+    def log(mensagem):
+        if args.verbose:
+            print(f"[{time.strftime('%H:%M:%S')}] {mensagem}", file=sys.stderr)
+
+    processador = ProcessadorPDF(num_workers=args.workers, log=log)
+    processador.backend = args.backend
+    processador.usar_cache = not args.sem_cache
+    processador.leitura_paralela = not args.serial
+    processador.tamanho_lote = args.lote
+    processador.normalizar = args.normalizar
+    processador.saida_ordenada = args.ordenado
+    processador.limite_reordenacao = args.limite_ordem
+    processador.perfil_regras = args.perfil_regras
+    processador.tempo_limite_registro = args.tempo_limite or None
+    processador.arquivo_quarentena = args.quarentena
+
+    # Perfil das regras somado entre todos os PDFs
+    perfil = PerfilRegras() if args.perfil_regras else None
+
+    t_inicio = time.perf_counter()
+    print(f"🚀 Inicialização: {(t_inicio - medicao_inicio.INICIO) * 1000:.0f} ms")
+    try:
+        falhas = exportar_em_fluxo(processador, arquivos, args.saida, formato, template, por_arquivo, perfil)
+    finally:
+        processador.fechar()
+
+    print(f"⏱️  Tempo total: {time.perf_counter() - t_inicio:.2f}s para {len(arquivos)} PDF(s)")
+    if perfil is not None and perfil.regras:
+        print("\n🔬 Perfil das regras de extração (ordenado por tempo total):")
+        print("\n".join(perfil.tabela()))
+    return 1 if falhas == len(arquivos) else 0
+
+
+def destino_por_arquivo(diretorio, caminho_pdf, formato):
+    return os.path.join(diretorio, os.path.splitext(os.path.basename(caminho_pdf))[0] + EXTENSOES[formato])
+
+
+def exportar_em_fluxo(processador, arquivos, saida, formato, template, por_arquivo, perfil=None):
+    # Cada lote de registros é gravado assim que termina, sem DataFrame em memória.
+    # Com perfil, acumula nele o perfil das regras de cada PDF.
+    # Retorna o número de PDFs sem nenhum registro.
+    colunas = colunas_saida(template, processador.normalizar)
+    unico = None
+    if not por_arquivo:
+        if len(arquivos) > 1:
+            colunas = ["Arquivo"] + colunas
+        unico = criar_escritor(saida, formato, colunas)
+
+    falhas = 0
+    try:
+        for caminho in arquivos:
+            print(f"📄 {caminho}")
+            if por_arquivo:
+                destino = destino_por_arquivo(saida, caminho, formato)
+                escritor = criar_escritor(destino, formato, colunas)
+            else:
+                escritor = unico
+                if len(arquivos) > 1:
+                    escritor.valores_fixos = {"Arquivo": os.path.basename(caminho)}
+
+            try:
+                total = processador.processar_pdf_em_fluxo(caminho, escritor, template)
+            finally:
+                if por_arquivo:
+                    with processador.instrumentacao.medir("exportacao"):
+                        escritor.fechar()
+            relatorio = processador.salvar_relatorio()
+            if perfil is not None and processador.perfil is not None:
+                perfil.somar(processador.perfil.regras)
+            tempos = dict(processador.tempos)
+            tempos["total"] = processador.instrumentacao.total
+
+            if not total:
+                falhas += 1
+                if por_arquivo:
+                    os.remove(destino)
+                print(f"   ❌ Nenhum registro extraído ({formatar_tempos(tempos)})")
+                continue
+            if por_arquivo:
+                print(f"   💾 {destino}")
+            print(f"   ✅ {total} registros | {formatar_tempos(tempos)}")
+            print(f"   📊 {processador.instrumentacao.resumo()}")
+            if relatorio:
+                print(f"   🗂️  {relatorio}")
+            if processador.normalizar and processador.registros_invalidos:
+                print(f"   ⚠️  {processador.registros_invalidos} com campos inválidos")
+            if processador.registros_quarentena:
+                print(f"   ⏳ {processador.registros_quarentena} em quarentena: {processador.caminho_quarentena}")
+    finally:
+        if unico is not None:
+            unico.fechar()
+
+    if unico is not None:
+        if unico.total:
+            print(f"💾 {saida}: {unico.total} registros")
+        else:
+            os.remove(saida)  # Nada extraído: não deixa um arquivo só com o cabeçalho
+    return falhas
+
+
+if __name__ == "__main__":
+    # Importante para Windows: proteção do entry point (workers com spawn)
+    sys.exit(main())
@@ -5,14 +5,19 @@ Versão 1.1.0
 Processa um único arquivo Word com múltiplas fichas separadas por quebras de página.
 """
 
+import medicao_inicio  # Primeiro import: marca o início para a medição de inicialização
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
 import threading
+import time
 from datetime import datetime
-import docx
-import pandas as pd
 from typing import Dict, List
+from fila_ui import FilaUI, ConsoleLimitado
+from instrumentacao import Instrumentacao
+from tabelas_docx import iterar_celulas, busca_labels, LEITOR_PADRAO
+from exportacao import exportar_excel, exportar_parquet, TIPOS_PARQUET_DOCX
+from normalizacao import normalizar_registros, contar_invalidos, REGRAS_DOCX, COLUNA_INVALIDOS_DOCX
 
 # Importar a classe base do extrator original
 import sys
@@ -34,6 +39,12 @@ class ExtratorWordArquivoUnico:
         self.total_paginas = 0
         self.paginas_processadas = 0
         self.processando = False
+        self.gerar_parquet = tk.BooleanVar(value=False)
+        self.normalizar = tk.BooleanVar(value=False)
+        # Leitor das tabelas do .docx (ver tabelas_docx.py)
+        self.leitor = LEITOR_PADRAO
+        # Medições da execução atual (recriadas a cada processamento)
+        self.instrumentacao = Instrumentacao("word-arquivo-unico")
         
         # Configurar estilo
         self.configurar_estilo()
@@ -41,6 +52,12 @@ class ExtratorWordArquivoUnico:
         # Criar interface
         self.criar_interface()
         
+        # Log, status e progresso chegam da thread de processamento por esta fila,
+        # aplicada pelo mainloop ~30 vezes por segundo (console com até 2000 linhas)
+        self.console = ConsoleLimitado(self.log_text)
+        self.ui = FilaUI(self.root, self.console)
+        self.ui.iniciar()
+        
         # Centralizar janela
         self.centralizar_janela()
     
@@ -201,6 +218,26 @@ class ExtratorWordArquivoUnico:
         btn_limpar.bind('<Enter>', lambda e: btn_limpar.config(bg=self.cor_botao_hover))
         btn_limpar.bind('<Leave>', lambda e: btn_limpar.config(bg=self.cor_botao))
         
+        # Opção de saída tipada para análise (datas, valores e categorias)
+        check_parquet = tk.Checkbutton(btn_frame, text="Gerar também Parquet",
+                                       variable=self.gerar_parquet,
+                                       bg=self.cor_fundo, fg=self.cor_texto,
+                                       selectcolor=self.cor_fundo_sec,
+                                       activebackground=self.cor_fundo,
+                                       activeforeground=self.cor_texto,
+                                       font=('Segoe UI', 9))
+        check_parquet.pack(side=tk.LEFT)
+        
+        # CPF/PIS com dígito verificador, datas, valores e CEP padronizados
+        check_normalizar = tk.Checkbutton(btn_frame, text="Normalizar e validar",
+                                          variable=self.normalizar,
+                                          bg=self.cor_fundo, fg=self.cor_texto,
+                                          selectcolor=self.cor_fundo_sec,
+                                          activebackground=self.cor_fundo,
+                                          activeforeground=self.cor_texto,
+                                          font=('Segoe UI', 9))
+        check_normalizar.pack(side=tk.LEFT, padx=(10, 0))
+        
         btn_sair = tk.Button(btn_frame, text="✖ Sair", command=self.sair,
                             bg=self.cor_erro, fg="#1e1e2e",
                             font=('Segoe UI', 9, 'bold'), relief=tk.FLAT,
@@ -228,16 +265,20 @@ class ExtratorWordArquivoUnico:
         self.root.geometry(f'{width}x{height}+{x}+{y}')
     
     def adicionar_log(self, mensagem, tag='info'):
-        """Adiciona mensagem ao log"""
+        """Adiciona mensagem ao log (de qualquer thread, via fila da interface)"""
         timestamp = datetime.now().strftime('%H:%M:%S')
-        self.log_text.insert(tk.END, f"[{timestamp}] ", 'header')
-        self.log_text.insert(tk.END, f"{mensagem}\n", tag)
-        self.log_text.see(tk.END)
-        self.root.update_idletasks()
+        self.ui.log((f"[{timestamp}] ", 'header'), (f"{mensagem}\n", tag))
+    
+    def atualizar_progresso(self, texto, progresso):
+        """Atualiza status, barra e percentual (de qualquer thread)"""
+        if texto is not None:
+            self.ui.definir('status', self.status_label.config, text=texto)
+        self.ui.definir('progresso', self.progress_bar.config, value=progresso)
+        self.ui.definir('percentual', self.percent_label.config, text=f"{progresso}%")
     
     def limpar_log(self):
         """Limpa o log"""
-        self.log_text.delete(1.0, tk.END)
+        self.console.limpar()
         self.adicionar_log("Log limpo.", 'info')
     
     def selecionar_arquivo(self):
@@ -253,6 +294,7 @@ class ExtratorWordArquivoUnico:
             
             # Analisar arquivo
             try:
+                import docx  # Carregado depois que a janela aparece (ver main)
                 doc = docx.Document(arquivo)
                 # Contar quebras de página
                 quebras = sum(1 for para in doc.paragraphs 
@@ -311,63 +353,76 @@ class ExtratorWordArquivoUnico:
         
         campos_endereco = ['endereco', 'numero', 'complemento', 'bairro', 'cidade', 'estado', 'cep', 'telefone', 'celular']
         
-        doc = docx.Document(caminho_arquivo)
+        # Com o leitor xml a leitura acontece junto com a extração (ver tabelas_docx.py)
+        with self.instrumentacao.medir("abertura"):
+            celulas = iterar_celulas(caminho_arquivo, self.leitor)
+        with self.instrumentacao.medir("extracao"):
+            return self.separar_fichas(celulas, caminho_arquivo, campos_mapeamento, campos_endereco)
+    
+    def separar_fichas(self, celulas, caminho_arquivo: str, campos_mapeamento: Dict[str, str],
+                       campos_endereco: List[str]) -> List[Dict[str, str]]:
+        """Percorre as células (tuplas de tabelas_docx.iterar_celulas) separando as fichas pelo campo de início"""
         todas_fichas = []
         dados_atuais = {}
         contador_fichas = 0
+        # Duração de cada ficha: tempo entre o fim da anterior e o fim dela
+        duracoes = []
+        t_ficha = time.perf_counter()
+        # Labels do Método 2 (campos de endereço ficam de fora), compilados uma vez
+        busca = busca_labels(tuple(label for label, campo_chave in campos_mapeamento.items()
+                                   if campo_chave not in campos_endereco))
         
         # Processar todas as tabelas
-        for tabela in doc.tables:
-            # Ao encontrar uma nova tabela, se ela tiver 'Código' ou 'Nome' na primeira linha, 
-            # e já tivermos dados, pode ser o início de uma nova ficha
-            for row_idx, row in enumerate(tabela.rows):
-                for cell in row.cells:
-                    texto_celula = cell.text.strip()
-                    
-                    if not texto_celula: continue
+        # Ao encontrar uma nova tabela, se ela tiver 'Código' ou 'Nome' na primeira linha, 
+        # e já tivermos dados, pode ser o início de uma nova ficha
+        for _, row_idx, _, texto_celula in celulas:
+            texto_celula = texto_celula.strip()
+            
+            if not texto_celula: continue
 
-                    # Verificar se é o início de uma nova ficha (Gatilho: campo 'Código' ou 'Nome')
-                    es_campo_inicio = any(label in texto_celula for label in ['Código', 'Nome do(a) trabalhador(a)'])
-                    
-                    if es_campo_inicio and dados_atuais:
-                        # Se já temos outros campos preenchidos, salva a ficha anterior
-                        # (Evita salvar ficha vazia ou duplicar se o gatilho bater várias vezes na mesma página)
-                        if len(dados_atuais) > 2: # Mais do que apenas metadados
-                            contador_fichas += 1
-                            dados_atuais['ficha_n'] = contador_fichas
-                            dados_atuais['arquivo_origem'] = os.path.basename(caminho_arquivo)
-                            dados_atuais['data_extracao'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                            todas_fichas.append(dados_atuais)
-                            dados_atuais = {}
+            # Verificar se é o início de uma nova ficha (Gatilho: campo 'Código' ou 'Nome')
+            es_campo_inicio = any(label in texto_celula for label in ['Código', 'Nome do(a) trabalhador(a)'])
+            
+            if es_campo_inicio and dados_atuais:
+                # Se já temos outros campos preenchidos, salva a ficha anterior
+                # (Evita salvar ficha vazia ou duplicar se o gatilho bater várias vezes na mesma página)
+                if len(dados_atuais) > 2: # Mais do que apenas metadados
+                    contador_fichas += 1
+                    dados_atuais['ficha_n'] = contador_fichas
+                    dados_atuais['arquivo_origem'] = os.path.basename(caminho_arquivo)
+                    dados_atuais['data_extracao'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    todas_fichas.append(dados_atuais)
+                    dados_atuais = {}
+                    agora = time.perf_counter()
+                    duracoes.append(agora - t_ficha)
+                    t_ficha = agora
 
-                    # Extração normal (Método 1: Label\nValor)
-                    if '\n' in texto_celula:
-                        linhas = texto_celula.split('\n')
-                        if len(linhas) >= 2:
-                            label = linhas[0].strip()
-                            valor = '\n'.join(linhas[1:]).strip()
-                            
-                            if label in campos_mapeamento:
-                                campo_chave = campos_mapeamento[label]
-                                
-                                if campo_chave in campos_endereco:
-                                    # Lógica do endereço residencial (index >= 15 da tabela)
-                                    if row_idx >= 15:
-                                        if campo_chave not in dados_atuais or not dados_atuais[campo_chave]:
-                                            dados_atuais[campo_chave] = valor
-                                else:
-                                    if campo_chave not in dados_atuais or not dados_atuais[campo_chave]:
-                                        dados_atuais[campo_chave] = valor
+            # Extração normal (Método 1: Label\nValor)
+            if '\n' in texto_celula:
+                linhas = texto_celula.split('\n')
+                if len(linhas) >= 2:
+                    label = linhas[0].strip()
+                    valor = '\n'.join(linhas[1:]).strip()
                     
-                    # Método 2 (Label embutido)
-                    for label, campo_chave in campos_mapeamento.items():
-                        if campo_chave in campos_endereco: continue
-                        if label in texto_celula and label + '\n' not in texto_celula:
-                            partes = texto_celula.split(label, 1)
-                            if len(partes) == 2:
-                                valor = partes[1].strip().strip('\n').strip()
-                                if valor and (campo_chave not in dados_atuais or not dados_atuais[campo_chave]):
+                    if label in campos_mapeamento:
+                        campo_chave = campos_mapeamento[label]
+                        
+                        if campo_chave in campos_endereco:
+                            # Lógica do endereço residencial (index >= 15 da tabela)
+                            if row_idx >= 15:
+                                if campo_chave not in dados_atuais or not dados_atuais[campo_chave]:
                                     dados_atuais[campo_chave] = valor
+                        else:
+                            if campo_chave not in dados_atuais or not dados_atuais[campo_chave]:
+                                dados_atuais[campo_chave] = valor
+            
+            # Método 2 (Label embutido): todos os labels numa passada só
+            for label, posicao in busca.encontrar(texto_celula):
+                if label + '\n' not in texto_celula:
+                    campo_chave = campos_mapeamento[label]
+                    valor = texto_celula[posicao + len(label):].strip().strip('\n').strip()
+                    if valor and (campo_chave not in dados_atuais or not dados_atuais[campo_chave]):
+                        dados_atuais[campo_chave] = valor
         
         # Adicionar a última ficha
         if dados_atuais and len(dados_atuais) > 2:
@@ -376,7 +431,9 @@ class ExtratorWordArquivoUnico:
             dados_atuais['arquivo_origem'] = os.path.basename(caminho_arquivo)
             dados_atuais['data_extracao'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             todas_fichas.append(dados_atuais)
-            
+            duracoes.append(time.perf_counter() - t_ficha)
+        
+        self.instrumentacao.registrar("registro", duracoes)
         return todas_fichas
     
     def processar_arquivo(self):
@@ -389,71 +446,95 @@ class ExtratorWordArquivoUnico:
             arquivo = self.arquivo_selecionado.get()
             self.adicionar_log(f"Arquivo: {os.path.basename(arquivo)}", 'info')
             
-            self.status_label.config(text="Analisando documento e separando fichas...")
-            self.progress_bar['value'] = 20
-            self.percent_label.config(text="20%")
+            self.atualizar_progresso("Analisando documento e separando fichas...", 20)
             
+            self.instrumentacao = Instrumentacao("word-arquivo-unico", arquivo,
+                                                 {"normalizar": self.normalizar.get(), "leitor": self.leitor})
+            self.instrumentacao.contar("arquivos")
             lista_dados = self.extrair_todas_as_fichas(arquivo)
             num_fichas = len(lista_dados)
+            self.instrumentacao.contar("registros", num_fichas)
             
             if num_fichas == 0:
                 self.adicionar_log("❌ Nenhuma ficha identificada.", 'error')
-                messagebox.showwarning("Aviso", "Nenhum dado foi encontrado no arquivo.")
+                self.ui.chamar(messagebox.showwarning, "Aviso", "Nenhum dado foi encontrado no arquivo.")
                 return
 
             self.adicionar_log(f"✓ Identificadas {num_fichas} fichas individuais.", 'success')
             
-            # Criar DataFrame e exportar
-            self.status_label.config(text="Organizando dados estruturados...")
-            self.progress_bar['value'] = 60
-            self.percent_label.config(text="60%")
+            # Exportar
+            self.atualizar_progresso("Organizando dados estruturados...", 60)
             
-            df = pd.DataFrame(lista_dados)
+            if self.normalizar.get():
+                with self.instrumentacao.medir("normalizacao"):
+                    lista_dados = normalizar_registros(lista_dados, REGRAS_DOCX, COLUNA_INVALIDOS_DOCX)
+                    invalidos = contar_invalidos(lista_dados, COLUNA_INVALIDOS_DOCX)
+                self.instrumentacao.contar("invalidos", invalidos)
+                if invalidos:
+                    self.adicionar_log(f"⚠ {invalidos} ficha(s) com campos inválidos (coluna {COLUNA_INVALIDOS_DOCX})", 'warning')
             
             # Reordenar colunas
             colunas_prioritarias = ['ficha_n', 'nome', 'cpf', 'data_admissao', 'contrato', 'funcao']
-            cols = [c for c in colunas_prioritarias if c in df.columns]
-            cols += [c for c in df.columns if c not in cols]
-            df = df[cols]
             
             pasta_saida = os.path.dirname(arquivo)
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             arquivo_saida = os.path.join(pasta_saida, f'fichas_organizadas_{timestamp}.xlsx')
             
-            # Formatar colunas para evitar a "bagunça"
-            df.to_excel(arquivo_saida, index=False, engine='openpyxl')
+            # Planilha gravada linha a linha (openpyxl write-only, memória constante)
+            with self.instrumentacao.medir("exportacao"):
+                exportar_excel(lista_dados, arquivo_saida, colunas_prioritarias)
             
-            self.progress_bar['value'] = 100
-            self.percent_label.config(text="100%")
-            self.status_label.config(text="Concluído!")
+            if self.gerar_parquet.get():
+                arquivo_parquet = os.path.splitext(arquivo_saida)[0] + '.parquet'
+                with self.instrumentacao.medir("exportacao"):
+                    exportar_parquet(lista_dados, arquivo_parquet, TIPOS_PARQUET_DOCX, colunas_prioritarias)
+                self.adicionar_log(f"✓ Parquet salvo: {os.path.basename(arquivo_parquet)}", 'success')
+            self.salvar_relatorio()
+            
+            self.atualizar_progresso("Concluído!", 100)
             
             self.adicionar_log(f"✓ {num_fichas} funcionários salvos organizadamente.", 'success')
             self.adicionar_log(f"Arquivo gerado: {os.path.basename(arquivo_saida)}", 'success')
             self.adicionar_log("="*60, 'header')
             
-            messagebox.showinfo("Sucesso", f"Processamento concluído!\n\nForam extraídas {num_fichas} fichas organizadas.\nArquivo: {os.path.basename(arquivo_saida)}")
+            self.ui.chamar(messagebox.showinfo, "Sucesso", f"Processamento concluído!\n\nForam extraídas {num_fichas} fichas organizadas.\nArquivo: {os.path.basename(arquivo_saida)}")
             
         except Exception as e:
             self.adicionar_log(f"ERRO: {str(e)}", 'error')
-            messagebox.showerror("Erro", f"Ocorreu um problema ao organizar os dados:\n{str(e)}")
+            self.ui.chamar(messagebox.showerror, "Erro", f"Ocorreu um problema ao organizar os dados:\n{str(e)}")
         finally:
             self.processando = False
-            self.btn_processar.config(state='normal')
-            self.progress_bar['value'] = 0
-            self.percent_label.config(text="0%")
+            self.ui.chamar(self.btn_processar.config, state='normal')
+            self.atualizar_progresso(None, 0)
+    
+    def salvar_relatorio(self):
+        """Fecha as medições e grava o relatório de desempenho em JSON (ver instrumentacao.py)"""
+        self.instrumentacao.finalizar()
+        self.adicionar_log(f"Desempenho: {self.instrumentacao.resumo()}", 'info')
+        try:
+            caminho = self.instrumentacao.salvar()
+        except OSError as e:
+            self.adicionar_log(f"⚠ Relatório de desempenho não gravado: {e}", 'warning')
+            return
+        self.adicionar_log(f"Relatório de desempenho: {caminho}", 'info')
     
     def sair(self):
         """Fecha a aplicação"""
         if self.processando:
             if messagebox.askyesno("Confirmar", "Há um processamento em andamento. Deseja realmente sair?"):
+                self.ui.parar()
                 self.root.destroy()
         else:
+            self.ui.parar()
             self.root.destroy()
 
 
 def main():
     root = tk.Tk()
     app = ExtratorWordArquivoUnico(root)
+    if not medicao_inicio.agendar_medicao(root):
+        # Bibliotecas pesadas carregam com a janela já na tela
+        medicao_inicio.importar_em_segundo_plano("docx", "openpyxl", "pandas")
     root.mainloop()
 
 
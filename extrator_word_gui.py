@@ -9,15 +9,24 @@ Autor: Antigravity AI
 Data: 2026-02-06
 """
 
+import medicao_inicio  # Primeiro import: marca o início para a medição de inicialização
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
 import threading
+import time
+import functools
 from pathlib import Path
 from datetime import datetime
-import docx
-import pandas as pd
-from typing import Dict, List
+from typing import Dict, List, Optional
+from fila_ui import FilaUI, ConsoleLimitado
+from instrumentacao import Instrumentacao
+from pool_documentos import mapear_em_ordem, usar_paralelo, workers_padrao
+from tabelas_docx import LEITOR_PADRAO
+from layout_docx import caminho_layout, obter_layout
+from extracao_word import CAMPOS_MAPEAMENTO, extrair_documento, extrair_documento_worker
+from exportacao import exportar_excel, exportar_parquet, TIPOS_PARQUET_DOCX
+from normalizacao import normalizar_registros, contar_invalidos, REGRAS_DOCX, COLUNA_INVALIDOS_DOCX
 
 
 class ExtratorWordGUI:
@@ -25,6 +34,12 @@ class ExtratorWordGUI:
     
     VERSION = "1.0.0"
     
+    # Colunas mais importantes primeiro nas planilhas geradas
+    COLUNAS_PRIORITARIAS = [
+        'arquivo_origem', 'nome', 'cpf', 'rg', 'data_nascimento',
+        'data_admissao', 'funcao', 'salario_inicial', 'data_rescisao'
+    ]
+    
     def __init__(self, root):
         self.root = root
         self.root.title(f"Extrator de Fichas Word v{self.VERSION}")
@@ -36,6 +51,16 @@ class ExtratorWordGUI:
         self.total_arquivos = 0
         self.arquivos_processados = 0
         self.processando = False
+        self.gerar_parquet = tk.BooleanVar(value=False)
+        self.normalizar = tk.BooleanVar(value=False)
+        self.paralelo = tk.BooleanVar(value=True)
+        self.usar_layout = tk.BooleanVar(value=False)
+        # Leitor das tabelas do .docx (ver tabelas_docx.py)
+        self.leitor = LEITOR_PADRAO
+        # Layout em uso no processamento atual (ver layout_docx.py)
+        self.layout = None
+        # Medições da execução atual (recriadas a cada processamento)
+        self.instrumentacao = Instrumentacao("word-gui")
         
         # Configurar estilo
         self.configurar_estilo()
@@ -43,6 +68,12 @@ class ExtratorWordGUI:
         # Criar interface
         self.criar_interface()
         
+        # Log, status e progresso chegam da thread de processamento por esta fila,
+        # aplicada pelo mainloop ~30 vezes por segundo (console com até 2000 linhas)
+        self.console = ConsoleLimitado(self.log_text)
+        self.ui = FilaUI(self.root, self.console)
+        self.ui.iniciar()
+        
         # Centralizar janela
         self.centralizar_janela()
     
@@ -285,6 +316,54 @@ class ExtratorWordGUI:
         btn_limpar.bind('<Enter>', lambda e: btn_limpar.config(bg=self.cor_botao_hover))
         btn_limpar.bind('<Leave>', lambda e: btn_limpar.config(bg=self.cor_botao))
         
+        # Opção de saída tipada para análise (datas, valores e categorias)
+        check_parquet = tk.Checkbutton(btn_frame,
+                                       text="Gerar também Parquet",
+                                       variable=self.gerar_parquet,
+                                       bg=self.cor_fundo,
+                                       fg=self.cor_texto,
+                                       selectcolor=self.cor_fundo_sec,
+                                       activebackground=self.cor_fundo,
+                                       activeforeground=self.cor_texto,
+                                       font=('Segoe UI', 9))
+        check_parquet.pack(side=tk.LEFT)
+        
+        # CPF/PIS com dígito verificador, datas, valores e CEP padronizados
+        check_normalizar = tk.Checkbutton(btn_frame,
+                                          text="Normalizar e validar",
+                                          variable=self.normalizar,
+                                          bg=self.cor_fundo,
+                                          fg=self.cor_texto,
+                                          selectcolor=self.cor_fundo_sec,
+                                          activebackground=self.cor_fundo,
+                                          activeforeground=self.cor_texto,
+                                          font=('Segoe UI', 9))
+        check_normalizar.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Um processo por núcleo (lotes pequenos continuam em sequência)
+        check_paralelo = tk.Checkbutton(btn_frame,
+                                        text="Processar em paralelo",
+                                        variable=self.paralelo,
+                                        bg=self.cor_fundo,
+                                        fg=self.cor_texto,
+                                        selectcolor=self.cor_fundo_sec,
+                                        activebackground=self.cor_fundo,
+                                        activeforeground=self.cor_texto,
+                                        font=('Segoe UI', 9))
+        check_paralelo.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Posições dos campos aprendidas nos primeiros documentos (layout_word-gui.json no diretório)
+        check_layout = tk.Checkbutton(btn_frame,
+                                      text="Usar layout aprendido",
+                                      variable=self.usar_layout,
+                                      bg=self.cor_fundo,
+                                      fg=self.cor_texto,
+                                      selectcolor=self.cor_fundo_sec,
+                                      activebackground=self.cor_fundo,
+                                      activeforeground=self.cor_texto,
+                                      font=('Segoe UI', 9))
+        check_layout.pack(side=tk.LEFT, padx=(10, 0))
+        
         # Botão Sair
         btn_sair = tk.Button(btn_frame,
                             text="✖ Sair",
@@ -326,16 +405,22 @@ class ExtratorWordGUI:
         self.root.geometry(f'{width}x{height}+{x}+{y}')
     
     def adicionar_log(self, mensagem, tag='info'):
-        """Adiciona mensagem ao log com timestamp"""
+        """Adiciona mensagem ao log com timestamp (de qualquer thread, via fila da interface)"""
         timestamp = datetime.now().strftime('%H:%M:%S')
-        self.log_text.insert(tk.END, f"[{timestamp}] ", 'header')
-        self.log_text.insert(tk.END, f"{mensagem}\n", tag)
-        self.log_text.see(tk.END)
-        self.root.update_idletasks()
+        self.ui.log((f"[{timestamp}] ", 'header'), (f"{mensagem}\n", tag))
+    
+    def atualizar_status(self, texto):
+        """Atualiza o texto de status (de qualquer thread)"""
+        self.ui.definir('status', self.status_label.config, text=texto)
+    
+    def atualizar_progresso(self, progresso):
+        """Atualiza a barra e o percentual (de qualquer thread)"""
+        self.ui.definir('progresso', self.progress_bar.config, value=progresso)
+        self.ui.definir('percentual', self.percent_label.config, text=f"{progresso:.1f}%")
     
     def limpar_log(self):
         """Limpa o log de atividades"""
-        self.log_text.delete(1.0, tk.END)
+        self.console.limpar()
         self.adicionar_log("Log limpo.", 'info')
     
     def selecionar_diretorio(self):
@@ -347,7 +432,7 @@ class ExtratorWordGUI:
             self.adicionar_log(f"Diretório selecionado: {diretorio}", 'success')
             
             # Contar arquivos .docx
-            arquivos = list(Path(diretorio).glob('*.docx'))
+            arquivos = sorted(Path(diretorio).glob('*.docx'))
             arquivos = [f for f in arquivos if not f.name.startswith('~$')]
             self.total_arquivos = len(arquivos)
             
@@ -384,33 +469,46 @@ class ExtratorWordGUI:
             diretorio = self.diretorio_selecionado.get()
             
             # Buscar arquivos
-            arquivos = list(Path(diretorio).glob('*.docx'))
+            arquivos = sorted(Path(diretorio).glob('*.docx'))
             arquivos = [f for f in arquivos if not f.name.startswith('~$')]
             
             self.total_arquivos = len(arquivos)
             self.arquivos_processados = 0
+            num_workers = workers_padrao() if self.paralelo.get() else 1
+            self.instrumentacao = Instrumentacao("word-gui", diretorio,
+                                                 {"normalizar": self.normalizar.get(), "workers": num_workers,
+                                                  "leitor": self.leitor, "layout": self.usar_layout.get()})
+            self.instrumentacao.contar("arquivos", len(arquivos))
+            self.layout = None
             
             # Processar cada arquivo
             resultados = []
             
-            for i, arquivo in enumerate(arquivos, 1):
-                self.status_label.config(text=f"Processando: {arquivo.name}")
-                self.adicionar_log(f"[{i}/{self.total_arquivos}] {arquivo.name}", 'info')
-                
-                try:
-                    dados = self.extrair_documento(str(arquivo))
-                    resultados.append(dados)
-                    self.adicionar_log(f"  ✓ Extraído com sucesso", 'success')
-                except Exception as e:
-                    self.adicionar_log(f"  ✗ Erro: {str(e)}", 'error')
-                    resultados.append({'arquivo_origem': arquivo.name, 'erro': str(e)})
-                
-                # Atualizar progresso
-                self.arquivos_processados = i
-                progresso = (i / self.total_arquivos) * 100
-                self.progress_bar['value'] = progresso
-                self.percent_label.config(text=f"{progresso:.1f}%")
-                self.root.update_idletasks()
+            # Modo layout: os primeiros documentos ensinam as posições (ou o template salvo é usado)
+            if self.usar_layout.get():
+                self.layout, resultados = obter_layout(caminho_layout(diretorio, "word-gui"), "word-gui", arquivos,
+                                                       self.processar_documento, set(CAMPOS_MAPEAMENTO.values()),
+                                                       self.adicionar_log)
+            restantes = arquivos[len(resultados):]
+            
+            if usar_paralelo(len(restantes), num_workers):
+                resultados += self.processar_em_paralelo(restantes, num_workers)
+            else:
+                for i, arquivo in enumerate(restantes, len(resultados)):
+                    resultados.append(self.processar_documento(i, arquivo))
+            
+            self.instrumentacao.contar("registros", len(resultados))
+            if self.layout is not None:
+                contagens = self.instrumentacao.contagens
+                self.adicionar_log(f"Layout: {contagens.get('layout_direto', 0)} documento(s) lidos nas posições "
+                                   f"aprendidas, {contagens.get('layout_varredura', 0)} com a varredura completa", 'info')
+            if self.normalizar.get():
+                with self.instrumentacao.medir("normalizacao"):
+                    resultados = normalizar_registros(resultados, REGRAS_DOCX, COLUNA_INVALIDOS_DOCX)
+                    invalidos = contar_invalidos(resultados, COLUNA_INVALIDOS_DOCX)
+                self.instrumentacao.contar("invalidos", invalidos)
+                if invalidos:
+                    self.adicionar_log(f"⚠ {invalidos} registro(s) com campos inválidos (coluna {COLUNA_INVALIDOS_DOCX})", 'warning')
             
             # Exportar para Excel
             self.adicionar_log("="*60, 'header')
@@ -422,137 +520,128 @@ class ExtratorWordGUI:
             self.exportar_para_excel(resultados, arquivo_saida)
             
             self.adicionar_log(f"✓ Planilha salva: {os.path.basename(arquivo_saida)}", 'success')
+            
+            if self.gerar_parquet.get():
+                arquivo_parquet = os.path.splitext(arquivo_saida)[0] + '.parquet'
+                self.exportar_para_parquet(resultados, arquivo_parquet)
+                self.adicionar_log(f"✓ Parquet salvo: {os.path.basename(arquivo_parquet)}", 'success')
+            self.salvar_relatorio()
             self.adicionar_log("="*60, 'header')
             self.adicionar_log("PROCESSAMENTO CONCLUÍDO COM SUCESSO!", 'success')
             self.adicionar_log("="*60, 'header')
             
-            self.status_label.config(text=f"Concluído! {self.total_arquivos} arquivo(s) processado(s)")
+            self.atualizar_status(f"Concluído! {self.total_arquivos} arquivo(s) processado(s)")
             
             # Mostrar mensagem de sucesso
-            self.root.after(0, lambda: messagebox.showinfo(
+            self.ui.chamar(
+                messagebox.showinfo,
                 "Sucesso!",
                 f"Processamento concluído!\n\n"
                 f"Arquivos processados: {self.total_arquivos}\n"
                 f"Arquivo gerado: {os.path.basename(arquivo_saida)}"
-            ))
+            )
             
         except Exception as e:
             self.adicionar_log(f"ERRO CRÍTICO: {str(e)}", 'error')
-            self.root.after(0, lambda: messagebox.showerror("Erro", f"Erro durante processamento:\n{str(e)}"))
+            self.ui.chamar(messagebox.showerror, "Erro", f"Erro durante processamento:\n{str(e)}")
         
         finally:
             self.processando = False
-            self.btn_processar.config(state='normal')
-            self.progress_bar['value'] = 0
-            self.percent_label.config(text="0%")
+            self.ui.chamar(self.btn_processar.config, state='normal')
+            self.atualizar_progresso(0)
     
-    def extrair_documento(self, caminho_arquivo: str) -> Dict[str, str]:
-        """Extrai dados de um documento Word"""
-        campos_mapeamento = {
-            'Código': 'codigo', 'Contrato': 'contrato', 'Nome do(a) trabalhador(a)': 'nome',
-            'Matricula eSocial': 'matricula_esocial', 'Nome do pai': 'nome_pai',
-            'Nome da mãe': 'nome_mae', 'Data de nascimento': 'data_nascimento',
-            'Raça/cor': 'raca_cor', 'Sexo': 'sexo', 'Naturalidade': 'naturalidade',
-            'Nacionalidade': 'nacionalidade', 'Estado Civil': 'estado_civil',
-            'Deficiente': 'deficiente', 'Tipo de deficiência': 'tipo_deficiencia',
-            'Tipo sanguíneo': 'tipo_sanguineo', 'CPF': 'cpf',
-            'Cédula de identidade': 'rg', 'Data de emissão': 'data_emissao_rg',
-            'Órgão/UF': 'orgao_uf_rg', 'CTPS': 'ctps', 'Série': 'serie_ctps',
-            'Dígito': 'digito_ctps', 'Nº título de eleitor': 'titulo_eleitor',
-            'Zona': 'zona_eleitoral', 'Seção': 'secao_eleitoral', 'Nº do PIS': 'pis',
-            'Data de cadastramento': 'data_cadastramento_pis', 'Grau de instrução': 'grau_instrucao',
-            'Endereço': 'endereco', 'Número': 'numero', 'Complemento': 'complemento',
-            'Bairro': 'bairro', 'Cidade': 'cidade', 'Estado': 'estado', 'CEP': 'cep',
-            'Telefone': 'telefone', 'Celular': 'celular', 'Endereço eletrônico': 'email',
-            'Data de admissão': 'data_admissao', 'Data do registro': 'data_registro',
-            'Função': 'funcao', 'CBO': 'cbo', 'Salário Inicial': 'salario_inicial',
-            'Forma de pagamento': 'forma_pagamento', 'Tipo de pagamento': 'tipo_pagamento',
-            'Insalubridade': 'insalubridade', 'Periculosidade': 'periculosidade',
-            'Sindicato': 'sindicato', 'Centro de custo': 'centro_custo',
-            'Localização': 'localizacao', 'Horário': 'horario',
-            'Nº da conta FGTS': 'conta_fgts', 'Data de opção': 'data_opcao_fgts',
-            'Banco depositário - FGTS': 'banco_fgts', 'Data rescisão': 'data_rescisao',
-            'Aviso prévio': 'aviso_previo', 'Saldo FGTS': 'saldo_fgts',
-            'Maior remuneração': 'maior_remuneracao', 'Causa da rescisão': 'causa_rescisao',
-            'Empregador': 'empregador', 'CNPJ': 'cnpj_empregador'
-        }
-        
-        # Campos de endereço que aparecem duas vezes (empresa e residencial)
-        campos_endereco = ['endereco', 'numero', 'complemento', 'bairro', 'cidade', 'estado', 'cep', 'telefone', 'celular']
-        
-        doc = docx.Document(caminho_arquivo)
-        dados = {}
-        
-        # Processar todas as tabelas
-        for tabela in doc.tables:
-            for row_idx, row in enumerate(tabela.rows):
-                for cell in row.cells:
-                    texto_celula = cell.text.strip()
-                    
-                    # Método 1: Label\nValor (formato padrão)
-                    if '\n' in texto_celula:
-                        linhas = texto_celula.split('\n')
-                        if len(linhas) >= 2:
-                            label = linhas[0].strip()
-                            valor = '\n'.join(linhas[1:]).strip()
-                            
-                            if label in campos_mapeamento:
-                                campo_chave = campos_mapeamento[label]
-                                
-                                # Se for campo de endereço
-                                if campo_chave in campos_endereco:
-                                    # Endereço da empresa aparece nas primeiras linhas (< 10)
-                                    # Endereço residencial aparece depois (>= 15)
-                                    # Só capturar se estiver na região do endereço residencial
-                                    if row_idx >= 15:
-                                        if campo_chave not in dados or not dados[campo_chave]:
-                                            dados[campo_chave] = valor
-                                else:
-                                    # Campos não relacionados a endereço: extrair normalmente
-                                    if campo_chave not in dados or not dados[campo_chave]:
-                                        dados[campo_chave] = valor
-                    
-                    # Método 2: Procurar labels conhecidos no texto (apenas para campos não-endereço)
-                    for label, campo_chave in campos_mapeamento.items():
-                        # Pular campos de endereço neste método
-                        if campo_chave in campos_endereco:
-                            continue
-                            
-                        if label in texto_celula and campo_chave not in dados:
-                            # Tentar extrair valor após o label
-                            partes = texto_celula.split(label, 1)
-                            if len(partes) == 2:
-                                valor = partes[1].strip().strip('\n').strip()
-                                if valor and campo_chave not in dados:
-                                    dados[campo_chave] = valor
-        
-        dados['arquivo_origem'] = os.path.basename(caminho_arquivo)
-        dados['data_extracao'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    def processar_documento(self, indice: int, arquivo: Path, origens: Optional[Dict] = None) -> Dict[str, str]:
+        """Extrai um arquivo na thread de processamento, com log e progresso"""
+        i = indice + 1
+        self.atualizar_status(f"Processando: {arquivo.name}")
+        self.adicionar_log(f"[{i}/{self.total_arquivos}] {arquivo.name}", 'info')
         
+        t = time.perf_counter()
+        try:
+            dados = self.extrair_documento(str(arquivo), origens)
+            self.adicionar_log("  ✓ Extraído com sucesso", 'success')
+        except Exception as e:
+            self.adicionar_log(f"  ✗ Erro: {str(e)}", 'error')
+            dados = {'arquivo_origem': arquivo.name, 'erro': str(e)}
+            self.instrumentacao.contar("erros")
+        self.instrumentacao.registrar("registro", [time.perf_counter() - t])
+        
+        # Atualizar progresso
+        self.arquivos_processados = i
+        self.atualizar_progresso((i / self.total_arquivos) * 100)
         return dados
     
+    def processar_em_paralelo(self, arquivos: List[Path], num_workers: int) -> List[Dict[str, str]]:
+        """Extrai os arquivos em um pool de processos; devolve os dados na ordem de arquivos"""
+        self.adicionar_log(f"Processando em paralelo com {min(num_workers, len(arquivos))} processos", 'info')
+        # Arquivos extraídos antes do pool (aprendizado do layout)
+        ja_processados = self.arquivos_processados
+        
+        def ao_concluir(concluidos, indice, resultado, erro):
+            # Roda nesta thread, na ordem em que os arquivos terminam
+            nome = arquivos[indice].name
+            self.adicionar_log(f"[{ja_processados + concluidos}/{self.total_arquivos}] {nome}", 'info')
+            if erro is None:
+                self.adicionar_log("  ✓ Extraído com sucesso", 'success')
+            else:
+                self.adicionar_log(f"  ✗ Erro: {erro}", 'error')
+            self.atualizar_status(f"Processado: {nome}")
+            self.arquivos_processados = ja_processados + concluidos
+            self.atualizar_progresso((self.arquivos_processados / self.total_arquivos) * 100)
+        
+        extrair = functools.partial(extrair_documento_worker, leitor=self.leitor, layout=self.layout)
+        with self.instrumentacao.medir("extracao_paralela"):
+            extraidos = mapear_em_ordem(extrair, [str(arquivo) for arquivo in arquivos], num_workers, ao_concluir)
+        
+        resultados = []
+        for arquivo, (resultado, erro) in zip(arquivos, extraidos):
+            if erro is not None:
+                resultados.append({'arquivo_origem': arquivo.name, 'erro': erro})
+                self.instrumentacao.contar("erros")
+                continue
+            dados, etapas, contagens, duracao = resultado
+            # Soma entre os workers: pode passar do tempo de relógio (em extracao_paralela)
+            for etapa, segundos in etapas.items():
+                self.instrumentacao.adicionar(etapa, segundos)
+            for nome, quantidade in contagens.items():
+                self.instrumentacao.contar(nome, quantidade)
+            self.instrumentacao.registrar("registro", [duracao])
+            resultados.append(dados)
+        return resultados
+    
+    def extrair_documento(self, caminho_arquivo: str, origens: Optional[Dict] = None) -> Dict[str, str]:
+        """Extrai dados de um documento Word"""
+        return extrair_documento(caminho_arquivo, self.instrumentacao, self.leitor, self.layout, origens)
+    
     def exportar_para_excel(self, dados: List[Dict[str, str]], arquivo_saida: str):
-        """Exporta dados para Excel"""
-        df = pd.DataFrame(dados)
-        
-        colunas_prioritarias = [
-            'arquivo_origem', 'nome', 'cpf', 'rg', 'data_nascimento',
-            'data_admissao', 'funcao', 'salario_inicial', 'data_rescisao'
-        ]
-        
-        colunas_ordenadas = [col for col in colunas_prioritarias if col in df.columns]
-        colunas_restantes = [col for col in df.columns if col not in colunas_ordenadas]
-        colunas_ordenadas.extend(colunas_restantes)
-        
-        df = df[colunas_ordenadas]
-        df.to_excel(arquivo_saida, index=False, engine='openpyxl')
+        """Exporta dados para Excel (linha a linha, sem montar a planilha em memória)"""
+        with self.instrumentacao.medir("exportacao"):
+            exportar_excel(dados, arquivo_saida, self.COLUNAS_PRIORITARIAS)
+    
+    def exportar_para_parquet(self, dados: List[Dict[str, str]], arquivo_saida: str):
+        """Exporta dados para Parquet com colunas tipadas (datas, valores, categorias)"""
+        with self.instrumentacao.medir("exportacao"):
+            exportar_parquet(dados, arquivo_saida, TIPOS_PARQUET_DOCX, self.COLUNAS_PRIORITARIAS)
+    
+    def salvar_relatorio(self):
+        """Fecha as medições e grava o relatório de desempenho em JSON (ver instrumentacao.py)"""
+        self.instrumentacao.finalizar()
+        self.adicionar_log(f"Desempenho: {self.instrumentacao.resumo()}", 'info')
+        try:
+            caminho = self.instrumentacao.salvar()
+        except OSError as e:
+            self.adicionar_log(f"⚠ Relatório de desempenho não gravado: {e}", 'warning')
+            return
+        self.adicionar_log(f"Relatório de desempenho: {caminho}", 'info')
     
     def sair(self):
         """Fecha a aplicação"""
         if self.processando:
             if messagebox.askyesno("Confirmar", "Há um processamento em andamento. Deseja realmente sair?"):
+                self.ui.parar()
                 self.root.destroy()
         else:
+            self.ui.parar()
             self.root.destroy()
 
 
@@ -560,6 +649,9 @@ def main():
     """Função principal"""
     root = tk.Tk()
     app = ExtratorWordGUI(root)
+    if not medicao_inicio.agendar_medicao(root):
+        # Bibliotecas pesadas carregam com a janela já na tela
+        medicao_inicio.importar_em_segundo_plano("docx", "openpyxl", "pandas")
     root.mainloop()
 
 
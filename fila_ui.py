@@ -0,0 +1,145 @@
+"""
+Canal de atualização das interfaces (tkinter e customtkinter)
+
+As threads de processamento não tocam nos widgets: publicam eventos numa fila
+e o mainloop do Tk aplica tudo em lotes, num after() de intervalo fixo. Assim:
+
+- o Tk só é acessado pela thread principal;
+- mil mensagens de log entre dois quadros viram uma única inserção no console;
+- status e progresso publicados várias vezes no mesmo quadro só são desenhados
+  uma vez (vale o último valor).
+
+O console de log é um buffer circular: só as últimas MAX_LINHAS linhas ficam
+no widget, então ele não cresce sem limite em execuções de 50 mil registros.
+"""
+
+import queue
+from collections import deque
+
+# ~30 atualizações por segundo
+INTERVALO_MS = 33
+# Linhas mantidas no console de log
+MAX_LINHAS = 2000
+
+
+class ConsoleLimitado:
+    """Console de log (tk.Text, ScrolledText ou CTkTextbox) que guarda só as últimas linhas"""
+
+    def __init__(self, texto, max_linhas=MAX_LINHAS, somente_leitura=False):
+        """
+        Args:
+            texto: Widget de texto do log
+            max_linhas: Linhas mantidas; as mais antigas são apagadas
+            somente_leitura: Widget fica em state="disabled" entre as escritas
+        """
+        self.texto = texto
+        self.max_linhas = max_linhas
+        self.somente_leitura = somente_leitura
+        self.linhas = 0
+
+    def escrever(self, entradas):
+        """
+        Insere um lote de entradas de uma vez (só as que cabem no buffer)
+
+        Args:
+            entradas: Sequência de entradas; cada entrada é uma lista de (trecho, tag)
+                      terminando em "\\n" (tag None = sem formatação)
+        """
+        entradas = list(deque(entradas, maxlen=self.max_linhas))
+        if not entradas:
+            return
+        if self.somente_leitura:
+            self.texto.configure(state="normal")
+
+        for trechos in entradas:
+            for trecho, tag in trechos:
+                if tag is None:
+                    self.texto.insert("end", trecho)
+                else:
+                    self.texto.insert("end", trecho, tag)
+            self.linhas += sum(trecho.count("\n") for trecho, _ in trechos)
+
+        excesso = self.linhas - self.max_linhas
+        if excesso > 0:
+            self.texto.delete("1.0", f"{excesso + 1}.0")
+            self.linhas = self.max_linhas
+
+        self.texto.see("end")
+        if self.somente_leitura:
+            self.texto.configure(state="disabled")
+
+    def limpar(self):
+        if self.somente_leitura:
+            self.texto.configure(state="normal")
+        self.texto.delete("1.0", "end")
+        self.linhas = 0
+        if self.somente_leitura:
+            self.texto.configure(state="disabled")
+
+
+class FilaUI:
+    """Fila de eventos publicados por qualquer thread e aplicados pelo mainloop"""
+
+    def __init__(self, janela, console=None, intervalo_ms=INTERVALO_MS):
+        """
+        Args:
+            janela: Janela raiz (tk.Tk ou ctk.CTk), dona do after()
+            console: ConsoleLimitado que recebe as entradas de log
+            intervalo_ms: Intervalo entre dois quadros de atualização
+        """
+        self.janela = janela
+        self.console = console
+        self.intervalo_ms = intervalo_ms
+        self.fila = queue.SimpleQueue()
+        self.agendamento = None
+
+    # Lado das threads (thread-safe)
+
+    def log(self, *trechos):
+        """Publica uma entrada de log: trechos (texto, tag) que formam uma linha"""
+        self.fila.put(("log", trechos))
+
+    def definir(self, chave, funcao, *args, **kwargs):
+        """Publica um estado (status, progresso...): no mesmo quadro só o último de cada chave vale"""
+        self.fila.put(("definir", chave, (funcao, args, kwargs)))
+
+    def chamar(self, funcao, *args, **kwargs):
+        """Publica uma chamada que precisa rodar na thread do Tk (ex.: messagebox)"""
+        self.fila.put(("chamar", None, (funcao, args, kwargs)))
+
+    # Lado do mainloop
+
+    def iniciar(self):
+        if self.agendamento is None:
+            self.agendamento = self.janela.after(self.intervalo_ms, self.drenar)
+
+    def parar(self):
+        if self.agendamento is not None:
+            self.janela.after_cancel(self.agendamento)
+            self.agendamento = None
+
+    def drenar(self):
+        """Aplica tudo o que foi publicado desde o último quadro e agenda o próximo"""
+        entradas = deque(maxlen=self.console.max_linhas if self.console else 0)
+        estados = {}
+        chamadas = []
+        while True:
+            try:
+                evento = self.fila.get_nowait()
+            except queue.Empty:
+                break
+            if evento[0] == "log":
+                entradas.append(evento[1])
+            elif evento[0] == "definir":
+                estados.pop(evento[1], None)  # Reinsere no fim: ordem da última publicação
+                estados[evento[1]] = evento[2]
+            else:
+                chamadas.append(evento[2])
+
+        try:
+            if entradas:
+                self.console.escrever(entradas)
+            for funcao, args, kwargs in list(estados.values()) + chamadas:
+                funcao(*args, **kwargs)
+        finally:
+            self.agendamento = self.janela.after(self.intervalo_ms, self.drenar)
@@ -0,0 +1,189 @@
+"""
+Instrumentação das execuções: tempo por etapa, distribuição por item e vazão
+
+Cada execução (um PDF ou um lote de documentos Word) tem uma Instrumentacao que
+acumula:
+
+- etapas: segundos gastos em cada etapa (abertura, leitura, separação, ...);
+  etapas medidas uma dentro da outra não contam duas vezes (a de fora fica só
+  com o tempo próprio), então a soma das etapas fica próxima do total
+- distribuições: duração de cada item (página, registro) para p50/p95/máximo
+- contagens: páginas, registros, registros inválidos, erros
+
+No fim, relatorio() monta um dicionário com o mesmo formato para todas as
+ferramentas (PDF e Word) e salvar() grava em JSON. Sem caminho explícito, os
+relatórios vão para o diretório de relatórios, um arquivo por execução, para
+comparar execuções ao longo do tempo:
+
+    python instrumentacao.py [diretório]   # tabela com os relatórios salvos
+"""
+
+import os
+import json
+import math
+import time
+import contextlib
+from datetime import datetime
+from typing import Dict, Optional
+
+from cache_paginas import diretorio_padrao
+
+# Incrementado quando o formato do relatório muda
+VERSAO_RELATORIO = 1
+
+
+def diretorio_relatorios() -> str:
+    """Diretório dos relatórios (pode ser trocado pela variável EXTRATOR_RELATORIOS_DIR)"""
+    return os.environ.get('EXTRATOR_RELATORIOS_DIR') or os.path.join(diretorio_padrao(), 'relatorios')
+
+
+def percentil(ordenados, p):
+    """Percentil p (0-100) pelo método nearest-rank; ordenados não pode estar vazio"""
+    posicao = max(1, math.ceil(p / 100 * len(ordenados)))
+    return ordenados[posicao - 1]
+
+
+def resumir_duracoes(duracoes) -> Dict[str, float]:
+    """Contagem, média, p50, p95 e máximo (em milissegundos) de uma lista de durações em segundos"""
+    ordenados = sorted(duracoes)
+    if not ordenados:
+        return {"n": 0}
+    return {
+        "n": len(ordenados),
+        "media_ms": round(sum(ordenados) / len(ordenados) * 1000, 3),
+        "p50_ms": round(percentil(ordenados, 50) * 1000, 3),
+        "p95_ms": round(percentil(ordenados, 95) * 1000, 3),
+        "max_ms": round(ordenados[-1] * 1000, 3),
+    }
+
+
+class Instrumentacao:
+    """Medições de uma execução"""
+
+    def __init__(self, ferramenta: str, entrada: Optional[str] = None,
+                 parametros: Optional[Dict] = None):
+        """
+        Args:
+            ferramenta: Identificação da ferramenta (ex.: "pdf", "word-lote")
+            entrada: Arquivo ou diretório processado
+            parametros: Opções da execução (backend, workers, ...), copiadas para o relatório
+        """
+        self.ferramenta = ferramenta
+        self.entrada = entrada
+        self.parametros = dict(parametros or {})
+        self.inicio = datetime.now()
+        self.t0 = time.perf_counter()
+        self.total = None
+        self.etapas = {}
+        self.duracoes = {}
+        self.contagens = {}
+        # Etapas em andamento: [tempo gasto nas etapas internas]
+        self.pilha = []
+
+    @contextlib.contextmanager
+    def medir(self, etapa: str):
+        """Soma à etapa o tempo do bloco with, descontado o das etapas medidas dentro dele"""
+        internas = [0.0]
+        self.pilha.append(internas)
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracao = time.perf_counter() - t
+            self.pilha.pop()
+            self.adicionar(etapa, duracao - internas[0])
+            if self.pilha:
+                self.pilha[-1][0] += duracao
+
+    def adicionar(self, etapa: str, segundos: float):
+        self.etapas[etapa] = self.etapas.get(etapa, 0.0) + segundos
+
+    def registrar(self, item: str, duracoes):
+        """Acrescenta durações (segundos) de itens individuais, ex.: "registro", "pagina" """
+        self.duracoes.setdefault(item, []).extend(duracoes)
+
+    def contar(self, nome: str, quantidade: int = 1):
+        self.contagens[nome] = self.contagens.get(nome, 0) + quantidade
+
+    def finalizar(self) -> float:
+        """Fixa o tempo total (chamado depois da gravação da saída)"""
+        self.total = time.perf_counter() - self.t0
+        return self.total
+
+    def relatorio(self) -> Dict:
+        total = self.total if self.total is not None else time.perf_counter() - self.t0
+        vazao = {}
+        for nome in ("paginas", "registros"):
+            if nome in self.contagens and total > 0:
+                vazao[f"{nome}_por_s"] = round(self.contagens[nome] / total, 2)
+        return {
+            "versao": VERSAO_RELATORIO,
+            "ferramenta": self.ferramenta,
+            "entrada": self.entrada,
+            "inicio": self.inicio.isoformat(timespec="seconds"),
+            "parametros": self.parametros,
+            "total_s": round(total, 4),
+            "etapas_s": {etapa: round(segundos, 4) for etapa, segundos in self.etapas.items()},
+            "distribuicoes": {item: resumir_duracoes(duracoes) for item, duracoes in self.duracoes.items()},
+            "contagens": dict(self.contagens),
+            "vazao": vazao,
+        }
+
+    def resumo(self) -> str:
+        """Uma linha para o log: totais, vazão e distribuição por registro"""
+        relatorio = self.relatorio()
+        partes = [f"{relatorio['total_s']:.2f}s"]
+        for nome, rotulo in (("registros", "reg"), ("paginas", "pág")):
+            if f"{nome}_por_s" in relatorio["vazao"]:
+                partes.append(f"{self.contagens[nome]} {rotulo} ({relatorio['vazao'][f'{nome}_por_s']:.1f}/s)")
+        registro = relatorio["distribuicoes"].get("registro")
+        if registro and registro["n"]:
+            partes.append(f"registro p50 {registro['p50_ms']:.1f}ms p95 {registro['p95_ms']:.1f}ms máx {registro['max_ms']:.1f}ms")
+        return " | ".join(partes)
+
+    def salvar(self, caminho: Optional[str] = None) -> str:
+        """
+        Grava o relatório em JSON
+
+        Args:
+            caminho: Arquivo de destino; sem ele, um arquivo novo no diretório de relatórios
+
+        Returns:
+            Caminho do arquivo gravado
+        """
+        if caminho is None:
+            diretorio = diretorio_relatorios()
+            os.makedirs(diretorio, exist_ok=True)
+            nome = f"{self.ferramenta}_{self.inicio.strftime('%Y%m%d_%H%M%S_%f')}.json"
+            caminho = os.path.join(diretorio, nome)
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(self.relatorio(), arquivo, ensure_ascii=False, indent=2)
+        return caminho
+
+
+def main():
+    import sys
+    import glob
+
+    diretorio = sys.argv[1] if len(sys.argv) > 1 else diretorio_relatorios()
+    caminhos = sorted(glob.glob(os.path.join(diretorio, '*.json')))
+    if not caminhos:
+        print(f"Nenhum relatório em {diretorio}")
+        return
+
+    print(f"{'Início':<20} {'Ferramenta':<20} {'Total (s)':>10} {'Reg/s':>9} {'Pág/s':>9} {'p95 reg (ms)':>13}  Entrada")
+    print("-" * 110)
+    for caminho in caminhos:
+        with open(caminho, encoding='utf-8') as arquivo:
+            relatorio = json.load(arquivo)
+        vazao = relatorio.get("vazao", {})
+        p95 = relatorio.get("distribuicoes", {}).get("registro", {}).get("p95_ms")
+        print(
+            f"{relatorio['inicio']:<20} {relatorio['ferramenta']:<20} {relatorio['total_s']:>10.2f} "
+            f"{vazao.get('registros_por_s', 0):>9.1f} {vazao.get('paginas_por_s', 0):>9.1f} "
+            f"{p95 if p95 is not None else '-':>13}  {os.path.basename(relatorio.get('entrada') or '')}"
+        )
+
+
+if __name__ == "__main__":
+    main()
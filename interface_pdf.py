@@ -0,0 +1,229 @@
+# Interface gráfica do extrator de PDF. Importada só por main.py depois da
+# proteção do entry point: os workers do pool não carregam a interface.
+import customtkinter as ctk
+from tkinter import filedialog, messagebox
+import os
+import threading
+import concurrent.futures
+import time
+from backends_pdf import BACKENDS, BACKEND_PADRAO
+from template_pdf import carregar_template
+from pipeline_pdf import ProcessadorPDF, criar_escritor, colunas_saida, EXTENSOES
+from fila_ui import FilaUI, ConsoleLimitado
+
+# Configuração do tema
+ctk.set_appearance_mode("System")
+ctk.set_default_color_theme("dark-blue")
+
+# ==============================
+# CLASSE DA INTERFACE
+# ==============================
+class App(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+        self.VERSION = "v1.3 (Debug)"
+        self.title(f"Extrator de Ficha de Registro - Premium {self.VERSION}")
+        self.geometry("600x600") # Aumentei altura para caber o log
+        self.resizable(True, True) # Permitir redimensionar para ver logs
+        self.create_widgets()
+
+        # Pool de extração persistente: criado uma vez e reutilizado entre execuções.
+        # Os processos sobem logo após a janela aparecer, enquanto o usuário escolhe o PDF.
+        self.processador = ProcessadorPDF(log=self.log, status=self.update_status)
+        self.after(200, self.processador.aquecer_pool)
+        self.protocol("WM_DELETE_WINDOW", self.fechar)
+
+    def create_widgets(self):
+        self.label_title = ctk.CTkLabel(self, text=f"Extrator de PDF {self.VERSION}", font=ctk.CTkFont(size=24, weight="bold"))
+        self.label_title.pack(pady=(20, 5))
+
+        self.label_subtitle = ctk.CTkLabel(self, text="Modo Debug Ativado", text_color="#FFAA00", font=ctk.CTkFont(size=12, weight="bold"))
+        self.label_subtitle.pack(pady=(0, 10))
+
+        self.frame_options = ctk.CTkFrame(self)
+        self.frame_options.pack(pady=5, padx=20, fill="x")
+
+        self.label_format = ctk.CTkLabel(self.frame_options, text="Formato de Saída:", font=ctk.CTkFont(size=14, weight="bold"))
+        self.label_format.pack(pady=(10, 5))
+
+        self.formato_var = ctk.StringVar(value="Excel")
+        
+        self.radio_excel = ctk.CTkRadioButton(self.frame_options, text="Excel (.xlsx)", variable=self.formato_var, value="Excel")
+        self.radio_excel.pack(pady=5)
+        
+        self.radio_csv = ctk.CTkRadioButton(self.frame_options, text="CSV (;)", variable=self.formato_var, value="CSV")
+        self.radio_csv.pack(pady=5)
+        
+        self.radio_txt = ctk.CTkRadioButton(self.frame_options, text="TXT (|)", variable=self.formato_var, value="TXT")
+        self.radio_txt.pack(pady=5)
+
+        self.radio_parquet = ctk.CTkRadioButton(self.frame_options, text="Parquet (colunas tipadas)", variable=self.formato_var, value="Parquet")
+        self.radio_parquet.pack(pady=(5, 10))
+
+        # Leitura das páginas distribuída entre processos (PDFs com milhares de páginas)
+        self.leitura_paralela_var = ctk.BooleanVar(value=True)
+        self.check_paralelo = ctk.CTkCheckBox(self.frame_options, text="Leitura paralela de páginas", variable=self.leitura_paralela_var)
+        self.check_paralelo.pack(pady=(0, 10))
+
+        # Reaproveita o texto já extraído quando o mesmo PDF é processado de novo
+        self.usar_cache_var = ctk.BooleanVar(value=True)
+        self.check_cache = ctk.CTkCheckBox(self.frame_options, text="Usar cache de páginas", variable=self.usar_cache_var)
+        self.check_cache.pack(pady=(0, 10))
+
+        # Biblioteca usada para extrair o texto das páginas (ver comparar_backends.py)
+        self.label_backend = ctk.CTkLabel(self.frame_options, text="Leitor de PDF:")
+        self.label_backend.pack(pady=(0, 2))
+        self.backend_var = ctk.StringVar(value=BACKEND_PADRAO)
+        self.menu_backend = ctk.CTkOptionMenu(self.frame_options, values=list(BACKENDS), variable=self.backend_var)
+        self.menu_backend.pack(pady=(0, 10))
+
+        # Fichas de layout fixo: campos lidos por coordenadas definidas em um template JSON
+        self.usar_template_var = ctk.BooleanVar(value=False)
+        self.check_template = ctk.CTkCheckBox(self.frame_options, text="Usar template de coordenadas (JSON)", variable=self.usar_template_var)
+        self.check_template.pack(pady=(0, 10))
+
+        # CPF/PIS com dígito verificador, datas, salário e CEP padronizados antes da gravação
+        self.normalizar_var = ctk.BooleanVar(value=False)
+        self.check_normalizar = ctk.CTkCheckBox(self.frame_options, text="Normalizar e validar campos", variable=self.normalizar_var)
+        self.check_normalizar.pack(pady=(0, 10))
+
+        # Registros gravados na mesma ordem das fichas no PDF (sem ordenar depois)
+        self.saida_ordenada_var = ctk.BooleanVar(value=False)
+        self.check_ordenada = ctk.CTkCheckBox(self.frame_options, text="Manter a ordem do PDF na saída", variable=self.saida_ordenada_var)
+        self.check_ordenada.pack(pady=(0, 10))
+
+        self.btn_action = ctk.CTkButton(
+            self, 
+            text="Selecionar PDF e Iniciar", 
+            command=self.iniciar_thread,
+            height=40,
+            font=ctk.CTkFont(size=16, weight="bold")
+        )
+        self.btn_action.pack(pady=15, padx=20, fill="x")
+
+        self.progress_bar = ctk.CTkProgressBar(self, mode="determinate")
+        self.progress_bar.pack(pady=5, padx=20, fill="x")
+        self.progress_bar.set(0)
+
+        self.label_status = ctk.CTkLabel(self, text="Aguardando início...", text_color="gray")
+        self.label_status.pack(pady=(0, 5))
+        
+        # LOG CONSOLE
+        self.label_log = ctk.CTkLabel(self, text="Console de Execução (Bastidores):", font=ctk.CTkFont(size=12, weight="bold"))
+        self.label_log.pack(pady=(5, 0), padx=20, anchor="w")
+        
+        self.log_box = ctk.CTkTextbox(self, height=150, font=ctk.CTkFont(family="Consolas", size=12))
+        self.log_box.pack(pady=5, padx=20, fill="both", expand=True)
+        self.log_box.configure(state="disabled")
+
+        # Log, status e progresso chegam das threads por esta fila (console com até 2000 linhas)
+        self.console = ConsoleLimitado(self.log_box, somente_leitura=True)
+        self.ui = FilaUI(self, self.console)
+        self.ui.iniciar()
+
+    def fechar(self):
+        self.ui.parar()
+        self.processador.descartar_executor()
+        self.destroy()
+
+    def log(self, mensagem):
+        # Pode ser chamado de qualquer thread: a linha vai para a fila e o console
+        # é atualizado pelo mainloop (ver fila_ui.py)
+        timestamp = time.strftime("%H:%M:%S")
+        texto_log = f"[{timestamp}] {mensagem}\n"
+        self.ui.log((texto_log, None))
+        print(texto_log.strip()) # Também imprime no terminal
+
+    def iniciar_thread(self):
+        self.btn_action.configure(state="disabled")
+        self.console.limpar()
+
+        # Diálogos e opções são lidos aqui, na thread do Tk; a thread de trabalho só processa
+        parametros = self.escolher_arquivos()
+        if parametros is None:
+            self.btn_action.configure(state="normal")
+            return
+
+        thread = threading.Thread(target=self.executar_processo, args=parametros)
+        thread.start()
+
+    def update_status(self, message, progress=None):
+        # Vários status no mesmo quadro: só o último é desenhado
+        self.ui.definir("status", self.label_status.configure, text=message)
+        if progress is not None:
+            self.ui.definir("progresso", self.progress_bar.set, progress)
+
+    def escolher_arquivos(self):
+        # Retorna (pdf, destino, formato, template) ou None se o usuário cancelar
+        pdf_path = filedialog.askopenfilename(title="Selecionar PDF", filetypes=[("Arquivos PDF", "*.pdf")])
+        if not pdf_path:
+            self.log("Seleção de arquivo cancelada.")
+            return None
+
+        self.log(f"Arquivo selecionado: {os.path.basename(pdf_path)}")
+
+        template = None
+        if self.usar_template_var.get():
+            template_path = filedialog.askopenfilename(title="Selecionar Template", filetypes=[("Template JSON", "*.json")])
+            if not template_path:
+                self.log("Seleção de template cancelada.")
+                return None
+            try:
+                template = carregar_template(template_path)
+            except Exception as e:
+                self.log(f"ERRO no template {os.path.basename(template_path)}: {e}")
+                messagebox.showerror("Template inválido", str(e))
+                return None
+            self.log(f"Template carregado: {os.path.basename(template_path)} ({len(template['campos'])} campos)")
+
+        formato = self.formato_var.get()
+        extensao = EXTENSOES[formato]
+
+        self.processador.backend = self.backend_var.get()
+        self.processador.usar_cache = self.usar_cache_var.get()
+        self.processador.leitura_paralela = self.leitura_paralela_var.get()
+        self.processador.normalizar = self.normalizar_var.get()
+        self.processador.saida_ordenada = self.saida_ordenada_var.get()
+
+        # O destino é escolhido antes: cada lote é gravado assim que termina
+        save_path = filedialog.asksaveasfilename(defaultextension=extensao, filetypes=[("Arquivo", "*" + extensao)])
+        if not save_path:
+            self.log("Salvamento cancelado pelo usuário.")
+            return None
+        return pdf_path, save_path, formato, template
+
+    def executar_processo(self, pdf_path, save_path, formato, template):
+        # Thread de trabalho: nenhum widget é tocado aqui, só a fila da interface
+        try:
+            self.executar_em_fluxo(pdf_path, save_path, formato, template)
+
+        except Exception as e:
+            if isinstance(e, concurrent.futures.BrokenExecutor):
+                self.processador.descartar_executor()
+            self.log(f"ERRO CRÍTICO NO PROCESSO PRINCIPAL: {e}")
+            self.ui.chamar(messagebox.showerror, "Erro Crítico", f"Ocorreu um erro:\n{str(e)}")
+        
+        finally:
+            self.ui.chamar(self.btn_action.configure, state="normal")
+
+    def executar_em_fluxo(self, pdf_path, save_path, formato, template):
+        self.log("Iniciando leitura do PDF (exportação em fluxo)...")
+        self.update_status("Lendo PDF...", 0.05)
+
+        escritor = criar_escritor(save_path, formato, colunas_saida(template, self.processador.normalizar))
+        try:
+            total = self.processador.processar_pdf_em_fluxo(pdf_path, escritor, template)
+        finally:
+            with self.processador.instrumentacao.medir("exportacao"):
+                escritor.fechar()
+
+        if not total:
+            # Só o cabeçalho foi gravado: não deixa um arquivo vazio para trás
+            os.remove(save_path)
+            self.log("Nenhum dado foi extraído ou ocorreu erro fatal.")
+            return
+
+        self.log(f"Arquivo salvo com sucesso em: {save_path} ({total} registros)")
+        self.processador.salvar_relatorio()
+        self.update_status("Concluído!", 1.0)
+        self.ui.chamar(messagebox.showinfo, "Sucesso", "Processso finalizado com sucesso!")
@@ -0,0 +1,249 @@
+"""
+Layout aprendido das fichas Word (posição de cada campo nas tabelas)
+
+As fichas saem todas do mesmo sistema de folha, então cada campo fica sempre na
+mesma célula (tabela, linha, coluna). No modo layout, os primeiros documentos
+passam pela varredura completa (todas as células contra todos os labels) e as
+células de cada campo vão para um template JSON; nos documentos seguintes só
+essas células são lidas (com o leitor xml, a leitura do documento para logo
+depois da última delas).
+
+Cada campo guarda, na ordem do documento, as células em que o label apareceu até
+a que deu o valor, com a regra de cada uma:
+- metodo 1: a célula é "Label\\nValor"
+- metodo 2: o label aparece dentro do texto da célula e o valor vem depois dele
+
+Células em que o label apareceu sem valor (campos opcionais como data de rescisão
+ou tipo de deficiência) também entram, com "vazio": true enquanto nenhum documento
+do aprendizado trouxer valor nelas. Na leitura vale a primeira célula com valor,
+como na varredura completa; com o label em todas e sem valor, o campo fica de fora.
+
+Se alguma célula do template não tiver mais o label esperado, o documento
+inteiro passa pela varredura completa, com o mesmo resultado de sempre. Campos
+cujo label não apareceu em nenhum documento do aprendizado não são procurados nos
+documentos lidos pelo layout (obter_layout avisa quais são): aprenda com outras
+fichas, ou apague o template para aprender de novo.
+
+Formato (um arquivo por conjunto de regras, no diretório processado):
+
+    {
+        "versao": 2,
+        "regras": "word-lote",
+        "documentos": 3,
+        "campos": {
+            "cpf": [{"label": "CPF", "tabela": 0, "linha": 4, "coluna": 1, "metodo": 1}],
+            "data_rescisao": [{"label": "Data rescisão", "tabela": 0, "linha": 9, "coluna": 2,
+                               "metodo": 1, "vazio": true}]
+        }
+    }
+"""
+
+import os
+import json
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+VERSAO_LAYOUT = 2
+# Documentos lidos com a varredura completa antes de o template ser gravado
+DOCUMENTOS_APRENDIZADO = 3
+
+
+def caminho_layout(diretorio: str, regras: str) -> str:
+    """Template padrão de um diretório (um por ferramenta: as regras de extração diferem)"""
+    return os.path.join(diretorio, f"layout_{regras}.json")
+
+
+def novo_layout(regras: str) -> Dict:
+    return {"versao": VERSAO_LAYOUT, "regras": regras, "documentos": 0, "campos": {}}
+
+
+def carregar_layout(caminho: str, regras: str) -> Dict:
+    """
+    Lê e valida um template de layout
+
+    Raises:
+        ValueError: se o template não tiver o formato esperado ou for de outras regras
+    """
+    with open(caminho, 'r', encoding='utf-8') as f:
+        layout = json.load(f)
+
+    if not isinstance(layout, dict) or layout.get("versao") != VERSAO_LAYOUT:
+        raise ValueError(f"Layout sem a versão {VERSAO_LAYOUT}")
+    if layout.get("regras") != regras:
+        raise ValueError(f"Layout de outra ferramenta ({layout.get('regras')}, esperado {regras})")
+    campos = layout.get("campos")
+    if not isinstance(campos, dict) or not campos:
+        raise ValueError("Layout sem a seção 'campos'")
+    for campo, posicoes in campos.items():
+        if not isinstance(posicoes, list) or not posicoes:
+            raise ValueError(f"Campo '{campo}': deve ser uma lista de posições")
+        for posicao in posicoes:
+            if not isinstance(posicao, dict) or not isinstance(posicao.get("label"), str) or not posicao["label"]:
+                raise ValueError(f"Campo '{campo}': 'label' ausente")
+            for chave in ("tabela", "linha", "coluna"):
+                if not isinstance(posicao.get(chave), int) or posicao[chave] < 0:
+                    raise ValueError(f"Campo '{campo}': '{chave}' deve ser um inteiro não negativo")
+            if posicao.get("metodo") not in (1, 2):
+                raise ValueError(f"Campo '{campo}': 'metodo' deve ser 1 ou 2")
+    return layout
+
+
+def salvar_layout(layout: Dict, caminho: str):
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(layout, f, ensure_ascii=False, indent=2)
+
+
+def celula(posicao: Dict) -> Tuple[int, int, int]:
+    return posicao["tabela"], posicao["linha"], posicao["coluna"]
+
+
+def aprender(layout: Dict, origens: Dict[str, List[Tuple[str, int, int, int, int, bool]]]):
+    """
+    Acrescenta ao layout as posições de um documento
+
+    Args:
+        origens: {campo: [(label, tabela, linha, coluna, método, vazio), ...]}, preenchido
+                 pela varredura completa com as células em que o label apareceu até a
+                 do valor; vazio indica label sem valor. Numa célula já conhecida, a
+                 regra de um valor substitui a de um label vazio
+    """
+    for campo, ocorrencias in origens.items():
+        posicoes = layout["campos"].setdefault(campo, [])
+        for label, tabela, linha, coluna, metodo, vazio in ocorrencias:
+            conhecida = next((posicao for posicao in posicoes
+                              if celula(posicao) == (tabela, linha, coluna)), None)
+            if conhecida is not None and (vazio or not conhecida.get("vazio")):
+                continue
+            posicao = {"label": label, "tabela": tabela, "linha": linha, "coluna": coluna, "metodo": metodo}
+            if vazio:
+                posicao["vazio"] = True
+            if conhecida is not None:
+                posicoes.remove(conhecida)
+            posicoes.append(posicao)
+        posicoes.sort(key=celula)
+    layout["documentos"] += 1
+
+
+def campos_ausentes(layout: Dict, campos: Iterable[str]) -> List[str]:
+    """Campos das regras sem posição no layout (não lidos nos documentos do modo layout)"""
+    return sorted(set(campos) - set(layout["campos"]))
+
+
+def valor_celula(texto: str, label: str, metodo: int) -> Optional[str]:
+    """
+    Valor do campo numa célula (texto já sem espaços nas pontas) pela regra do método
+
+    Returns:
+        O valor, '' se o label estiver na célula sem valor, ou None se a célula não
+        tiver o label (layout diferente)
+    """
+    if metodo == 1:
+        if '\n' not in texto:
+            return '' if texto == label else None
+        primeira, resto = texto.split('\n', 1)
+        if primeira.strip() != label:
+            return None
+        return resto.strip()
+    posicao = texto.find(label)
+    if posicao < 0:
+        return None
+    return texto[posicao + len(label):].strip().strip('\n').strip()
+
+
+def extrair_por_layout(celulas: Iterator, layout: Dict) -> Tuple[Optional[Dict[str, str]], List]:
+    """
+    Lê só as células do layout
+
+    Args:
+        celulas: Iterador de tabelas_docx.iterar_celulas
+        layout: Template carregado ou aprendido
+
+    Returns:
+        (dados, lidas): dados é None se alguma célula não casar com o layout (campo
+        com o label e sem valor em todas as células fica de fora); lidas
+        são as células já consumidas do iterador, para a varredura completa
+        recomeçar delas (itertools.chain(lidas, celulas))
+    """
+    campos = layout["campos"]
+    posicoes = {celula(posicao) for posicoes in campos.values() for posicao in posicoes}
+    ultima = max((tabela, linha) for tabela, linha, _ in posicoes)
+    textos = {}
+    lidas = []
+    for lida in celulas:
+        lidas.append(lida)
+        tabela, linha, coluna, texto = lida
+        if (tabela, linha) > ultima:
+            break
+        if (tabela, linha, coluna) in posicoes:
+            textos[(tabela, linha, coluna)] = texto.strip()
+
+    dados = {}
+    for campo, posicoes in campos.items():
+        # A primeira célula com valor, como na varredura completa
+        for posicao in posicoes:
+            texto = textos.get(celula(posicao))
+            valor = None if texto is None else valor_celula(texto, posicao["label"], posicao["metodo"])
+            if valor is None:
+                return None, lidas
+            if valor:
+                dados[campo] = valor
+                break
+    return dados, lidas
+
+
+def obter_layout(caminho: str, regras: str, arquivos: Sequence, extrair: Callable,
+                 campos: Iterable[str] = (), avisar: Callable = print) -> Tuple[Optional[Dict], List[Dict[str, str]]]:
+    """
+    Carrega o template do caminho ou, sem ele, aprende com os primeiros arquivos e grava
+
+    Args:
+        caminho: Arquivo do template
+        regras: Ferramenta dona das regras de extração (ex.: "word-lote")
+        arquivos: Arquivos do lote, na ordem de processamento (ordenados pelo nome, para o
+                  template não depender da ordem em que o sistema de arquivos os lista)
+        extrair: Varredura completa de um arquivo, extrair(indice, arquivo, origens) -> dados,
+                 que preenche origens (ver aprender)
+        campos: Todos os campos das regras, para avisar dos que ficaram sem posição
+        avisar: Função de log
+
+    Returns:
+        (layout ou None, dados dos arquivos usados no aprendizado, na ordem); o lote
+        continua de arquivos[len(dados):]
+    """
+    if os.path.exists(caminho):
+        try:
+            layout = carregar_layout(caminho, regras)
+        except (OSError, ValueError) as e:
+            avisar(f"⚠️ Layout ignorado ({e}); aprendendo de novo")
+        else:
+            avisar(f"📐 Layout carregado: {len(layout['campos'])} campos ({os.path.basename(caminho)})")
+            avisar_ausentes(layout, campos, avisar)
+            return layout, []
+
+    layout = novo_layout(regras)
+    resultados = []
+    for indice, arquivo in enumerate(arquivos[:DOCUMENTOS_APRENDIZADO]):
+        origens = {}
+        dados = extrair(indice, arquivo, origens)
+        resultados.append(dados)
+        if 'erro' not in dados:
+            aprender(layout, origens)
+
+    if not layout["campos"]:
+        avisar("⚠️ Nenhum campo encontrado para aprender o layout; seguindo com a varredura completa")
+        return None, resultados
+    try:
+        salvar_layout(layout, caminho)
+    except OSError as e:
+        avisar(f"⚠️ Layout não gravado: {e}")
+    else:
+        avisar(f"📐 Layout aprendido com {layout['documentos']} documento(s): "
+               f"{len(layout['campos'])} campos ({os.path.basename(caminho)})")
+    avisar_ausentes(layout, campos, avisar)
+    return layout, resultados
+
+
+def avisar_ausentes(layout: Dict, campos: Iterable[str], avisar: Callable = print):
+    ausentes = campos_ausentes(layout, campos)
+    if ausentes:
+        avisar(f"⚠️ Campos sem label nos documentos do aprendizado (ficam vazios nos lidos pelo layout): "
+               f"{', '.join(ausentes)}")
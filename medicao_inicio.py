@@ -0,0 +1,114 @@
+"""
+Medição do tempo de inicialização das ferramentas
+
+Cada ponto de entrada importa este módulo antes de qualquer outro, então
+INICIO marca o começo da importação do programa. Com --medir-inicio na linha
+de comando, a ferramenta imprime quanto tempo levou até a janela aparecer (na
+linha de comando, até o pipeline estar importado) e encerra em seguida. Para
+medir todas as ferramentas de uma vez, incluindo a subida do interpretador:
+
+    python medicao_inicio.py [-n 5]
+"""
+
+import sys
+import time
+
+INICIO = time.perf_counter()
+
+FLAG = "--medir-inicio"
+MARCADOR = "TEMPO_INICIO_MS="
+
+PONTOS_DE_ENTRADA = [
+    "main.py",
+    "extrator_word_gui.py",
+    "extrator_word_arquivo_unico.py",
+    "extrair_word_batch.py",
+    "extrator_pdf_cli.py",
+]
+
+
+def medindo() -> bool:
+    return FLAG in sys.argv
+
+
+def informar_pronto():
+    """Imprime o tempo desde o início da importação (só no modo --medir-inicio)"""
+    if medindo():
+        print(f"{MARCADOR}{(time.perf_counter() - INICIO) * 1000:.1f}", flush=True)
+
+
+def agendar_medicao(janela):
+    """
+    No modo --medir-inicio, mede quando a janela termina de ser desenhada e a fecha
+
+    Returns:
+        True se a medição foi agendada (o chamador não deve iniciar trabalho em segundo plano)
+    """
+    if not medindo():
+        return False
+
+    def finalizar():
+        janela.update_idletasks()
+        informar_pronto()
+        janela.destroy()
+
+    janela.after(1, finalizar)
+    return True
+
+
+def importar_em_segundo_plano(*modulos):
+    """
+    Carrega bibliotecas pesadas numa thread enquanto o usuário usa a janela
+
+    O primeiro processamento encontra os módulos já importados; se ele começar antes,
+    o lock de importação do Python faz a thread principal aguardar a importação em curso.
+    """
+    import importlib
+    import threading
+
+    def importar():
+        for modulo in modulos:
+            try:
+                importlib.import_module(modulo)
+            except ImportError:
+                pass  # O erro aparece com a mensagem certa quando o módulo for usado
+
+    threading.Thread(target=importar, daemon=True).start()
+
+
+def main():
+    import argparse
+    import os
+    import statistics
+    import subprocess
+
+    parser = argparse.ArgumentParser(description="Mede o tempo até a janela de cada ferramenta aparecer")
+    parser.add_argument("-n", "--repeticoes", type=int, default=3, help="Execuções por ferramenta (usa a mediana)")
+    parser.add_argument("scripts", nargs="*", default=PONTOS_DE_ENTRADA, help="Pontos de entrada a medir")
+    args = parser.parse_args()
+
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+    print(f"{'Ferramenta':<34} {'Processo (ms)':>14} {'Importação+janela (ms)':>23}")
+    print("-" * 73)
+    for script in args.scripts:
+        totais = []
+        internos = []
+        for _ in range(args.repeticoes):
+            t0 = time.perf_counter()
+            resultado = subprocess.run(
+                [sys.executable, os.path.join(diretorio, script), FLAG],
+                capture_output=True, text=True, cwd=diretorio
+            )
+            totais.append((time.perf_counter() - t0) * 1000)
+            for linha in resultado.stdout.splitlines():
+                if linha.startswith(MARCADOR):
+                    internos.append(float(linha[len(MARCADOR):]))
+        if not internos:
+            erro = (resultado.stderr.strip().splitlines() or ["sem saída"])[-1]
+            print(f"{script:<34} {'falhou':>14}   {erro}")
+            continue
+        print(f"{script:<34} {statistics.median(totais):>14.0f} {statistics.median(internos):>23.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Normalização e validação dos registros extraídos
+
+Etapa entre a extração e a exportação. Em cada lote de registros, as colunas
+com regra viram Series e as regras rodam sobre a coluna inteira (pandas/NumPy),
+em vez de campo a campo em Python:
+
+- CPF e PIS: dígitos verificadores calculados sobre uma matriz de dígitos
+  (uma linha por registro) e formatação padrão (000.000.000-00, 000.00000.00-0)
+- Datas: dd/mm/aaaa com dia, mês e ano válidos, sempre com dois dígitos
+- Valores em R$: "1.234,56" -> 1234.56 (número)
+- CEP: oito dígitos, formatado como 00000-000
+
+Valores vazios não são validados. Um valor que não passa na regra fica como foi
+extraído e o nome do campo vai para a coluna de campos inválidos do registro
+(vazia quando está tudo certo). O pandas só é importado na primeira normalização.
+"""
+
+from typing import Dict, List
+
+# Colunas com a lista de campos que não passaram na validação
+COLUNA_INVALIDOS_PDF = "Campos_Invalidos"
+COLUNA_INVALIDOS_DOCX = "campos_invalidos"
+
+REGRAS_PDF = {
+    'CPF': "cpf",
+    'PIS': "pis",
+    'CEP': "cep",
+    'Salario': "valor",
+    **dict.fromkeys([
+        'Data_Nascimento', 'Data_Emissao_RG', 'Data_Admissao', 'Data_Rescisao',
+        'Data_Opcao_FGTS', 'Data_Registro'
+    ], "data"),
+}
+
+REGRAS_DOCX = {
+    'cpf': "cpf",
+    'pis': "pis",
+    'cep': "cep",
+    **dict.fromkeys(['salario_inicial', 'saldo_fgts', 'maior_remuneracao'], "valor"),
+    **dict.fromkeys([
+        'data_nascimento', 'data_emissao_rg', 'data_cadastramento_pis', 'data_admissao',
+        'data_registro', 'data_opcao_fgts', 'data_rescisao'
+    ], "data"),
+}
+
+# Pesos dos dígitos verificadores
+PESOS_CPF_1 = list(range(10, 1, -1))
+PESOS_CPF_2 = list(range(11, 1, -1))
+PESOS_PIS = [3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+
+# Dias de cada mês (índice 0 = mês inválido) em ano não bissexto
+DIAS_NO_MES = [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+
+
+def _texto(serie):
+    # Coluna como texto sem espaços nas pontas; ausentes viram ""
+    return serie.fillna('').astype(str).str.strip()
+
+
+def _matriz_digitos(digitos, tamanho):
+    # Série de strings só com dígitos (todas do mesmo tamanho) -> matriz n x tamanho de inteiros
+    import numpy as np
+    bruto = ''.join(digitos).encode('ascii')
+    return (np.frombuffer(bruto, dtype=np.uint8).reshape(-1, tamanho) - ord('0')).astype(np.int64)
+
+
+def _digito_modulo_11(matriz, pesos):
+    # Dígito verificador módulo 11: resto < 2 -> 0, senão 11 - resto
+    import numpy as np
+    resto = (matriz[:, :len(pesos)] @ np.array(pesos)) % 11
+    return np.where(resto < 2, 0, 11 - resto)
+
+
+def _validar_documento(serie, tamanho, verificar, formato):
+    # Regra comum de CPF/PIS: só dígitos, tamanho certo, verificadores conferem
+    import numpy as np
+    texto = _texto(serie)
+    digitos = texto.str.replace(r'\D', '', regex=True)
+    candidatos = digitos.str.len() == tamanho
+    valido = np.zeros(len(serie), dtype=bool)
+    if candidatos.any():
+        matriz = _matriz_digitos(digitos[candidatos], tamanho)
+        # Sequências repetidas (111.111.111-11) passam na conta, mas não existem
+        repetido = (matriz == matriz[:, :1]).all(axis=1)
+        valido[candidatos.to_numpy()] = verificar(matriz) & ~repetido
+    formatado = digitos.str.replace(formato[0], formato[1], regex=True)
+    return formatado.where(valido, serie), ~valido & (texto != '')
+
+
+def normalizar_cpf(serie):
+    def verificar(m):
+        dv1 = _digito_modulo_11(m, PESOS_CPF_1)
+        dv2 = _digito_modulo_11(m, PESOS_CPF_2)  # Os 10 primeiros dígitos já incluem o dv1
+        return (dv1 == m[:, 9]) & (dv2 == m[:, 10])
+    return _validar_documento(serie, 11, verificar, (r'^(\d{3})(\d{3})(\d{3})(\d{2})$', r'\1.\2.\3-\4'))
+
+
+def normalizar_pis(serie):
+    def verificar(m):
+        return _digito_modulo_11(m, PESOS_PIS) == m[:, 10]
+    return _validar_documento(serie, 11, verificar, (r'^(\d{3})(\d{5})(\d{2})(\d)$', r'\1.\2.\3-\4'))
+
+
+def normalizar_cep(serie):
+    texto = _texto(serie)
+    digitos = texto.str.replace(r'\D', '', regex=True)
+    valido = digitos.str.len() == 8
+    formatado = digitos.str.replace(r'^(\d{5})(\d{3})$', r'\1-\2', regex=True)
+    return formatado.where(valido, serie), ~valido & (texto != '')
+
+
+def normalizar_data(serie):
+    # Calendário conferido com NumPy (mês 1-12, dia até o fim do mês, ano bissexto)
+    import numpy as np
+    texto = _texto(serie)
+    partes = texto.str.extract(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+    dia, mes, ano = (partes[i].fillna('0').astype(int).to_numpy() for i in range(3))
+    bissexto = (ano % 4 == 0) & ((ano % 100 != 0) | (ano % 400 == 0))
+    ultimo_dia = np.array(DIAS_NO_MES)[np.clip(mes, 0, 12)] + (bissexto & (mes == 2))
+    valido = (mes >= 1) & (mes <= 12) & (dia >= 1) & (dia <= ultimo_dia) & (ano >= 1900)
+    formatado = partes[0].str.zfill(2) + '/' + partes[1].str.zfill(2) + '/' + partes[2]
+    return formatado.where(valido, serie), ~valido & (texto != '')
+
+
+def normalizar_valor(serie):
+    import pandas as pd
+    texto = _texto(serie)
+    numero = texto.str.extract(r'(\d[\d.]*(?:,\d+)?)', expand=False)
+    numero = numero.str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+    valores = pd.to_numeric(numero, errors='coerce').round(2)
+    valido = valores.notna()
+    return valores.astype(object).where(valido, serie), ~valido & (texto != '')
+
+
+NORMALIZADORES = {
+    "cpf": normalizar_cpf,
+    "pis": normalizar_pis,
+    "cep": normalizar_cep,
+    "data": normalizar_data,
+    "valor": normalizar_valor,
+}
+
+
+def normalizar_registros(registros: List[Dict[str, str]], regras: Dict[str, str],
+                         coluna_invalidos: str) -> List[Dict[str, str]]:
+    """
+    Normaliza um lote de registros e marca os campos inválidos
+
+    Args:
+        registros: Lote de dicionários vindos da extração
+        regras: Regra de cada coluna (REGRAS_PDF ou REGRAS_DOCX); colunas fora dela não mudam
+        coluna_invalidos: Coluna acrescentada com os campos inválidos de cada registro
+
+    Returns:
+        Novo lote, com as mesmas colunas mais coluna_invalidos
+    """
+    if not registros:
+        return registros
+    import numpy as np
+    import pandas as pd
+
+    # Só as colunas com regra viram Series; os registros são copiados e atualizados
+    normalizados = [dict(registro) for registro in registros]
+    presentes = set().union(*registros)
+    invalidos = np.full(len(registros), '', dtype=object)
+    for coluna, regra in regras.items():
+        if coluna not in presentes:
+            continue
+        serie = pd.Series([registro.get(coluna) for registro in registros], dtype=object)
+        valores, invalido = NORMALIZADORES[regra](serie)
+        valores = valores.astype(object)
+        valores = valores.where(valores.notna(), None)  # NaN volta a ser campo vazio
+        for registro, valor in zip(normalizados, valores.tolist()):
+            if coluna in registro:
+                registro[coluna] = valor
+        invalidos = invalidos + np.where(invalido.to_numpy(), coluna + ', ', '')
+
+    for registro, campos in zip(normalizados, invalidos):
+        registro[coluna_invalidos] = campos[:-2]
+    return normalizados
+
+
+def contar_invalidos(registros: List[Dict[str, str]], coluna_invalidos: str) -> int:
+    """Registros com pelo menos um campo inválido"""
+    return sum(1 for registro in registros if registro.get(coluna_invalidos))
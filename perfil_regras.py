@@ -0,0 +1,55 @@
+"""
+Perfil das regras de extração de extrair_campos
+
+Modo opcional (--perfil-regras na linha de comando): cada regra nomeada de
+extracao_pdf.REGRAS, a busca dos labels e cada label de CAMPOS_SIMPLES acumulam
+o número de execuções, quantas acharam alguma coisa e o tempo gasto. Os workers
+medem cada lote e devolvem os contadores junto com o resultado; o processo
+principal soma tudo e mostra uma tabela ordenada pelo tempo total, para achar as
+regras caras (candidatas a reescrita) e as que nunca acertam (candidatas a sair).
+
+Com o modo desligado, o custo é uma comparação com None por regra executada.
+"""
+
+from typing import Dict, List
+
+
+class PerfilRegras:
+    """Contadores por regra: {nome: [execuções, acertos, segundos]}"""
+
+    def __init__(self):
+        self.regras = {}
+
+    def registrar(self, nome: str, segundos: float, acertou: bool):
+        contador = self.regras.get(nome)
+        if contador is None:
+            contador = self.regras[nome] = [0, 0, 0.0]
+        contador[0] += 1
+        contador[1] += acertou
+        contador[2] += segundos
+
+    def somar(self, regras: Dict[str, list]):
+        """Acumula os contadores de outro perfil (ex.: os devolvidos por um worker)"""
+        for nome, (execucoes, acertos, segundos) in regras.items():
+            contador = self.regras.get(nome)
+            if contador is None:
+                contador = self.regras[nome] = [0, 0, 0.0]
+            contador[0] += execucoes
+            contador[1] += acertos
+            contador[2] += segundos
+
+    def tabela(self) -> List[str]:
+        """Linhas da tabela, da regra que mais consumiu tempo para a que menos consumiu"""
+        total = sum(segundos for _, _, segundos in self.regras.values()) or 1.0
+        linhas = [
+            f"{'Regra':<40} {'Execuções':>10} {'Acertos':>9} {'Falhas':>9} {'Total ms':>10} {'µs/exec':>9} {'% tempo':>8}",
+            "-" * 101,
+        ]
+        ordenadas = sorted(self.regras.items(), key=lambda item: item[1][2], reverse=True)
+        for nome, (execucoes, acertos, segundos) in ordenadas:
+            nota = "  (nunca acertou)" if not acertos else ""
+            linhas.append(
+                f"{nome[:40]:<40} {execucoes:>10} {acertos:>9} {execucoes - acertos:>9} "
+                f"{segundos * 1000:>10.1f} {segundos / execucoes * 1e6:>9.1f} {segundos / total * 100:>7.1f}%{nota}"
+            )
+        return linhas
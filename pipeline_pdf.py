@@ -0,0 +1,647 @@
+"""
+Pipeline de extração das fichas em PDF (sem interface gráfica)
+
+Leitura das páginas, separação das fichas e extração dos campos no pool de
+processos, usado tanto pela interface (main.py) quanto pela linha de comando
+(extrator_pdf_cli.py). O progresso é informado por callbacks de log e status;
+este módulo não importa tkinter nem customtkinter. Os registros vão direto
+para o escritor de saída, lote a lote (processar_pdf_em_fluxo); o pandas só é
+importado na normalização, para não atrasar a abertura da janela.
+"""
+
+import os
+import json
+import time
+import queue
+import contextlib
+import multiprocessing
+import concurrent.futures
+
+from extracao_pdf import (
+    extrair_campos_lote, extrair_texto_paginas, dividir_paginas, calcular_tamanho_lote,
+    inicializar_worker, aquecer_worker, SeparadorFuncionarios,
+    PAGINAS_MINIMAS_PARALELO, TAMANHO_LOTE, COLUNAS_PDF,
+    TEMPO_LIMITE_REGISTRO, LIMITE_NO_WORKER
+)
+from cache_paginas import CachePaginas, calcular_hash, diretorio_padrao
+from backends_pdf import BACKEND_PADRAO, obter_backend
+from template_pdf import extrair_fichas_template, dividir_fichas
+from exportacao import criar_escritor as _criar_escritor, TIPOS_PARQUET_PDF
+from instrumentacao import Instrumentacao
+from perfil_regras import PerfilRegras
+from normalizacao import normalizar_registros, contar_invalidos, REGRAS_PDF, COLUNA_INVALIDOS_PDF
+
+# Formatos de saída e extensões
+EXTENSOES = {"Excel": ".xlsx", "CSV": ".csv", "TXT": ".txt", "Parquet": ".parquet"}
+
+_FIM = object()
+
+
+def colunas_saida(template=None, normalizar=False):
+    # Esquema fixo da exportação em fluxo: campos do template ou todos os de extrair_campos,
+    # mais a coluna de campos inválidos quando a normalização está ligada
+    colunas = list(template['campos']) if template is not None else list(COLUNAS_PDF)
+    if normalizar:
+        colunas.append(COLUNA_INVALIDOS_PDF)
+    return colunas
+
+
+def criar_escritor(caminho, formato, colunas, valores_fixos=None):
+    # Escritor de saída com os tipos das colunas do PDF (usados no Parquet)
+    return _criar_escritor(caminho, formato, colunas, valores_fixos, TIPOS_PARQUET_PDF)
+
+
+class ProcessadorPDF:
+    def __init__(self, num_workers=None, log=None, status=None):
+        # Pool de extração persistente: criado uma vez e reutilizado entre execuções
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.executor = None
+        self.log = log or print
+        self.status = status or (lambda mensagem, progresso=None: None)
+
+        # Opções da execução
+        self.backend = BACKEND_PADRAO
+        self.usar_cache = True
+        self.leitura_paralela = True
+        self.tamanho_lote = TAMANHO_LOTE
+        # Normalização e validação (normalizacao.py): opcional, muda o formato de campos e colunas
+        self.normalizar = False
+        # Saída na ordem das fichas no PDF; o limite é em lotes (em voo + aguardando a vez)
+        self.saida_ordenada = False
+        self.limite_reordenacao = None
+        # Perfil das regras de extrair_campos (perfil_regras.py); perfil é o da última execução
+        self.perfil_regras = False
+        self.perfil = None
+        # Limite de tempo por registro (None = sem limite) e arquivo JSONL da quarentena
+        # dos registros que passam dele (None = arquivo novo em quarentena/ no diretório do cache)
+        self.tempo_limite_registro = TEMPO_LIMITE_REGISTRO
+        self.arquivo_quarentena = None
+        self.quarentena = None
+        self.caminho_quarentena = None
+        self.registros_quarentena = 0
+        # Lotes abandonados por passar do prazo (vigia no processo principal), início de
+        # execução de cada lote em andamento ({índice do 1º registro: (instante, pid)},
+        # avisado pelo worker na fila_inicio) e pids dos workers presos em lotes abandonados.
+        # execucao separa os avisos de uma execução dos da anterior (o pool é o mesmo).
+        self.lotes_abandonados = 0
+        self.inicio_lotes = {}
+        self.workers_presos = set()
+        self.fila_inicio = None
+        self.execucao = 0
+        # Processo à parte onde os registros de lotes abandonados são refeitos (ver extrair_isolado)
+        self.pool_isolado = None
+
+        # Medições da última execução (ver instrumentacao.py); tempos é o dicionário
+        # de segundos por etapa dela
+        self.instrumentacao = Instrumentacao("pdf")
+        self.tempos = self.instrumentacao.etapas
+        self.registros_extraidos = 0
+        self.registros_invalidos = 0
+
+        # Modo ordenado: lotes concluídos fora de ordem, pelo índice do 1º registro
+        self.reordenacao = {}
+        self.proximo_registro = 0
+
+    def obter_executor(self):
+        if self.executor is None:
+            self.fila_inicio = multiprocessing.Queue()
+            self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.num_workers, initializer=inicializar_worker,
+                                                                   initargs=(self.fila_inicio,))
+        return self.executor
+
+    def aquecer_pool(self):
+        executor = self.obter_executor()
+        for _ in range(self.num_workers):
+            executor.submit(aquecer_worker)
+
+    def descartar_executor(self, matar=False):
+        # Pool quebrado (worker morto) não aceita novas tarefas: a próxima execução cria outro.
+        # Com matar, encerra também os workers ainda ocupados (ex.: presos num lote abandonado).
+        if self.executor is not None:
+            if matar and hasattr(self.executor, "kill_workers"):  # Python 3.14+
+                self.executor.kill_workers()  # Também faz o shutdown
+            else:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                if matar:
+                    # Sem kill_workers, mata os workers que avisaram o início de um lote
+                    # abandonado (os demais saem com o shutdown); sem isso o worker preso
+                    # numa regra lenta seguraria a saída do programa. Só processos filhos
+                    # ainda vivos: um pid já encerrado pode ter sido reaproveitado.
+                    for processo in multiprocessing.active_children():
+                        if processo.pid in self.workers_presos:
+                            processo.kill()
+            self.workers_presos = set()
+            self.executor = None
+
+    def fechar(self):
+        self.encerrar_pool_isolado()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    def iniciar_instrumentacao(self, ferramenta, pdf_path, etapas):
+        self.instrumentacao = Instrumentacao(ferramenta, pdf_path, {
+            "backend": self.backend, "workers": self.num_workers, "tamanho_lote": self.tamanho_lote,
+            "cache": self.usar_cache, "leitura_paralela": self.leitura_paralela,
+            "normalizar": self.normalizar, "saida_ordenada": self.saida_ordenada,
+        })
+        self.tempos = self.instrumentacao.etapas
+        self.tempos.update(dict.fromkeys(etapas, 0.0))
+        return self.tempos
+
+    def salvar_relatorio(self, caminho=None):
+        # Fecha as medições (chamado depois que a saída foi gravada) e grava o relatório JSON.
+        # Retorna o caminho, ou None se não foi possível gravar.
+        self.instrumentacao.finalizar()
+        self.log(f"Desempenho: {self.instrumentacao.resumo()}")
+        try:
+            caminho = self.instrumentacao.salvar(caminho)
+        except OSError as e:
+            self.log(f"AVISO: relatório de desempenho não gravado ({e}).")
+            return None
+        self.log(f"Relatório de desempenho: {caminho}")
+        return caminho
+
+    def ler_paginas(self, backend, pdf_path, total_paginas):
+        # Leitura sequencial no próprio processo (PDFs pequenos ou modo paralelo desligado)
+        t = time.perf_counter()
+        for i, texto, erro in backend.iterar_paginas(pdf_path):
+            self.instrumentacao.registrar("pagina", [time.perf_counter() - t])
+            # Log detalhado a cada 10 páginas para não poluir
+            if i % 10 == 0:
+                self.log(f"Lendo página {i+1}/{total_paginas}...")
+
+            if erro is not None:
+                self.log(f"ERRO ao ler página {i+1}: {erro}")
+            else:
+                progresso = 0.05 + (0.5 * ((i + 1) / total_paginas))
+                self.status(f"Lendo página {i+1}...", progresso)
+
+            yield texto
+            t = time.perf_counter()
+
+    def ler_paginas_paralelo(self, executor, backend, pdf_path, total_paginas):
+        # Divide o intervalo de páginas entre processos e devolve os textos na ordem original.
+        # Mantém só alguns blocos em voo para que as fichas já separadas não fiquem
+        # presas na fila do pool atrás de toda a leitura.
+        num_workers = self.num_workers
+        intervalos = dividir_paginas(total_paginas, num_workers)
+        em_voo = {}
+        textos_por_bloco = {}
+        proximo_envio = 0
+        proximo_bloco = 0
+        paginas_lidas = 0
+
+        while proximo_bloco < len(intervalos):
+            while proximo_envio < len(intervalos) and len(em_voo) < num_workers * 2:
+                inicio, fim = intervalos[proximo_envio]
+                em_voo[executor.submit(extrair_texto_paginas, pdf_path, inicio, fim, backend.nome)] = proximo_envio
+                proximo_envio += 1
+
+            concluidos, _ = concurrent.futures.wait(em_voo, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in concluidos:
+                n = em_voo.pop(future)
+                inicio, fim = intervalos[n]
+                try:
+                    textos, erros, duracoes = future.result()
+                except Exception as exc:
+                    self.log(f"ERRO ao ler páginas {inicio+1}-{fim}: {exc}")
+                    textos, erros, duracoes = [None] * (fim - inicio), [], []
+
+                for i, erro in erros:
+                    self.log(f"ERRO ao ler página {i+1}: {erro}")
+                self.instrumentacao.registrar("pagina", duracoes)
+                self.instrumentacao.contar("erros", len(erros))
+
+                textos_por_bloco[n] = textos
+                paginas_lidas += fim - inicio
+                progresso = 0.05 + (0.5 * (paginas_lidas / total_paginas))
+                self.log(f"Lidas {paginas_lidas}/{total_paginas} páginas...")
+                self.status(f"Lendo páginas ({paginas_lidas}/{total_paginas})...", progresso)
+
+            # Entrega em ordem apenas os blocos contíguos já disponíveis
+            while proximo_bloco in textos_por_bloco:
+                yield from textos_por_bloco.pop(proximo_bloco)
+                proximo_bloco += 1
+
+    def coletar_resultados(self, pendentes, gravar, total=None):
+        # Sem total (leitura ainda em andamento): recolhe só os lotes já concluídos.
+        # Com total: aguarda todos os restantes. O progresso avança por lote.
+        # Cada lote concluído vai para gravar (lista em memória ou escritor em fluxo);
+        # no modo ordenado, só depois que todos os lotes anteriores foram gravados.
+        while True:
+            self.verificar_prazos(pendentes, gravar, total)
+            for future in [future for future in pendentes if future.done()]:
+                idx_inicial, tamanho, _ = pendentes.pop(future)
+                self.inicio_lotes.pop(idx_inicial, None)
+                try:
+                    resultado = future.result()
+                except Exception as exc:
+                    self.log(f"ERRO no lote de registros {idx_inicial}-{idx_inicial + tamanho - 1}: {exc}")
+                    self.instrumentacao.contar("erros", tamanho)
+                    # Lote perdido: no modo ordenado a vez dele ainda precisa passar
+                    resultado = [], [], [], None, []
+                self.receber_lote(idx_inicial, tamanho, resultado, gravar, total)
+
+            if total is None or not pendentes:
+                return
+            concurrent.futures.wait(pendentes, timeout=self.intervalo_vigia(), return_when=concurrent.futures.FIRST_COMPLETED)
+
+    def receber_lote(self, idx_inicial, tamanho, resultado, gravar, total):
+        dados_lote, erros, duracoes, perfil, quarentena = resultado
+        for posicao, erro in erros:
+            self.log(f"ERRO no registro {idx_inicial + posicao}: {erro}")
+        for posicao, texto in quarentena:
+            self.registrar_quarentena(idx_inicial + posicao, texto)
+        self.instrumentacao.registrar("registro", duracoes)
+        self.instrumentacao.contar("erros", len(erros))
+        if perfil is not None and self.perfil is not None:
+            self.perfil.somar(perfil)
+        if self.saida_ordenada:
+            self.reordenacao[idx_inicial] = (tamanho, dados_lote)
+            self.gravar_em_ordem(gravar)
+        else:
+            gravar(dados_lote)
+            self.registros_extraidos += len(dados_lote)
+
+        completed_count = self.registros_extraidos
+        if total is None:
+            self.log(f"Processado: {completed_count} registros...")
+        else:
+            progresso = 0.55 + (0.4 * (completed_count / total))
+            self.log(f"Processado: {completed_count}/{total} registros...")
+            self.status(f"Extraindo: {completed_count}/{total}", progresso)
+
+    def vigia_no_processo_principal(self):
+        # Sem SIGALRM nos workers, o limite por registro é vigiado daqui, lote a lote
+        return bool(self.tempo_limite_registro) and not LIMITE_NO_WORKER
+
+    def intervalo_vigia(self):
+        # Intervalo máximo das esperas pelo pool quando os prazos dos lotes são vigiados
+        if not self.vigia_no_processo_principal():
+            return None
+        return min(1.0, self.tempo_limite_registro / 4)
+
+    def verificar_prazos(self, pendentes, gravar, total=None):
+        # Um lote que passa do prazo (2x o limite por registro; lotes normais levam uma
+        # fração disso) é abandonado e os registros dele são refeitos um a um num processo
+        # à parte (extrair_isolado), onde o registro lento pode ser morto.
+        # O prazo conta a partir do aviso do worker de que começou o lote (fila_inicio):
+        # future.running() já é True para lotes que o executor passou para a fila de
+        # chamadas, ainda sem worker livre. O worker de um lote abandonado continua preso
+        # nele e fica perdido até o fim da execução, quando é morto e o pool descartado
+        # (encerrar_lotes_abandonados): até lá o pool trabalha com um worker a menos.
+        if not self.vigia_no_processo_principal():
+            return
+        agora = time.perf_counter()
+        self.receber_avisos_inicio(agora)
+        prazo = self.tempo_limite_registro * 2
+        for future, (idx_inicial, _, _) in list(pendentes.items()):
+            if future.done() or idx_inicial not in self.inicio_lotes:
+                continue
+            inicio, pid = self.inicio_lotes[idx_inicial]
+            if agora - inicio < prazo:
+                continue
+
+            idx_inicial, tamanho, textos = pendentes.pop(future)
+            self.inicio_lotes.pop(idx_inicial)
+            self.workers_presos.add(pid)
+            self.lotes_abandonados += 1
+            self.log(f"AVISO: lote de registros {idx_inicial}-{idx_inicial + tamanho - 1} passou de {prazo:.0f}s. Refazendo registro a registro...")
+            self.receber_lote(idx_inicial, tamanho, self.extrair_isolado(textos), gravar, total)
+
+    def receber_avisos_inicio(self, agora):
+        # O instante é o do recebimento (no máximo um intervalo_vigia depois do início real):
+        # o prazo nunca começa antes de o worker pegar o lote
+        while True:
+            try:
+                (execucao, idx_inicial), pid = self.fila_inicio.get_nowait()
+            except queue.Empty:
+                return
+            if execucao == self.execucao:
+                self.inicio_lotes.setdefault(idx_inicial, (agora, pid))
+
+    def extrair_isolado(self, textos):
+        # Cada registro é extraído sozinho num processo à parte, com o limite de tempo
+        # imposto de fora: o que passar do limite tem o processo morto e vai para a quarentena.
+        # O processo é reaproveitado entre registros e lotes até ser morto ou até o fim
+        # da execução (encerrar_lotes_abandonados).
+        # Mesmo formato de retorno de extrair_campos_lote. Com o perfil das regras ligado, os
+        # contadores dos registros refeitos são somados; os de um registro morto por tempo
+        # se perdem com o processo (a duração dele entra nas medições por registro).
+        dados_lote, erros, duracoes, quarentena = [], [], [], []
+        perfil = PerfilRegras() if self.perfil_regras else None
+        for posicao, texto in enumerate(textos):
+            if self.pool_isolado is None:
+                self.pool_isolado = multiprocessing.Pool(1, initializer=inicializar_worker)
+                self.pool_isolado.apply(aquecer_worker)  # O processo sobe antes de o tempo começar a contar
+            t = time.perf_counter()
+            tarefa = self.pool_isolado.apply_async(extrair_campos_lote, ([texto], self.perfil_regras))
+            try:
+                dados, erro, _, regras, _ = tarefa.get(self.tempo_limite_registro)
+            except multiprocessing.TimeoutError:
+                self.encerrar_pool_isolado()
+                quarentena.append((posicao, texto))
+            else:
+                dados_lote.extend(dados)
+                erros.extend((posicao, mensagem) for _, mensagem in erro)
+                if regras is not None and perfil is not None:
+                    perfil.somar(regras)
+            duracoes.append(time.perf_counter() - t)
+        return dados_lote, erros, duracoes, (perfil.regras if perfil is not None else None), quarentena
+
+    def encerrar_pool_isolado(self):
+        if self.pool_isolado is not None:
+            self.pool_isolado.terminate()
+            self.pool_isolado = None
+
+    def registrar_quarentena(self, indice, texto):
+        # Uma linha JSON por registro: PDF, índice do registro na ordem do PDF, limite e texto
+        if self.quarentena is None:
+            caminho = self.arquivo_quarentena
+            if caminho is None:
+                diretorio = os.path.join(diretorio_padrao(), 'quarentena')
+                os.makedirs(diretorio, exist_ok=True)
+                nome = os.path.splitext(os.path.basename(self.instrumentacao.entrada or 'pdf'))[0]
+                caminho = os.path.join(diretorio, f"{nome}_{time.strftime('%Y%m%d_%H%M%S')}.jsonl")
+            self.quarentena = open(caminho, 'a', encoding='utf-8')
+            self.caminho_quarentena = caminho
+        json.dump({
+            "pdf": self.instrumentacao.entrada, "registro": indice,
+            "limite_s": self.tempo_limite_registro, "texto": texto,
+        }, self.quarentena, ensure_ascii=False)
+        self.quarentena.write("\n")
+        self.quarentena.flush()
+        self.registros_quarentena += 1
+        self.instrumentacao.contar("quarentena")
+        self.log(f"AVISO: registro {indice} passou de {self.tempo_limite_registro}s e foi para a quarentena.")
+
+    def fechar_quarentena(self):
+        if self.quarentena is not None:
+            self.quarentena.close()
+            self.quarentena = None
+            self.log(f"AVISO: {self.registros_quarentena} registro(s) em quarentena: {self.caminho_quarentena}")
+
+    def encerrar_lotes_abandonados(self):
+        # Workers presos em lotes abandonados só param matando o pool; a próxima execução cria outro
+        self.encerrar_pool_isolado()
+        if self.lotes_abandonados:
+            self.log(f"{self.lotes_abandonados} lote(s) abandonado(s): reiniciando o pool de processos.")
+            self.descartar_executor(matar=True)
+
+    def gravar_em_ordem(self, gravar):
+        # Grava os lotes contíguos a partir do próximo registro esperado
+        while self.proximo_registro in self.reordenacao:
+            tamanho, dados_lote = self.reordenacao.pop(self.proximo_registro)
+            gravar(dados_lote)
+            self.registros_extraidos += len(dados_lote)
+            self.proximo_registro += tamanho
+
+    def aguardar_vaga(self, pendentes, gravar):
+        # Modo ordenado: com o limite de lotes em voo + aguardando a vez atingido, o envio
+        # pausa até algum lote terminar. Um lote lento não faz o buffer crescer sem limite.
+        if not self.saida_ordenada:
+            return
+        limite = self.limite_reordenacao or self.num_workers * 4
+        with self.instrumentacao.medir("espera_ordem"):
+            while pendentes and len(pendentes) + len(self.reordenacao) >= limite:
+                concurrent.futures.wait(pendentes, timeout=self.intervalo_vigia(), return_when=concurrent.futures.FIRST_COMPLETED)
+                self.coletar_resultados(pendentes, gravar)
+
+    def enviar_lote(self, executor, pendentes, registros, idx_inicial):
+        # O limite por registro vai para o worker quando ele mesmo consegue impô-lo (SIGALRM)
+        tempo_limite = None if self.vigia_no_processo_principal() else self.tempo_limite_registro
+        # Vigiado daqui, o lote é identificado para o worker avisar quando começar
+        lote = (self.execucao, idx_inicial) if self.vigia_no_processo_principal() else None
+        future = executor.submit(extrair_campos_lote, registros, self.perfil_regras, tempo_limite, lote)
+        # Os textos ficam guardados para refazer o lote se ele for abandonado (ver verificar_prazos)
+        pendentes[future] = (idx_inicial, len(registros), registros)
+
+    def abrir_paginas(self, pdf_path, pilha, executor):
+        # Define a fonte do texto das páginas: o cache (PDF já lido antes) ou o próprio PDF.
+        # Retorna (iterador de páginas, total de páginas) ou (None, 0) em caso de erro fatal.
+        backend = obter_backend(self.backend)
+        cache = None
+        if self.usar_cache:
+            try:
+                cache = CachePaginas()
+                pilha.callback(cache.fechar)
+                # Backends diferentes produzem textos diferentes: cada um tem sua entrada
+                chave = f"{calcular_hash(pdf_path)}:{backend.nome}"
+                total_paginas = cache.total_paginas(chave)
+            except Exception as e:
+                self.log(f"AVISO: cache de páginas indisponível ({e}). Lendo direto do PDF.")
+                cache = None
+            else:
+                if total_paginas:
+                    self.log(f"Texto encontrado no cache ({total_paginas} páginas). Leitura do PDF dispensada.")
+                    return cache.ler_paginas(chave), total_paginas
+
+        try:
+            total_paginas = backend.contar_paginas(pdf_path)
+        except Exception as e:
+            self.log(f"ERRO FATAL ao abrir PDF: {e}")
+            return None, 0
+
+        self.log(f"PDF aberto ({backend.nome}). Total de páginas: {total_paginas}")
+
+        if total_paginas == 0:
+            self.log("ERRO: PDF vazio.")
+            return None, 0
+
+        paralelo = self.leitura_paralela and total_paginas >= PAGINAS_MINIMAS_PARALELO
+        if paralelo:
+            self.log("Modo de leitura paralela: páginas distribuídas entre processos.")
+            paginas = self.ler_paginas_paralelo(executor, backend, pdf_path, total_paginas)
+        else:
+            paginas = self.ler_paginas(backend, pdf_path, total_paginas)
+        # Fecha o PDF mesmo se o processamento parar antes da última página
+        pilha.callback(paginas.close)
+
+        if cache is not None:
+            # Grava cada página no cache à medida que é lida
+            paginas = cache.armazenar_em_fluxo(chave, paginas)
+        return paginas, total_paginas
+
+    def preparar_gravacao(self, gravar):
+        # Etapas entre a extração e o arquivo, cada uma medida: normalização e validação
+        # coluna a coluna (normalizacao.py, se ligada) e a gravação do lote em si
+        instrumentacao = self.instrumentacao
+        self.registros_invalidos = 0
+        if self.normalizar:
+            instrumentacao.adicionar("normalizacao", 0.0)
+        instrumentacao.adicionar("exportacao", 0.0)
+
+        def gravar_medido(dados_lote):
+            if self.normalizar:
+                with instrumentacao.medir("normalizacao"):
+                    dados_lote = normalizar_registros(dados_lote, REGRAS_PDF, COLUNA_INVALIDOS_PDF)
+                    self.registros_invalidos += contar_invalidos(dados_lote, COLUNA_INVALIDOS_PDF)
+            with instrumentacao.medir("exportacao"):
+                gravar(dados_lote)
+        return gravar_medido
+
+    def informar_invalidos(self):
+        if self.normalizar and self.registros_invalidos:
+            self.log(f"AVISO: {self.registros_invalidos} registros com campos inválidos (coluna {COLUNA_INVALIDOS_PDF}).")
+
+    def processar_pdf_em_fluxo(self, pdf_path, escritor, template=None):
+        # Cada lote concluído é gravado direto no arquivo de saída, sem acumular em memória.
+        # Retorna o número de registros gravados, ou None em caso de erro fatal.
+        if template is not None:
+            return self.extrair_registros_template(pdf_path, template, escritor.escrever)
+        return self.extrair_registros(pdf_path, escritor.escrever)
+
+    def extrair_registros(self, pdf_path, gravar):
+        tamanho_total = 0
+        self.registros_extraidos = 0
+        separador = SeparadorFuncionarios()
+        tempos = self.iniciar_instrumentacao("pdf", pdf_path, ["abertura", "leitura", "cabecalho", "separacao", "extracao"])
+        if self.saida_ordenada:
+            tempos["espera_ordem"] = 0.0
+        self.reordenacao = {}
+        self.proximo_registro = 0
+        self.perfil = PerfilRegras() if self.perfil_regras else None
+        self.registros_quarentena = 0
+        self.lotes_abandonados = 0
+        self.inicio_lotes = {}
+        self.execucao += 1
+        gravar = self.preparar_gravacao(gravar)
+
+        instrumentacao = self.instrumentacao
+        with contextlib.ExitStack() as pilha:
+            pilha.callback(self.encerrar_lotes_abandonados)
+            pilha.callback(self.fechar_quarentena)
+            with instrumentacao.medir("abertura"):
+                executor = self.obter_executor()
+                paginas, total_paginas = self.abrir_paginas(pdf_path, pilha, executor)
+            if paginas is None:
+                return None
+            self.instrumentacao.contar("paginas", total_paginas)
+
+            # Pipeline em fluxo: as fichas são enviadas ao pool assim que o cabeçalho da
+            # seguinte aparece, sobrepondo a extração dos campos à leitura do PDF.
+            # Envio em lotes: muitos registros pequenos vão juntos em uma única chamada,
+            # diluindo o custo de serialização entre processos.
+            # Estimativa para o lote automático: ~1 ficha por página.
+            # No modo ordenado, os lotes são gravados na ordem do PDF (ver aguardar_vaga).
+            tamanho_lote = self.tamanho_lote or calcular_tamanho_lote(total_paginas, self.num_workers)
+            self.log(f"Iniciando leitura e extração em fluxo (ProcessPoolExecutor, lotes de {tamanho_lote} registros)...")
+
+            t0 = time.time()
+            pendentes = {}
+            lote = []
+            indice_registro = 0
+            paginas = iter(paginas)
+            while True:
+                # Leitura: tempo esperando a próxima página (PDF, workers ou cache)
+                with instrumentacao.medir("leitura"):
+                    texto = next(paginas, _FIM)
+                if texto is _FIM:
+                    break
+                if not texto:
+                    continue
+
+                # Separação e envio (a gravação dos lotes já prontos é medida à parte)
+                with instrumentacao.medir("separacao"):
+                    tamanho_total += len(texto)
+                    lote.extend(separador.alimentar(texto))
+                    while len(lote) >= tamanho_lote:
+                        self.aguardar_vaga(pendentes, gravar)
+                        self.enviar_lote(executor, pendentes, lote[:tamanho_lote], indice_registro)
+                        indice_registro += tamanho_lote
+                        lote = lote[tamanho_lote:]
+                    self.coletar_resultados(pendentes, gravar)
+
+            with instrumentacao.medir("separacao"):
+                lote.extend(separador.finalizar())
+                for inicio in range(0, len(lote), tamanho_lote):
+                    parte = lote[inicio:inicio + tamanho_lote]
+                    self.aguardar_vaga(pendentes, gravar)
+                    self.enviar_lote(executor, pendentes, parte, indice_registro)
+                    indice_registro += len(parte)
+            # A remoção do cabeçalho acontece dentro do separador: medida à parte
+            tempos["cabecalho"] = separador.tempo_cabecalho
+            tempos["separacao"] -= separador.tempo_cabecalho
+
+            total_funcionarios = separador.total_blocos
+            self.log(f"Leitura concluída. Tamanho total do texto extraído: {tamanho_total} caracteres.")
+            self.log(f"Separação concluída em fluxo. Registros encontrados: {total_funcionarios}")
+
+            if total_funcionarios == 0:
+                self.log("ALERTA: Nenhum registro de funcionário encontrado (padrão 'Código' não correspondido).")
+                return 0
+
+            # Extração: espera pelos lotes que ainda estavam no pool ao fim da leitura
+            self.status("Extraindo dados (Paralelo)...", 0.55)
+            with instrumentacao.medir("extracao"):
+                self.coletar_resultados(pendentes, gravar, total_funcionarios)
+
+            t1 = time.time()
+            self.log(f"Leitura e extração paralela finalizadas em {t1-t0:.2f} segundos.")
+            self.informar_invalidos()
+            if self.perfil is not None:
+                self.log("Perfil das regras de extração:")
+                for linha in self.perfil.tabela():
+                    self.log(linha)
+
+        self.instrumentacao.contar("registros", self.registros_extraidos)
+        self.instrumentacao.contar("invalidos", self.registros_invalidos)
+        return self.registros_extraidos
+
+    def extrair_registros_template(self, pdf_path, template, gravar):
+        # Modo template: cada worker abre o PDF e lê só as regiões dos campos nas suas páginas.
+        # Não passa pelo cache de texto nem pelo separador de fichas.
+        self.iniciar_instrumentacao("pdf-template", pdf_path, ["abertura", "extracao"])
+        self.perfil = None  # O modo template não passa pelas regras de extrair_campos
+        gravar = self.preparar_gravacao(gravar)
+        try:
+            with self.instrumentacao.medir("abertura"):
+                total_paginas = obter_backend("pdfplumber").contar_paginas(pdf_path)
+        except Exception as e:
+            self.log(f"ERRO FATAL ao abrir PDF: {e}")
+            return None
+
+        self.log(f"PDF aberto. Total de páginas: {total_paginas}")
+        if total_paginas == 0:
+            self.log("ERRO: PDF vazio.")
+            return None
+        self.instrumentacao.contar("paginas", total_paginas)
+
+        executor = self.obter_executor()
+        intervalos = dividir_fichas(total_paginas, template['paginas_por_ficha'], self.num_workers)
+        self.log(f"Extraindo campos por coordenadas ({len(intervalos)} blocos de páginas)...")
+
+        t0 = time.time()
+        with self.instrumentacao.medir("extracao"):
+            futures = [executor.submit(extrair_fichas_template, pdf_path, inicio, fim, template) for inicio, fim in intervalos]
+            total_registros = 0
+            paginas_lidas = 0
+            # Resultados recolhidos na ordem dos blocos para manter a ordem das fichas no PDF
+            for (inicio, fim), future in zip(intervalos, futures):
+                try:
+                    dados_lote, erros, duracoes = future.result()
+                except concurrent.futures.BrokenExecutor:
+                    raise
+                except Exception as exc:
+                    self.log(f"ERRO ao ler páginas {inicio+1}-{fim}: {exc}")
+                    self.instrumentacao.contar("erros")
+                    continue
+
+                for pagina, erro in erros:
+                    self.log(f"ERRO na ficha da página {pagina+1}: {erro}")
+                self.instrumentacao.registrar("registro", duracoes)
+                self.instrumentacao.contar("erros", len(erros))
+                gravar(dados_lote)
+                total_registros += len(dados_lote)
+
+                paginas_lidas += fim - inicio
+                progresso = 0.05 + (0.9 * (paginas_lidas / total_paginas))
+                self.log(f"Lidas {paginas_lidas}/{total_paginas} páginas, {total_registros} registros...")
+                self.status(f"Extraindo por template ({paginas_lidas}/{total_paginas})...", progresso)
+
+        self.log(f"Extração por template finalizada em {time.time()-t0:.2f} segundos. Registros: {total_registros}")
+        self.informar_invalidos()
+        self.instrumentacao.contar("registros", total_registros)
+        self.instrumentacao.contar("invalidos", self.registros_invalidos)
+        return total_registros
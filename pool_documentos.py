@@ -0,0 +1,62 @@
+"""
+Processamento de vários documentos Word em paralelo
+
+Cada .docx é independente e a análise do python-docx ocupa a CPU, então as
+ferramentas Word distribuem os arquivos entre processos. A função aplicada a
+cada arquivo precisa ser de nível de módulo (é enviada aos workers pelo nome) e
+os workers importam o módulo dela: ele não deve abrir janelas no import.
+
+Os resultados voltam na ordem dos arquivos; o progresso é informado na ordem em
+que terminam. Uma exceção em um arquivo (ou um worker que morre) vira erro só
+dos arquivos afetados, sem interromper os outros.
+"""
+
+import os
+import concurrent.futures
+from typing import Callable, List, Optional, Sequence, Tuple
+
+# Abaixo disso o custo de subir os processos supera o ganho
+ARQUIVOS_MINIMOS_PARALELO = 8
+
+
+def workers_padrao() -> int:
+    return os.cpu_count() or 1
+
+
+def usar_paralelo(total_arquivos: int, num_workers: Optional[int]) -> bool:
+    """Se vale a pena distribuir total_arquivos entre num_workers processos (None = todos os núcleos)"""
+    return (num_workers or workers_padrao()) > 1 and total_arquivos >= ARQUIVOS_MINIMOS_PARALELO
+
+
+def mapear_em_ordem(funcao: Callable, itens: Sequence, num_workers: Optional[int] = None,
+                    ao_concluir: Optional[Callable] = None) -> List[Tuple[object, Optional[str]]]:
+    """
+    Aplica funcao a cada item em um pool de processos
+
+    Args:
+        funcao: Função de nível de módulo, chamada como funcao(item) nos workers
+        itens: Itens (ex.: caminhos dos arquivos), na ordem desejada do resultado
+        num_workers: Processos do pool (None = número de núcleos)
+        ao_concluir: Chamada no processo principal a cada item concluído, na ordem de
+                     conclusão: ao_concluir(concluidos, indice, resultado, erro)
+
+    Returns:
+        Lista de (resultado, erro) na ordem dos itens; erro é None em caso de sucesso
+        e a mensagem da exceção (com resultado None) em caso de falha
+    """
+    resultados = [None] * len(itens)
+    num_workers = min(num_workers or workers_padrao(), max(1, len(itens)))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = {executor.submit(funcao, item): indice for indice, item in enumerate(itens)}
+        for concluidos, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            indice = futures[future]
+            try:
+                resultado, erro = future.result(), None
+            except concurrent.futures.process.BrokenProcessPool:
+                resultado, erro = None, "processo de extração encerrado inesperadamente"
+            except Exception as e:
+                resultado, erro = None, str(e)
+            resultados[indice] = (resultado, erro)
+            if ao_concluir is not None:
+                ao_concluir(concluidos, indice, resultado, erro)
+    return resultados
@@ -0,0 +1,308 @@
+"""
+Leitura das células das tabelas de um .docx
+
+As ferramentas Word só usam o texto das células das tabelas. Dois leitores
+entregam essas células no mesmo formato, tuplas (tabela, linha, coluna, texto),
+então a lógica de mapeamento dos labels é a mesma para os dois. Cada célula
+aparece uma vez por linha, mesmo mesclada na horizontal (row.cells repete a
+mesma célula em cada coluna que ela ocupa; reprocessar a repetição não muda o
+resultado, só refaz o strip e a busca dos labels):
+
+- python-docx (padrão): o leitor original (doc.tables -> row.cells -> cell.text)
+- xml: abre o .docx como zip e percorre word/document.xml com iterparse, sem
+  montar o modelo de objetos do python-docx; cada linha da tabela é descartada
+  depois de lida, então a memória não cresce com o documento. É opcional
+  (--leitor xml) até ter rodado em produção; confira antes com o comando abaixo
+
+O leitor xml reproduz o que o python-docx devolve:
+- só as tabelas do nível do corpo (tabelas dentro de células ficam de fora, como
+  em doc.tables), e o texto só dos parágrafos diretos da célula;
+- a coluna é a posição da célula em row.cells (uma célula com gridSpan=N ocupa
+  N posições);
+- uma célula com vMerge="continue" repete, em cada linha, o texto da célula de
+  origem da mescla (a de cima, na mesma coluna da grade), como row.cells: a
+  regra do endereço residencial depende do índice da linha;
+- o texto é o de cell.text: parágrafos unidos por "\\n", w:tab/w:ptab como "\\t",
+  w:br (quebra de linha) e w:cr como "\\n", w:noBreakHyphen como "-".
+
+BuscaLabels acha todos os labels conhecidos dentro do texto de uma célula numa
+única passada (o "Método 2" das ferramentas Word, para labels embutidos no texto).
+
+Para conferir os dois leitores (tempo e células idênticas) em arquivos reais:
+
+    python tabelas_docx.py arquivo.docx|diretório
+"""
+
+import re
+import functools
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Iterator, List, Sequence, Tuple
+
+LEITORES = ("xml", "python-docx")
+LEITOR_PADRAO = "python-docx"
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+CORPO = W + "body"
+TABELA = W + "tbl"
+LINHA = W + "tr"
+PROPRIEDADES_LINHA = W + "trPr"
+CELULA = W + "tc"
+PROPRIEDADES_CELULA = W + "tcPr"
+PARAGRAFO = W + "p"
+HYPERLINK = W + "hyperlink"
+RUN = W + "r"
+TEXTO = W + "t"
+QUEBRA = W + "br"
+VAL = W + "val"
+TIPO = W + "type"
+
+# Conteúdo de um w:r além do w:t (w:br depende do tipo, tratado à parte)
+TEXTO_ESPECIAL = {
+    W + "tab": "\t",
+    W + "ptab": "\t",
+    W + "cr": "\n",
+    W + "noBreakHyphen": "-",
+}
+
+REL_DOCUMENTO = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+RELS = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+
+Celula = Tuple[int, int, int, str]
+
+
+def iterar_celulas(caminho_arquivo: str, leitor: str = LEITOR_PADRAO) -> Iterator[Celula]:
+    """
+    Células das tabelas do documento, na ordem de row.cells, sem as repetições das mesclas horizontais
+
+    Com o python-docx o documento é carregado aqui mesmo (antes do primeiro
+    next); com o leitor xml a leitura acontece conforme as células são pedidas.
+
+    Returns:
+        Iterador de (tabela, linha, coluna, texto), com os índices a partir de 0
+    """
+    if leitor == "python-docx":
+        import docx
+        return celulas_documento(docx.Document(caminho_arquivo))
+    if leitor != "xml":
+        raise ValueError(f"Leitor desconhecido: {leitor} (disponíveis: {', '.join(LEITORES)})")
+    return celulas_xml(caminho_arquivo)
+
+
+def celulas_documento(doc) -> Iterator[Celula]:
+    """Células de um documento já carregado pelo python-docx"""
+    for indice_tabela, tabela in enumerate(doc.tables):
+        # Texto de cada w:tc, calculado uma vez por tabela (as mesclas verticais
+        # devolvem a mesma célula de origem em várias linhas)
+        textos = {}
+        for indice_linha, row in enumerate(tabela.rows):
+            vistas = set()
+            for coluna, cell in enumerate(row.cells):
+                tc = cell._tc
+                if tc in vistas:
+                    continue
+                vistas.add(tc)
+                texto = textos.get(tc)
+                if texto is None:
+                    texto = textos[tc] = cell.text
+                yield indice_tabela, indice_linha, coluna, texto
+
+
+def caminho_documento(pacote: zipfile.ZipFile) -> str:
+    """Parte principal do pacote (normalmente word/document.xml), pela relação officeDocument"""
+    try:
+        raiz = ET.fromstring(pacote.read("_rels/.rels"))
+    except KeyError:
+        return "word/document.xml"
+    for relacao in raiz.iter(RELS):
+        if relacao.get("Type") == REL_DOCUMENTO:
+            return posixpath.normpath(relacao.get("Target", "").lstrip("/"))
+    return "word/document.xml"
+
+
+def celulas_xml(caminho_arquivo: str) -> Iterator[Celula]:
+    """Células das tabelas lidas direto do XML do documento (ver docstring do módulo)"""
+    with zipfile.ZipFile(caminho_arquivo) as pacote:
+        with pacote.open(caminho_documento(pacote)) as xml:
+            yield from _celulas_do_xml(xml)
+
+
+def _celulas_do_xml(xml) -> Iterator[Celula]:
+    # Ancestrais do elemento atual. Profundidades fixas: 0 w:document, 1 w:body,
+    # 2 w:tbl, 3 w:tr, 4 w:tc, 5 w:p, 6 w:r (ou w:hyperlink e 7 w:r)
+    pilha = []
+    corpo = tabela_atual = None
+    indice_tabela = -1
+    indice_linha = 0
+    # Linha em leitura: [span, vmerge, texto] por w:tc; grid_before da linha
+    celulas = []
+    grid_before = 0
+    # Origem das mesclas verticais da linha anterior: {coluna da grade: (span, texto)}
+    origens_anteriores = {}
+    celula = paragrafos = trechos = None
+
+    for evento, elem in ET.iterparse(xml, events=("start", "end")):
+        tag = elem.tag
+        if evento == "start":
+            profundidade = len(pilha)
+            pilha.append(tag)
+            if profundidade == 1:
+                corpo = elem
+            elif profundidade == 2 and tag == TABELA and pilha[1] == CORPO:
+                tabela_atual = elem
+                indice_tabela += 1
+                indice_linha = 0
+                origens_anteriores = {}
+            elif tabela_atual is None:
+                continue
+            elif profundidade == 3 and tag == LINHA:
+                celulas = []
+                grid_before = 0
+            elif profundidade == 4 and tag == CELULA and pilha[3] == LINHA:
+                paragrafos = []
+                celula = [1, None, paragrafos]
+            elif profundidade == 5 and tag == PARAGRAFO and pilha[4] == CELULA:
+                trechos = []
+                paragrafos.append(trechos)
+            continue
+
+        pilha.pop()
+        profundidade = len(pilha)
+        if tabela_atual is None or profundidade < 2:
+            if profundidade == 2:
+                corpo.remove(elem)
+            continue
+
+        if profundidade >= 6 and pilha[-1] == RUN and pilha[5] == PARAGRAFO and pilha[4] == CELULA \
+                and pilha[2] == TABELA and (profundidade == 7 or (profundidade == 8 and pilha[6] == HYPERLINK)):
+            if tag == TEXTO:
+                if elem.text:
+                    trechos.append(elem.text)
+            elif tag == QUEBRA:
+                if elem.get(TIPO, "textWrapping") == "textWrapping":
+                    trechos.append("\n")
+            elif tag in TEXTO_ESPECIAL:
+                trechos.append(TEXTO_ESPECIAL[tag])
+        elif profundidade == 6 and pilha[5] == PROPRIEDADES_CELULA and pilha[4] == CELULA and pilha[2] == TABELA:
+            if tag == W + "gridSpan":
+                celula[0] = int(elem.get(VAL, 1))
+            elif tag == W + "vMerge":
+                celula[1] = elem.get(VAL, "continue")
+        elif profundidade == 5 and pilha[4] == PROPRIEDADES_LINHA and tag == W + "gridBefore" and pilha[2] == TABELA:
+            grid_before = int(elem.get(VAL, 0))
+        elif profundidade == 4 and tag == CELULA and pilha[3] == LINHA:
+            celula[2] = "\n".join("".join(trechos) for trechos in paragrafos)
+            celulas.append(celula)
+        elif profundidade == 3 and tag == LINHA:
+            origens = {}
+            grade = grid_before
+            coluna = 0
+            for span, vmerge, texto in celulas:
+                origem = (span, texto)
+                if vmerge == "continue":
+                    # Como o python-docx: o conteúdo é o da célula de cima na mesma coluna
+                    # (sem ela, fica o da própria célula em vez do erro do python-docx)
+                    origem = origens_anteriores.get(grade, origem)
+                origens[grade] = origem
+                yield indice_tabela, indice_linha, coluna, origem[1]
+                coluna += origem[0]
+                grade += span
+            origens_anteriores = origens
+            indice_linha += 1
+            tabela_atual.remove(elem)
+        elif profundidade == 2:
+            if tag == TABELA:
+                tabela_atual = None
+            corpo.remove(elem)
+
+
+class BuscaLabels:
+    """
+    Posição da primeira ocorrência de cada label num texto, numa passada só
+
+    Equivale a testar `label in texto` e `texto.split(label, 1)` label por label:
+    uma alternação compilada (labels mais longos primeiro) acha o label mais
+    longo que começa em cada posição; os labels que são prefixo dele também
+    começam ali (mapa de prefixos). A busca seguinte recomeça na posição
+    seguinte ao início do achado, então labels sobrepostos não se perdem.
+    """
+
+    def __init__(self, labels: Sequence[str]):
+        self.labels = list(dict.fromkeys(label for label in labels if label))
+        self.ordem = {label: indice for indice, label in enumerate(self.labels)}
+        # Mais longo primeiro: a alternação do re fica com a primeira alternativa que casa
+        longos_primeiro = sorted(self.labels, key=len, reverse=True)
+        self.padrao = re.compile("|".join(map(re.escape, longos_primeiro))) if self.labels else None
+        # Só os labels que têm outros labels como prefixo
+        self.prefixos = {}
+        for label in self.labels:
+            prefixos = [outro for outro in self.labels if outro != label and label.startswith(outro)]
+            if prefixos:
+                self.prefixos[label] = prefixos
+
+    def encontrar(self, texto: str) -> List[Tuple[str, int]]:
+        """
+        Returns:
+            (label, posição da primeira ocorrência) dos labels presentes no texto,
+            na ordem em que os labels foram passados
+        """
+        if self.padrao is None:
+            return []
+        achado = self.padrao.search(texto)
+        if achado is None:
+            return []
+        posicoes = {}
+        while achado is not None:
+            label = achado.group()
+            inicio = achado.start()
+            if label not in posicoes:
+                posicoes[label] = inicio
+            if label in self.prefixos:
+                for prefixo in self.prefixos[label]:
+                    if prefixo not in posicoes:
+                        posicoes[prefixo] = inicio
+            achado = self.padrao.search(texto, inicio + 1)
+        if len(posicoes) > 1:
+            return sorted(posicoes.items(), key=lambda item: self.ordem[item[0]])
+        return list(posicoes.items())
+
+
+@functools.lru_cache(maxsize=None)
+def busca_labels(labels: Tuple[str, ...]) -> BuscaLabels:
+    """BuscaLabels compilada uma vez por conjunto de labels"""
+    return BuscaLabels(labels)
+
+
+def main():
+    import os
+    import sys
+    import glob
+    import time
+
+    if len(sys.argv) < 2:
+        print("Uso: python tabelas_docx.py arquivo.docx|diretório")
+        return
+    alvo = sys.argv[1]
+    caminhos = sorted(glob.glob(os.path.join(alvo, "*.docx"))) if os.path.isdir(alvo) else [alvo]
+    caminhos = [c for c in caminhos if not os.path.basename(c).startswith("~$")]
+
+    tempos = dict.fromkeys(LEITORES, 0.0)
+    divergentes = 0
+    for caminho in caminhos:
+        resultados = {}
+        for leitor in LEITORES:
+            t = time.perf_counter()
+            resultados[leitor] = list(iterar_celulas(caminho, leitor))
+            tempos[leitor] += time.perf_counter() - t
+        if resultados["xml"] != resultados["python-docx"]:
+            divergentes += 1
+            print(f"⚠️ Células diferentes em {os.path.basename(caminho)}")
+
+    print(f"{len(caminhos)} arquivo(s), {divergentes} com diferenças")
+    for leitor in LEITORES:
+        print(f"  {leitor:<12} {tempos[leitor]:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
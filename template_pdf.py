@@ -0,0 +1,192 @@
+"""
+Extração por template de coordenadas (lado dos workers)
+
+Para fichas com layout fixo, cada campo é definido por uma região da página
+(bbox em pontos, origem no canto superior esquerdo, como no pdfplumber).
+Só os caracteres dentro de cada região são lidos, sem análise de layout da
+página inteira e sem a cascata de regex de extrair_campos.
+
+Formato do template (JSON):
+
+    {
+        "paginas_por_ficha": 1,
+        "obrigatorio": "Código",
+        "campos": {
+            "Código": {"bbox": [40, 92, 110, 104]},
+            "Nome":   {"bbox": [150, 92, 560, 104]},
+            "Bairro": {"bbox": [330, 210, 560, 222], "pagina": 0}
+        }
+    }
+
+- paginas_por_ficha: quantas páginas cada ficha ocupa (padrão 1)
+- obrigatorio: campo que identifica uma ficha; páginas em que ele sai vazio são ignoradas
+- pagina: página da ficha onde está o campo (0 = primeira, padrão)
+
+Para descobrir as coordenadas: python template_pdf.py amostra.pdf [página]
+"""
+
+import json
+import math
+import sys
+import time
+from typing import Dict, List
+
+from extracao_pdf import dividir_paginas
+
+
+def _numero(valor) -> bool:
+    # bool é subclasse de int no Python, mas true/false no JSON não é coordenada;
+    # NaN/Infinity (aceitos pelo json) passariam pelas comparações do bbox
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool) and math.isfinite(valor)
+
+
+def _inteiro(valor) -> bool:
+    return isinstance(valor, int) and not isinstance(valor, bool)
+
+
+def carregar_template(caminho_template: str) -> Dict:
+    """
+    Lê e valida um template de coordenadas
+
+    Raises:
+        ValueError: se o template não tiver o formato esperado
+    """
+    with open(caminho_template, 'r', encoding='utf-8') as f:
+        template = json.load(f)
+
+    campos = template.get('campos') if isinstance(template, dict) else None
+    if not isinstance(campos, dict) or not campos:
+        raise ValueError("Template sem a seção 'campos'")
+
+    paginas_por_ficha = template.setdefault('paginas_por_ficha', 1)
+    if not _inteiro(paginas_por_ficha) or paginas_por_ficha < 1:
+        raise ValueError("'paginas_por_ficha' deve ser um inteiro positivo")
+
+    for nome, definicao in campos.items():
+        bbox = definicao.get('bbox') if isinstance(definicao, dict) else None
+        if not isinstance(bbox, list) or len(bbox) != 4 or not all(map(_numero, bbox)):
+            raise ValueError(f"Campo '{nome}': 'bbox' deve ser [x0, topo, x1, base] (números)")
+        x0, topo, x1, base = bbox
+        if x0 >= x1 or topo >= base:
+            raise ValueError(f"Campo '{nome}': bbox vazio ou invertido {bbox}")
+        pagina = definicao.setdefault('pagina', 0)
+        if not _inteiro(pagina):
+            raise ValueError(f"Campo '{nome}': 'pagina' deve ser um inteiro")
+        if not 0 <= pagina < paginas_por_ficha:
+            raise ValueError(f"Campo '{nome}': página {pagina} fora da ficha")
+
+    obrigatorio = template.get('obrigatorio')
+    if obrigatorio is not None and (not isinstance(obrigatorio, str) or obrigatorio not in campos):
+        raise ValueError(f"Campo obrigatório '{obrigatorio}' não está nos campos")
+
+    return template
+
+
+def _dentro(caractere, bbox) -> bool:
+    # Mesmo critério do within_bbox do pdfplumber: o caractere inteiro dentro da
+    # região (um valor da coluna vizinha que encosta na borda não vaza para o campo)
+    x0, topo, x1, base = bbox
+    return (caractere['x0'] >= x0 and caractere['top'] >= topo
+            and caractere['x1'] <= x1 and caractere['bottom'] <= base
+            and caractere['x1'] - caractere['x0'] + caractere['bottom'] - caractere['top'] > 0)
+
+
+def textos_pagina(pagina, regioes: Dict[str, List]) -> Dict[str, str]:
+    """
+    Texto de cada região (nome: bbox) de uma página
+
+    Os caracteres da página são filtrados uma vez só: primeiro pelo retângulo que
+    cobre todas as regiões, depois distribuídos entre as regiões que os contêm.
+    """
+    from pdfplumber.utils import extract_text
+
+    uniao = (min(bbox[0] for bbox in regioes.values()), min(bbox[1] for bbox in regioes.values()),
+             max(bbox[2] for bbox in regioes.values()), max(bbox[3] for bbox in regioes.values()))
+    # Como no within_bbox, uma região que sai da página é erro da ficha
+    px0, ptopo, px1, pbase = pagina.bbox
+    if uniao[0] < px0 or uniao[1] < ptopo or uniao[2] > px1 or uniao[3] > pbase:
+        raise ValueError(f"Regiões do template {uniao} fora da página {tuple(pagina.bbox)}")
+    caracteres = [c for c in pagina.chars if _dentro(c, uniao)]
+    grupos = {nome: [] for nome in regioes}
+    for caractere in caracteres:
+        for nome, bbox in regioes.items():
+            if _dentro(caractere, bbox):
+                grupos[nome].append(caractere)
+
+    textos = {}
+    for nome, grupo in grupos.items():
+        texto = extract_text(grupo) if grupo else ""
+        # Valores quebrados em várias linhas viram uma linha só, como no parser de texto
+        textos[nome] = " ".join(texto.split())
+    return textos
+
+
+def extrair_fichas_template(pdf_path, inicio, fim, template):
+    # Executado nos processos filhos: lê as fichas cujas páginas estão em [inicio, fim).
+    # O intervalo deve começar no início de uma ficha (ver dividir_fichas).
+    # Retorna a lista de dicionários de campos, a lista de erros (página, mensagem) e a
+    # duração da leitura de cada ficha em segundos.
+    import pdfplumber  # Só os workers do modo template precisam do pdfplumber
+
+    paginas_por_ficha = template['paginas_por_ficha']
+    campos = template['campos']
+    obrigatorio = template.get('obrigatorio')
+    # Regiões agrupadas pela página da ficha, para cada página ser filtrada uma vez
+    regioes_por_pagina = {}
+    for nome, definicao in campos.items():
+        regioes_por_pagina.setdefault(definicao['pagina'], {})[nome] = definicao['bbox']
+
+    dados_lote = []
+    erros = []
+    duracoes = []
+    with pdfplumber.open(pdf_path, pages=range(inicio + 1, fim + 1)) as pdf:
+        paginas = pdf.pages
+        for deslocamento in range(0, len(paginas), paginas_por_ficha):
+            paginas_ficha = paginas[deslocamento:deslocamento + paginas_por_ficha]
+            t = time.perf_counter()
+            try:
+                dados = dict.fromkeys(campos, "")  # "" fica nos campos de ficha incompleta no fim do PDF
+                for indice, regioes in regioes_por_pagina.items():
+                    if indice < len(paginas_ficha):
+                        dados.update(textos_pagina(paginas_ficha[indice], regioes))
+            except Exception as e:
+                erros.append((inicio + deslocamento, str(e)))
+                continue
+            finally:
+                duracoes.append(time.perf_counter() - t)
+
+            if obrigatorio and not dados[obrigatorio]:
+                continue
+            dados_lote.append(dados)
+
+    return dados_lote, erros, duracoes
+
+
+def dividir_fichas(total_paginas, paginas_por_ficha, num_workers):
+    # Mesmo critério de dividir_paginas, mas com limites sempre no início de uma ficha
+    total_fichas = -(-total_paginas // paginas_por_ficha)
+    return [
+        (inicio * paginas_por_ficha, min(fim * paginas_por_ficha, total_paginas))
+        for inicio, fim in dividir_paginas(total_fichas, num_workers)
+    ]
+
+
+def listar_palavras(pdf_path: str, numero_pagina: int = 1) -> List[str]:
+    """Palavras de uma página com suas coordenadas, para montar um template"""
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path, pages=[numero_pagina]) as pdf:
+        pagina = pdf.pages[0]
+        linhas = [f"Página {numero_pagina}: largura {pagina.width:.0f}, altura {pagina.height:.0f}"]
+        for palavra in pagina.extract_words():
+            linhas.append(
+                f"[{palavra['x0']:6.1f}, {palavra['top']:6.1f}, {palavra['x1']:6.1f}, {palavra['bottom']:6.1f}]  {palavra['text']}"
+            )
+    return linhas
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python template_pdf.py arquivo.pdf [página]")
+        sys.exit(1)
+    print("\n".join(listar_palavras(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 1)))